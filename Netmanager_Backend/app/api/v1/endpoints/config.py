@@ -1,28 +1,34 @@
 from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import PlainTextResponse
 from sqlalchemy.orm import Session
 from typing import List
 
 from app.db.session import get_db
 from app.models.device import Device, ConfigBackup
 from app.models.config_template import ConfigTemplate  # 템플릿 모델 추가
-from app.schemas.device import ConfigBackupResponse
+from app.schemas.device import ConfigBackupResponse, ConfigBackupSummary, FleetPullRequest
+from app.services.config_store import config_store
 from app.services.ssh_service import DeviceConnection, DeviceInfo
 from app.services.parser_service import CLIAnalyzer
-from app.tasks.config import pull_and_parse_config, deploy_config_task  # 배포 태스크 추가
+from app.tasks.config import (
+    pull_and_parse_config, deploy_config_task, pull_fleet_configs,
+    FLEET_PULL_CONCURRENCY, FLEET_PULL_SITE_CONCURRENCY, SSH_BACKEND,
+)
 
 router = APIRouter()
 
 
 @router.post("/pull/{device_id}", response_model=ConfigBackupResponse)
-def pull_config_from_device(device_id: int, db: Session = Depends(get_db)):
+def pull_config_from_device(device_id: int, force: bool = False, db: Session = Depends(get_db)):
     """
     지정된 장비(ID)에 SSH로 접속하여 설정을 가져오고, 파싱하여 DB에 저장합니다.
+    지난 백업 이후 설정 변경이 없으면 수집을 생략합니다 (force=true면 항상 수집).
     """
     device = db.query(Device).filter(Device.id == device_id).first()
     if not device:
         raise HTTPException(status_code=404, detail="장비를 찾을 수 없습니다.")
 
-    task = pull_and_parse_config.delay(device_id)
+    task = pull_and_parse_config.delay(device_id, force)
 
     raise HTTPException(status_code=202, detail={
         "message": "Config pull 요청이 접수되었습니다. 백그라운드에서 처리 중입니다.",
@@ -30,18 +36,77 @@ def pull_config_from_device(device_id: int, db: Session = Depends(get_db)):
     })
 
 
-@router.get("/history/{device_id}", response_model=List[ConfigBackupResponse])
+@router.post("/pull-fleet")
+def pull_fleet(request: FleetPullRequest):
+    """
+    여러 장비(전체 / 지정 ID / 사이트)의 설정을 한 번에 수집합니다.
+    동시 SSH 작업 수는 전체 concurrency, 사이트별 site_concurrency로 제한됩니다.
+    """
+    task = pull_fleet_configs.delay(
+        request.device_ids, request.site,
+        request.concurrency or FLEET_PULL_CONCURRENCY,
+        request.site_concurrency or FLEET_PULL_SITE_CONCURRENCY,
+        request.backend or SSH_BACKEND,
+        request.force,
+    )
+    return {"message": "전체 설정 수집 요청이 접수되었습니다.", "task_id": task.id}
+
+
+@router.get("/pull-fleet/{task_id}")
+def get_fleet_pull_status(task_id: str):
+    """
+    전체 설정 수집 진행 상황 (PROGRESS: 완료/실패 수, devices/min, SUCCESS: 최종 결과)
+    """
+    result = pull_fleet_configs.AsyncResult(task_id)
+    info = result.info if isinstance(result.info, dict) else ({"message": str(result.info)} if result.info else {})
+    return {"task_id": task_id, "state": result.state, **info}
+
+
+@router.get("/history/{device_id}", response_model=List[ConfigBackupSummary])
 def get_config_history(device_id: int, db: Session = Depends(get_db)):
     """
     특정 장비의 설정 백업 이력을 최신순으로 조회합니다.
+    설정 본문은 읽지 않습니다 (본문은 /backup/{backup_id}, /backup/{backup_id}/raw).
     """
-    backups = db.query(ConfigBackup) \
+    backups = db.query(ConfigBackup.id, ConfigBackup.device_id, ConfigBackup.config_sha256,
+                       ConfigBackup.config_size, ConfigBackup.config_changed_at, ConfigBackup.created_at) \
         .filter(ConfigBackup.device_id == device_id) \
         .order_by(ConfigBackup.created_at.desc()) \
         .all()
     return backups
 
 
+def _get_backup(db: Session, backup_id: int) -> ConfigBackup:
+    backup = db.query(ConfigBackup).filter(ConfigBackup.id == backup_id).first()
+    if not backup:
+        raise HTTPException(status_code=404, detail="백업을 찾을 수 없습니다.")
+    return backup
+
+
+@router.get("/backup/{backup_id}", response_model=ConfigBackupResponse)
+def get_config_backup(backup_id: int, db: Session = Depends(get_db)):
+    """
+    백업 하나의 파싱된 설정을 조회합니다.
+    """
+    backup = _get_backup(db, backup_id)
+    return ConfigBackupResponse(
+        id=backup.id, device_id=backup.device_id, config_sha256=backup.config_sha256,
+        config_size=backup.config_size, config_changed_at=backup.config_changed_at,
+        created_at=backup.created_at, parsed_config=config_store.backup_parsed(db, backup),
+    )
+
+
+@router.get("/backup/{backup_id}/raw", response_class=PlainTextResponse)
+def get_config_backup_raw(backup_id: int, db: Session = Depends(get_db)):
+    """
+    백업 하나의 원본 running-config 텍스트를 반환합니다.
+    """
+    raw_config = config_store.backup_config(db, _get_backup(db, backup_id))
+    if raw_config is None:
+        raise HTTPException(status_code=404, detail="설정 본문이 없습니다.")
+    return raw_config
+
+
 @router.post("/deploy/{device_id}/{template_id}")
 def deploy_config(device_id: int, template_id: int, db: Session = Depends(get_db)):
     """
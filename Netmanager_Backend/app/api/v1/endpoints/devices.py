@@ -1,10 +1,12 @@
 from typing import List
 from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
-from app.schemas.device import DeviceAuthRequest, DeviceAuthResponse, DeviceCreate, DeviceResponse
+from app.schemas.device import DeviceAuthRequest, DeviceAuthResponse, DeviceCreate, DeviceUpdate, DeviceResponse
 from app.services.ssh_service import DeviceConnection, DeviceInfo
 from app.db.session import get_db
 from app.models.device import Device  # DB 모델
+from app.services.device_index import device_index
 
 router = APIRouter()
 
@@ -41,11 +43,55 @@ def create_device(device_in: DeviceCreate, db: Session = Depends(get_db)):
         secret=device_in.secret,
         device_type=device_in.device_type,
         port=device_in.port,
+        site=device_in.site,
         snmp_community=device_in.snmp_community,
+        snmp_version=device_in.snmp_version,
+        snmp_v3_username=device_in.snmp_v3_username,
+        snmp_v3_auth_protocol=device_in.snmp_v3_auth_protocol,
+        snmp_v3_auth_key=device_in.snmp_v3_auth_key,
+        snmp_v3_priv_protocol=device_in.snmp_v3_priv_protocol,
+        snmp_v3_priv_key=device_in.snmp_v3_priv_key,
+        critical=device_in.critical,
+        poll_interval=device_in.poll_interval,
         status="unknown"
     )
 
     db.add(new_device)
     db.commit()
     db.refresh(new_device)
-    return new_device
\ No newline at end of file
+
+    # syslog 수신 경로의 host -> device_id 인덱스에 즉시 반영
+    device_index.upsert(new_device.id, new_device.host)
+    return new_device
+
+
+# [신규] 장비 수정 API
+@router.put("/{device_id}", response_model=DeviceResponse)
+def update_device(device_id: int, update: DeviceUpdate, db: Session = Depends(get_db)):
+    device = db.query(Device).filter(Device.id == device_id).first()
+    if not device:
+        raise HTTPException(status_code=404, detail="장비를 찾을 수 없습니다.")
+    for key, value in update.model_dump(exclude_unset=True).items():
+        setattr(device, key, value)
+    try:
+        db.commit()
+    except IntegrityError:
+        db.rollback()
+        raise HTTPException(status_code=409, detail="다른 장비와 충돌하거나 비울 수 없는 값입니다.")
+    db.refresh(device)
+
+    device_index.upsert(device.id, device.host)
+    return device
+
+
+# [신규] 장비 삭제 API
+@router.delete("/{device_id}")
+def delete_device(device_id: int, db: Session = Depends(get_db)):
+    device = db.query(Device).filter(Device.id == device_id).first()
+    if not device:
+        raise HTTPException(status_code=404, detail="장비를 찾을 수 없습니다.")
+    db.delete(device)
+    db.commit()
+
+    device_index.remove(device_id)
+    return {"message": "삭제 완료"}
@@ -1,24 +1,130 @@
-from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
-from app.db.session import get_db
-from app.models.log import EventLog
-from typing import List
+import base64
+import json
+from datetime import datetime
+from fastapi import APIRouter, HTTPException, Request, Response
+from fastapi.responses import StreamingResponse
+from app.services.log_store import log_store
+from app.services.log_stream import log_broker
+from app.services.syslog_service import get_syslog_stats
+from typing import List, Optional, Tuple
 
 router = APIRouter()
 
+
+def encode_cursor(timestamp: datetime, log_id: int) -> str:
+    return base64.urlsafe_b64encode(f"{timestamp.isoformat()}|{log_id}".encode()).decode()
+
+
+def log_key(row: dict) -> str:
+    """응답의 로그 id. DB id는 일자별 파티션마다 1부터 다시 시작하므로 파티션 키를 붙임 (예: 20260117-42)"""
+    return f"{row['partition']}-{row['id']}"
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    try:
+        ts, log_id = base64.urlsafe_b64decode(cursor.encode()).decode().split("|")
+        return datetime.fromisoformat(ts), int(log_id)
+    except Exception:
+        raise HTTPException(status_code=400, detail="잘못된 cursor 값입니다.")
+
+
 @router.get("/", response_model=List[dict])
 def get_logs(
-    skip: int = 0, limit: int = 100, severity: str = None, db: Session = Depends(get_db)
+    response: Response,
+    skip: int = 0, limit: int = 100, severity: str = None,
+    source: Optional[str] = None, event_id: Optional[str] = None,
+    since: Optional[datetime] = None, until: Optional[datetime] = None,
+    cursor: Optional[str] = None
+):
+    """
+    로그 목록 (최신순). 다음 페이지는 응답 헤더 X-Next-Cursor 값을 cursor로 넘겨 조회합니다.
+    skip(OFFSET)은 하위 호환용이며, 깊은 페이지에서는 cursor 사용을 권장합니다.
+    """
+    logs = log_store.query_logs(
+        severity, source, event_id, since, until,
+        cursor=decode_cursor(cursor) if cursor else None,
+        limit=limit, skip=0 if cursor else skip
+    )
+
+    if len(logs) == limit:
+        response.headers["X-Next-Cursor"] = encode_cursor(logs[-1]["timestamp"], logs[-1]["id"])
+
+    return [ {
+        "id": log_key(log),
+        "timestamp": log["timestamp"],
+        "severity": log["severity"],
+        "source": log["source"],
+        "event_id": log["event_id"],
+        "message": log["message"],
+        "repeat_count": log["repeat_count"],
+        "first_seen": log["first_seen"],
+        "last_seen": log["last_seen"]
+    } for log in logs ]
+
+@router.get("/search", response_model=List[dict])
+def search_logs(
+    q: str, days: int = 7, severity: Optional[str] = None, source: Optional[str] = None,
+    skip: int = 0, limit: int = 50
 ):
-    query = db.query(EventLog).order_by(EventLog.timestamp.desc())
-    if severity:
-        query = query.filter(EventLog.severity == severity.upper())
-    logs = query.offset(skip).limit(limit).all()
+    """
+    메시지 전문 검색 (인터페이스 이름, MAC 주소 등). 관련도 순으로 반환합니다.
+    예: /logs/search?q=GigabitEthernet1/0/3&days=3
+    """
+    hits = log_store.search(q, days=days, severity=severity, source=source, limit=limit, skip=skip)
     return [ {
-        "id": log.id,
-        "timestamp": log.timestamp,
-        "severity": log.severity,
-        "source": log.source,
-        "event_id": log.event_id,
-        "message": log.message
-    } for log in logs ]
\ No newline at end of file
+        "id": log_key(hit),
+        "timestamp": hit["timestamp"],
+        "severity": hit["severity"],
+        "source": hit["source"],
+        "event_id": hit["event_id"],
+        "message": hit["message"],
+        "repeat_count": hit["repeat_count"],
+        "score": hit["score"]
+    } for hit in hits ]
+
+@router.get("/stream")
+async def stream_logs(request: Request, severity: Optional[str] = None, source: Optional[str] = None):
+    """
+    실시간 로그 스트림 (Server-Sent Events). 폴링 대신 수신 즉시 push 합니다.
+    severity는 콤마로 여러 개 지정 가능 (예: ?severity=CRITICAL,WARNING&source=10.1.1.1)
+    클라이언트가 느려 버려진 메시지가 있으면 'dropped' 이벤트로 건수를 알려줍니다.
+    """
+    severities = {s.strip().upper() for s in severity.split(",") if s.strip()} if severity else None
+    sub = log_broker.subscribe(severities, source)
+
+    async def events():
+        try:
+            while not await request.is_disconnected():
+                rows, dropped = await sub.get_batch(timeout=15.0)
+                if dropped:
+                    yield f"event: dropped\ndata: {dropped}\n\n"
+                for row in rows:
+                    data = {key: row.get(key) for key in
+                            ("timestamp", "severity", "source", "event_id", "message", "device_id")}
+                    yield f"data: {json.dumps(data, default=str, ensure_ascii=False)}\n\n"
+                if not rows and not dropped:
+                    yield ": keep-alive\n\n"
+        finally:
+            log_broker.unsubscribe(sub)
+
+    return StreamingResponse(events(), media_type="text/event-stream",
+                             headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
+@router.get("/stats")
+def get_ingest_stats():
+    """
+    Syslog 수신 파이프라인 카운터 (received / dropped / queued / flushed)
+    """
+    return get_syslog_stats()
+
+
+@router.get("/summary")
+def get_log_summary(hours: int = 24, severity: Optional[str] = None, group_by: str = "device"):
+    """
+    최근 N시간 이벤트 건수 (시간별 집계 테이블 기반, 최대 5분 지연)
+    group_by: device | source | event_id | severity
+    예: /logs/summary?hours=24&severity=CRITICAL&group_by=device
+    """
+    if group_by not in ("device", "source", "event_id", "severity"):
+        raise HTTPException(status_code=400, detail="group_by는 device, source, event_id, severity 중 하나입니다.")
+    return log_store.summarize(hours, severity, group_by)
@@ -0,0 +1,61 @@
+from datetime import datetime, timedelta
+from fastapi import APIRouter, Depends
+from sqlalchemy.orm import Session
+from app.db.session import get_db
+from app.models.metrics import PollRun
+from app.services.metrics_store import metrics_store, to_epoch
+from app.services.metrics_rollup import metrics_rollup, METRICS_MAX_POINTS
+from typing import List, Optional
+
+router = APIRouter()
+
+
+@router.get("/devices/{device_id}", response_model=List[dict])
+def get_device_metrics(device_id: int, since: Optional[datetime] = None, until: Optional[datetime] = None,
+                       limit: int = 10000):
+    """
+    장비 CPU/메모리/업타임/도달 여부 시계열 (기본: 최근 24시간, 시간 오름차순)
+    예: /metrics/devices/3?since=2024-12-20T00:00:00
+    """
+    until = until or datetime.utcnow()
+    since = since or until - timedelta(hours=24)
+    return metrics_store.query(device_id, to_epoch(since), to_epoch(until), limit=limit)
+
+
+@router.get("/devices/{device_id}/interfaces", response_model=List[dict])
+def get_interface_stats(device_id: int):
+    """인터페이스별 최신 입/출력 bps와 회선 대비 사용률(%) (토폴로지 링크 사용률 표시용)"""
+    return metrics_store.interface_stats(device_id)
+
+
+@router.get("/latest", response_model=List[dict])
+def get_latest_metrics():
+    """장비별 가장 최근 샘플"""
+    return metrics_store.latest()
+
+
+@router.get("/poll-runs", response_model=List[dict])
+def get_poll_runs(limit: int = 20, db: Session = Depends(get_db)):
+    """최근 전체 폴링 실행 기록 (소요 시간이 beat 주기 60초를 넘는지 확인)"""
+    runs = db.query(PollRun).order_by(PollRun.id.desc()).limit(limit).all()
+    return [ {
+        "started_at": run.started_at,
+        "duration_ms": run.duration_ms,
+        "device_count": run.device_count,
+        "online": run.online,
+        "offline": run.offline,
+        "concurrency": run.concurrency
+    } for run in runs ]
+
+
+@router.get("/devices/{device_id}/series")
+def get_device_metric_series(device_id: int, since: Optional[datetime] = None, until: Optional[datetime] = None,
+                             resolution: Optional[int] = None, max_points: int = METRICS_MAX_POINTS):
+    """
+    장비 시계열 (다운샘플링 tier 자동 선택). resolution(초)을 만족하는 가장 거친 tier에서 읽습니다.
+    예: /metrics/devices/3/series?since=2024-01-01T00:00:00&resolution=3600  -> 1h tier
+    응답: {"tier": "raw|5m|1h|1d", "step": 초, "points": [{ts, availability, cpu_min/max/avg, mem_min/max/avg}]}
+    """
+    until = until or datetime.utcnow()
+    since = since or until - timedelta(hours=24)
+    return metrics_rollup.query_series(device_id, to_epoch(since), to_epoch(until), resolution, max_points)
@@ -1,3 +1,3 @@
-from sqlalchemy.ext.declarative import declarative_base
-
-Base = declarative_base()
\ No newline at end of file
+# 모든 모델이 같은 metadata를 쓰도록 session.py의 Base를 그대로 사용
+# (별도 declarative_base를 만들면 main.py의 create_all에서 devices 테이블이 빠짐)
+from app.db.session import Base
@@ -0,0 +1,60 @@
+"""
+기존 DB 스키마 보강 (마이그레이션 도구 없이 앱 시작 시 실행).
+
+create_all은 없는 테이블만 만들고 이미 있는 테이블은 건드리지 않으므로,
+모델에 컬럼/인덱스가 추가되면 예전 DB 파일에서는 "no such column" 오류가 납니다.
+upgrade_schema는 모델(Base.metadata)과 실제 테이블을 비교해 빠진 컬럼은 ALTER TABLE ADD COLUMN,
+빠진 인덱스는 CREATE INDEX로 추가합니다. (컬럼 삭제/타입 변경은 하지 않음)
+"""
+from typing import List
+from sqlalchemy import Column, MetaData, inspect, literal, text
+from sqlalchemy.engine import Engine
+from app.db.base import Base
+from app.db.session import engine
+
+
+def _column_ddl(column: Column, dialect) -> str:
+    ddl = f"{column.name} {column.type.compile(dialect=dialect)}"
+    # 상수 기본값은 DEFAULT로 지정해 기존 행도 같은 값을 갖도록 (repeat_count=1 등)
+    default = column.default
+    if default is not None and default.is_scalar:
+        value = literal(default.arg, type_=column.type).compile(
+            dialect=dialect, compile_kwargs={"literal_binds": True}
+        )
+        ddl += f" DEFAULT {value}"
+    # 외래 키 (SQLite는 ADD COLUMN의 REFERENCES를 기본값이 NULL일 때만 허용)
+    if len(column.foreign_keys) == 1 and (default is None or default.arg is None):
+        fk = next(iter(column.foreign_keys))
+        ddl += f" REFERENCES {fk.column.table.name} ({fk.column.name})"
+    return ddl
+
+
+def upgrade_schema(bind: Engine = engine, metadata: MetaData = Base.metadata) -> List[str]:
+    """빠진 컬럼/인덱스 추가. 실행한 DDL 목록 반환 (이미 최신이면 빈 목록)"""
+    inspector = inspect(bind)
+    existing_tables = set(inspector.get_table_names())
+    statements = []
+    for table in metadata.sorted_tables:
+        if table.name not in existing_tables:
+            continue  # create_all이 만듦
+        columns = {column["name"] for column in inspector.get_columns(table.name)}
+        for column in table.columns:
+            if column.name not in columns:
+                statements.append(f"ALTER TABLE {table.name} ADD COLUMN {_column_ddl(column, bind.dialect)}")
+
+    with bind.begin() as conn:
+        for statement in statements:
+            conn.execute(text(statement))
+        # create_all은 기존 테이블의 인덱스도 만들지 않으므로 여기서 추가
+        for table in metadata.sorted_tables:
+            if table.name not in existing_tables:
+                continue
+            indexes = {index["name"] for index in inspector.get_indexes(table.name)}
+            for index in table.indexes:
+                if index.name not in indexes:
+                    index.create(conn)
+                    statements.append(f"CREATE INDEX {index.name}")
+
+    for statement in statements:
+        print(f"[Schema Upgrade] {statement}")
+    return statements
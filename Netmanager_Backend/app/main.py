@@ -4,15 +4,20 @@ import uvicorn
 from app.api.v1.router import api_router
 from app.db.session import engine
 from app.db.base import Base  # Base 임포트 (declarative_base)
+from app.db.upgrade import upgrade_schema
 from app.models import device  # device 모델
 from app.models.log import EventLog  # EventLog 모델
+from app.models import metrics  # 폴링 실행 기록 / 장비 메트릭
 from app.api.v1.endpoints.config_template import router as config_template_router  # 직접 임포트 추가
 from contextlib import asynccontextmanager
-from app.services.syslog_service import start_syslog_server
+from app.services.syslog_service import start_syslog_server, get_syslog_pipeline
+from app.services.snmp_trap_service import start_trap_server
 import threading
 
 # 모든 모델 테이블 생성 (Base 사용)
 Base.metadata.create_all(bind=engine)
+# 기존 DB 파일에 모델에 새로 추가된 컬럼/인덱스 반영 (create_all은 기존 테이블을 변경하지 않음)
+upgrade_schema(engine)
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
@@ -22,9 +27,14 @@ async def lifespan(app: FastAPI):
     syslog_thread = threading.Thread(target=start_syslog_server, daemon=True)
     syslog_thread.start()
 
+    print("🚀 Starting SNMP Trap Receiver...")
+    trap_thread = threading.Thread(target=start_trap_server, daemon=True)
+    trap_thread.start()
+
     yield
 
     print("🛑 Stopping Scheduler and Syslog Server...")
+    get_syslog_pipeline().stop()  # 대기 중인 로그 flush
 
 app = FastAPI(
     title="NetManager API",
@@ -39,6 +49,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],  # 로그 키셋 페이지네이션 커서
 )
 
 # 기존 라우터 등록
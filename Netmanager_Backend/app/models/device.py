@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, Boolean, ForeignKey, Text, JSON
+from sqlalchemy import Column, Integer, String, DateTime, Boolean, ForeignKey, Text, JSON, LargeBinary
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.db.session import Base
@@ -15,11 +15,20 @@ class Device(Base):
     secret = Column(String, nullable=True)
     device_type = Column(String, default="cisco_ios")
     port = Column(Integer, default=22)
+    site = Column(String, nullable=True, index=True)  # 설치 위치(지점). 사이트별 동시 작업 수 제한에 사용
 
     # 모니터링 관련 필드
     snmp_community = Column(String, default="public")
     snmp_version = Column(Integer, default=2)
+    # SNMPv3 (snmp_version=3): USM 계정 (authPriv)
+    snmp_v3_username = Column(String, nullable=True)
+    snmp_v3_auth_protocol = Column(String, default="sha")   # md5 / sha / sha256 ...
+    snmp_v3_auth_key = Column(String, nullable=True)        # 실제 배포 시 암호화 필요
+    snmp_v3_priv_protocol = Column(String, default="aes")   # des / 3des / aes / aes192 / aes256
+    snmp_v3_priv_key = Column(String, nullable=True)
     status = Column(String, default="unknown")
+    critical = Column(Boolean, default=False)       # 핵심 장비: 더 짧은 주기로 폴링
+    poll_interval = Column(Integer, nullable=True)  # 장비별 폴링 주기(초), 없으면 기본값
 
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
@@ -34,13 +43,33 @@ class ConfigBackup(Base):
     id = Column(Integer, primary_key=True, index=True)
     device_id = Column(Integer, ForeignKey("devices.id", ondelete="CASCADE"))
 
-    # 원본 설정 (Raw Text)
-    raw_config = Column(Text, nullable=True)
+    # 원본 설정 / 파싱된 설정: config_blobs의 내용 해시 참조 (config_store로 읽고 씀)
+    config_sha256 = Column(String(64), ForeignKey("config_blobs.sha256"), index=True, nullable=True)
+    parsed_sha256 = Column(String(64), ForeignKey("config_blobs.sha256"), nullable=True)
+    config_size = Column(Integer, nullable=True)  # 원본 설정 크기 (bytes)
 
-    # 파싱된 설정 (JSON 구조)
+    # [이전 방식] 본문 직접 저장 (블롭 참조 이전에 만들어진 행만 사용)
+    raw_config = Column(Text, nullable=True)
     parsed_config = Column(JSON, nullable=True)
 
+    # 장비가 보고한 마지막 설정 변경 표시 (IOS "Last configuration change at ..." 줄, 변경 감지용)
+    config_changed_at = Column(String, nullable=True)
+
     created_at = Column(DateTime(timezone=True), server_default=func.now())
 
     # 관계 설정
-    device = relationship("Device", back_populates="backups")
\ No newline at end of file
+    device = relationship("Device", back_populates="backups")
+
+
+class ConfigBlob(Base):
+    """설정 본문 (sha256 내용 주소, 압축 / 직전 버전 대비 델타). 같은 내용은 한 번만 저장"""
+    __tablename__ = "config_blobs"
+
+    sha256 = Column(String(64), primary_key=True)
+    codec = Column(String(16), nullable=False)  # zstd / zlib
+    base_sha256 = Column(String(64), nullable=True)  # 델타 기준 블롭 (없으면 전체 본문)
+    depth = Column(Integer, default=0)  # 델타 체인 깊이
+    size = Column(Integer)  # 원본 크기 (bytes)
+    stored_size = Column(Integer)  # 저장된 크기 (bytes)
+    data = Column(LargeBinary, nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
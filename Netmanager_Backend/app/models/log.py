@@ -1,15 +1,60 @@
-from sqlalchemy import Column, Integer, String, DateTime, Text
+from sqlalchemy import Column, Integer, String, DateTime, Text, Index, Table, MetaData
 from app.db.base import Base
 from datetime import datetime
 
+
+def build_event_log_table(name: str, metadata: MetaData) -> Table:
+    """
+    이벤트 로그 테이블 정의. 기존 event_logs 테이블과 일자별 파티션(event_logs_YYYYMMDD)이
+    같은 컬럼/인덱스 구성을 쓰도록 한 곳에서 만듭니다. (인덱스 이름은 테이블 이름 기준으로 생성)
+    """
+    return Table(
+        name, metadata,
+        Column("id", Integer, primary_key=True, index=True),
+        Column("timestamp", DateTime, default=datetime.utcnow),
+        Column("severity", String(20)),  # CRITICAL, WARNING, INFO
+        Column("source", String(50)),    # 장비 이름 or IP
+        Column("event_id", String(50)),  # LINK_DOWN, HIGH_CPU 등
+        Column("message", Text),
+
+        # 반복 이벤트 합치기 (스톰 억제): 같은 이벤트가 몇 번, 언제부터 언제까지 발생했는지
+        Column("repeat_count", Integer, default=1),
+        Column("first_seen", DateTime, default=datetime.utcnow),
+        Column("last_seen", DateTime, default=datetime.utcnow),
+
+        Column("device_id", Integer),    # devices 테이블 FK (옵션)
+
+        # 로그 조회 API의 (timestamp, id) 키셋 페이지네이션용 복합 인덱스
+        # 필터 컬럼을 앞에 두어 "필터 + 최신순 정렬"을 인덱스 범위 스캔 한 번으로 처리
+        Index(f"ix_{name}_ts_id", "timestamp", "id"),
+        Index(f"ix_{name}_severity_ts_id", "severity", "timestamp", "id"),
+        Index(f"ix_{name}_source_ts_id", "source", "timestamp", "id"),
+        Index(f"ix_{name}_event_ts_id", "event_id", "timestamp", "id"),
+    )
+
+
 class EventLog(Base):
-    __tablename__ = "event_logs"
+    # 파티션 도입 이전의 단일 테이블. 이제 신규 로그는 일자별 파티션에 저장되고 (app.services.log_store)
+    # 이 테이블은 기존 데이터 조회용으로 가장 오래된 파티션처럼 취급됩니다.
+    __table__ = build_event_log_table("event_logs", Base.metadata)
+
+
+class EventLogRollup(Base):
+    """
+    시간(hour) 단위 이벤트 집계. 대시보드 쿼리("최근 24시간 장비별 CRITICAL 건수" 등)는
+    원본 로그 대신 이 테이블을 읽습니다. (app.tasks.logs.rollup_event_logs 가 주기적으로 갱신)
+    """
+    __tablename__ = "event_log_rollups"
 
-    id = Column(Integer, primary_key=True, index=True)
-    timestamp = Column(DateTime, default=datetime.utcnow)
-    severity = Column(String(20))  # CRITICAL, WARNING, INFO
-    source = Column(String(50))    # 장비 이름 or IP
-    event_id = Column(String(50))  # LINK_DOWN, HIGH_CPU 등
-    message = Column(Text)
+    id = Column(Integer, primary_key=True)
+    hour = Column(DateTime, nullable=False)   # 집계 구간 시작 (UTC, 정시)
+    severity = Column(String(20))
+    source = Column(String(50))
+    event_id = Column(String(50))
+    device_id = Column(Integer)
+    count = Column(Integer, default=0)        # repeat_count 합계
 
-    device_id = Column(Integer)    # devices 테이블 FK (옵션)
\ No newline at end of file
+    __table_args__ = (
+        Index("ix_event_log_rollups_hour_severity", "hour", "severity"),
+        Index("ix_event_log_rollups_device_hour", "device_id", "hour"),
+    )
@@ -0,0 +1,81 @@
+from sqlalchemy import Column, Integer, SmallInteger, Float, Boolean, DateTime, Index, String
+from app.db.session import Base
+from datetime import datetime
+
+
+class PollRun(Base):
+    """monitor_all_devices 1회 실행 기록. 전체 장비 폴링이 beat 주기 안에 끝나는지 확인하는 용도"""
+    __tablename__ = "poll_runs"
+
+    id = Column(Integer, primary_key=True, index=True)
+    started_at = Column(DateTime, default=datetime.utcnow, index=True)
+    duration_ms = Column(Integer)       # 전체 폴링 소요 시간
+    device_count = Column(Integer, default=0)
+    online = Column(Integer, default=0)
+    offline = Column(Integer, default=0)
+    concurrency = Column(Integer)       # 실행 당시 동시 폴링 수
+
+
+class DeviceMetric(Base):
+    """
+    장비별 1분 단위 CPU/메모리/업타임/도달 여부 시계열 (append-only).
+    - PK가 (device_id, ts)라서 "장비 X의 기간 조회"는 PK 인덱스 범위 스캔 한 번으로 끝남
+    - SQLite에서는 WITHOUT ROWID 테이블로 만들어 행이 PK 순서로 저장됨 (별도 인덱스/rowid 없음)
+    - ts는 DateTime 문자열 대신 epoch 초(INTEGER)로 저장해 행 크기를 줄임
+    """
+    __tablename__ = "device_metrics"
+
+    device_id = Column(Integer, primary_key=True, autoincrement=False)
+    ts = Column(Integer, primary_key=True, autoincrement=False)  # UTC epoch seconds
+    cpu = Column(SmallInteger)          # %
+    mem = Column(Float)                 # %
+    uptime = Column(Integer)            # 초 (sysUpTime / 100)
+    reachable = Column(Boolean, nullable=False, default=False)
+
+    __table_args__ = (
+        # 롤업 작업이 "최근 N분의 전체 장비 샘플"을 읽을 때 사용
+        Index("ix_device_metrics_ts", "ts"),
+        {"sqlite_with_rowid": False},
+    )
+
+
+class DeviceMetricRollup(Base):
+    """
+    device_metrics 다운샘플링 결과 (5분 / 1시간 / 1일 단위 min/max/avg).
+    tier는 구간 길이(초)이며, 각 tier는 보존 기간이 따로 있습니다. (app.services.metrics_rollup)
+    """
+    __tablename__ = "device_metric_rollups"
+
+    tier = Column(Integer, primary_key=True, autoincrement=False)       # 300, 3600, 86400
+    device_id = Column(Integer, primary_key=True, autoincrement=False)
+    bucket = Column(Integer, primary_key=True, autoincrement=False)     # 구간 시작 (UTC epoch seconds)
+    samples = Column(Integer, default=0)       # 원본 샘플 수
+    up_samples = Column(Integer, default=0)    # 그중 reachable 샘플 수
+    cpu_min = Column(Float)
+    cpu_max = Column(Float)
+    cpu_avg = Column(Float)
+    mem_min = Column(Float)
+    mem_max = Column(Float)
+    mem_avg = Column(Float)
+
+    __table_args__ = (
+        Index("ix_device_metric_rollups_tier_bucket", "tier", "bucket"),
+        {"sqlite_with_rowid": False},
+    )
+
+
+class InterfaceStat(Base):
+    """
+    인터페이스별 최신 트래픽 (bps / 사용률). 폴링마다 장비 단위로 통째로 교체되며 이력은 남기지 않습니다.
+    토폴로지 NetworkLink.utilization 값의 출처.
+    """
+    __tablename__ = "interface_stats"
+
+    device_id = Column(Integer, primary_key=True, autoincrement=False)
+    if_index = Column(Integer, primary_key=True, autoincrement=False)
+    name = Column(String(64))
+    in_bps = Column(Integer)
+    out_bps = Column(Integer)
+    speed_mbps = Column(Integer)
+    utilization = Column(Float)         # %
+    ts = Column(Integer)                # 계산 시각 (UTC epoch seconds)
@@ -1,19 +1,58 @@
-from pydantic import BaseModel
-from typing import Optional, Dict, Any
+from pydantic import BaseModel, Field, field_validator
+from typing import Optional, Dict, Any, List
 from datetime import datetime
 
 # --- 장비 관련 스키마 ---
-class DeviceCreate(BaseModel):
+class DeviceBase(BaseModel):
+    """장비 공통 필드 (비밀번호/enable secret/SNMPv3 키 같은 자격 증명은 제외 - 응답에 노출하지 않음)"""
     name: str
     host: str
     username: str
-    password: str
-    secret: Optional[str] = None
     device_type: str = "cisco_ios"
     port: int = 22
+    site: Optional[str] = None
     snmp_community: str = "public"
+    snmp_version: int = 2
+    snmp_v3_username: Optional[str] = None
+    snmp_v3_auth_protocol: str = "sha"
+    snmp_v3_priv_protocol: str = "aes"
+    critical: bool = False
+    poll_interval: Optional[int] = None
+
+class DeviceCreate(DeviceBase):
+    password: str
+    secret: Optional[str] = None
+    snmp_v3_auth_key: Optional[str] = None
+    snmp_v3_priv_key: Optional[str] = None
 
-class DeviceResponse(DeviceCreate):
+class DeviceUpdate(BaseModel):
+    host: Optional[str] = None
+    username: Optional[str] = None
+    password: Optional[str] = None
+    secret: Optional[str] = None
+    device_type: Optional[str] = None
+    port: Optional[int] = None
+    site: Optional[str] = None
+    snmp_community: Optional[str] = None
+    snmp_version: Optional[int] = None
+    snmp_v3_username: Optional[str] = None
+    snmp_v3_auth_protocol: Optional[str] = None
+    snmp_v3_auth_key: Optional[str] = None
+    snmp_v3_priv_protocol: Optional[str] = None
+    snmp_v3_priv_key: Optional[str] = None
+    critical: Optional[bool] = None
+    poll_interval: Optional[int] = None
+
+    # 생략은 "변경 없음", 명시적 null은 값 지우기. 값이 꼭 있어야 하는 필드는 null로 지울 수 없음
+    @field_validator("host", "username", "password", "device_type", "port", "snmp_community", "snmp_version",
+                     "snmp_v3_auth_protocol", "snmp_v3_priv_protocol", "critical")
+    @classmethod
+    def reject_null(cls, value):
+        if value is None:
+            raise ValueError("null로 지울 수 없는 필드입니다.")
+        return value
+
+class DeviceResponse(DeviceBase):
     id: int
     status: str
     created_at: datetime
@@ -35,12 +74,26 @@ class DeviceAuthResponse(BaseModel):
     message: str
     device_info: dict = {}
 
+# --- 전체 장비 설정 수집 요청 ---
+class FleetPullRequest(BaseModel):
+    device_ids: Optional[List[int]] = None  # 없으면 전체 장비
+    site: Optional[str] = None
+    concurrency: Optional[int] = Field(None, ge=1)       # 전체 동시 SSH 세션 수
+    site_concurrency: Optional[int] = Field(None, ge=1)  # 사이트별 동시 SSH 세션 수
+    backend: Optional[str] = None           # netmiko / asyncssh
+    force: bool = False                     # 변경 감지 없이 전체 수집
+
 # --- [추가] 설정 백업 응답 스키마 ---
-class ConfigBackupResponse(BaseModel):
+class ConfigBackupSummary(BaseModel):
     id: int
     device_id: int
-    parsed_config: Optional[Dict[str, Any]] = None
+    config_sha256: Optional[str] = None  # 같은 해시 = 같은 설정
+    config_size: Optional[int] = None
+    config_changed_at: Optional[str] = None
     created_at: datetime
 
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+class ConfigBackupResponse(ConfigBackupSummary):
+    parsed_config: Optional[Dict[str, Any]] = None
\ No newline at end of file
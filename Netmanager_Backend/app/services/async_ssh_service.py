@@ -0,0 +1,267 @@
+import asyncio
+import logging
+import re
+import threading
+from concurrent.futures import Future
+from typing import List, Optional, Tuple, Union
+
+from app.services.cli_prompt import (
+    FALLBACK_IDLE, INITIAL_PROMPT_PATTERN, base_prompt, paging_command, prompt_pattern, response_times,
+)
+from app.services.ssh_service import ConnectionStatus, DeviceInfo
+
+logger = logging.getLogger(__name__)
+
+# 라이브러리 로드 시도 (asyncssh는 선택 의존성)
+try:
+    import asyncssh
+
+    ASYNCSSH_AVAILABLE = True
+except ImportError as e:
+    ASYNCSSH_AVAILABLE = False
+    logger.error(f"Error importing asyncssh: {e}")
+
+PASSWORD_PATTERN = re.compile(r"(?i)password:\s*\Z")
+LINEFEED_PATTERN = re.compile(r"\r\r\n|\r\n|\n\r")
+INITIAL_PROMPT_WAIT = 2.0  # 로그인 직후 프롬프트를 기다리는 시간 (없으면 줄바꿈 전송)
+TERMINAL_WIDTH = 511
+READ_CHUNK = 65536
+
+
+class PromptTimeout(asyncio.TimeoutError):
+    """제한 시간 안에 프롬프트를 못 찾음 (output = 그때까지 읽은 출력)"""
+
+    def __init__(self, message: str, output: str):
+        super().__init__(message)
+        self.output = output
+
+
+class AsyncDeviceConnection:
+    """
+    asyncssh 기반 DeviceConnection (같은 connect / send_command / send_config_commands 인터페이스, 전부 코루틴).
+    고정 지연(global_delay_factor) 대신 장비 프롬프트가 나올 때까지만 읽으므로 명령마다 잠들지 않고,
+    스레드를 점유하지 않아 이벤트 루프 하나로 수백 개 세션을 동시에 다룰 수 있습니다.
+    """
+
+    def __init__(self, device_info: DeviceInfo):
+        self.device_info = device_info
+        self.connection = None
+        self.process = None
+        self.status = ConnectionStatus.DISCONNECTED
+        self.last_error = None
+        self.prompt_base: Optional[str] = None
+        self._prompt_pattern: Optional[re.Pattern] = None
+
+    async def connect(self) -> bool:
+        if not ASYNCSSH_AVAILABLE:
+            self.last_error = "asyncssh library not installed"
+            self.status = ConnectionStatus.ERROR
+            return False
+
+        self.status = ConnectionStatus.CONNECTING
+        try:
+            logger.info(f"Connecting to {self.device_info.host} (asyncssh)...")
+            self.connection = await asyncio.wait_for(asyncssh.connect(
+                self.device_info.host, port=self.device_info.port,
+                username=self.device_info.username, password=self.device_info.password,
+                known_hosts=None, client_keys=None,
+            ), self.device_info.timeout)
+            # 장비 CLI는 대화형 셸(pty)에서만 프롬프트를 보여 줌
+            self.process = await self.connection.create_process(
+                term_type="vt100", term_size=(TERMINAL_WIDTH, 24), encoding="utf-8", errors="replace",
+            )
+
+            # 로그인 후 장비가 스스로 보여 주는 프롬프트를 기다리고, 없을 때만 줄바꿈으로 요청
+            # (먼저 줄바꿈을 보내면 남은 프롬프트가 다음 명령의 완료로 오인될 수 있음)
+            try:
+                banner = await self._read_until(INITIAL_PROMPT_PATTERN, INITIAL_PROMPT_WAIT)
+            except asyncio.TimeoutError:
+                self.process.stdin.write("\n")
+                banner = await self._read_until(INITIAL_PROMPT_PATTERN, self.device_info.timeout)
+            self._set_prompt(base_prompt(banner))
+
+            if self.device_info.enable_password and banner.rstrip().endswith(">"):
+                self.process.stdin.write("enable\n")
+                output = await self._read_until((PASSWORD_PATTERN, self._prompt_pattern), self.device_info.timeout,
+                                                after="enable")
+                if PASSWORD_PATTERN.search(output):
+                    self.process.stdin.write(self.device_info.enable_password + "\n")
+                    output = await self._read_until(self._prompt_pattern, self.device_info.timeout)
+                if not output.rstrip().endswith("#"):
+                    raise ConnectionError("enable failed")
+
+            # [필수] 페이징 비활성화 (전체 출력 받기 위함, ASA는 terminal pager 0)
+            await self._send(paging_command(self.device_info.device_type))
+            await self._send(f"terminal width {TERMINAL_WIDTH}")
+
+            self.status = ConnectionStatus.CONNECTED
+            return True
+        except Exception as e:
+            self.last_error = f"Connection error: {str(e) or type(e).__name__}"
+            self.status = ConnectionStatus.ERROR
+            logger.error(self.last_error)
+            await self.disconnect()
+            self.status = ConnectionStatus.ERROR
+            return False
+
+    def _set_prompt(self, base: str):
+        # 호스트명 기준 플랫폼 프롬프트 (설정 모드 R1(config-if)#, ASA 컨텍스트 asa/ctx# 포함)
+        self.prompt_base = base
+        self._prompt_pattern = prompt_pattern(self.device_info.device_type, base)
+
+    async def _read_until(self, patterns: Union[re.Pattern, Tuple[re.Pattern, ...]], timeout: float,
+                          after: Optional[str] = None) -> str:
+        """
+        패턴(들) 중 하나가 출력 끝에 나타날 때까지 읽습니다 (프롬프트 = 명령 완료).
+        after가 있으면 그 문자열(에코된 명령) 뒤에서만 찾아, 이전에 남아 있던 프롬프트를 완료로 오인하지 않습니다.
+        """
+        if isinstance(patterns, re.Pattern):
+            patterns = (patterns,)
+        buffer = ""
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+
+        def complete() -> bool:
+            start = 0
+            if after:
+                start = buffer.find(after)
+                if start < 0:
+                    return False
+                start += len(after)
+            return any(pattern.search(buffer, start) for pattern in patterns)
+
+        while not complete():
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                raise PromptTimeout(f"prompt not found within {timeout:.1f}s", buffer)
+            try:
+                chunk = await asyncio.wait_for(self.process.stdout.read(READ_CHUNK), remaining)
+            except asyncio.TimeoutError:
+                raise PromptTimeout(f"prompt not found within {timeout:.1f}s", buffer)
+            if not chunk:
+                raise ConnectionError("connection closed by device")
+            buffer += chunk
+        return buffer
+
+    async def _read_idle(self, buffer: str, idle: float, timeout: float) -> str:
+        """고정 지연 방식: 출력이 idle초 동안 더 오지 않을 때까지 읽음 (전체 상한 timeout)"""
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        while loop.time() < deadline:
+            try:
+                chunk = await asyncio.wait_for(self.process.stdout.read(READ_CHUNK),
+                                               min(idle, deadline - loop.time()))
+            except asyncio.TimeoutError:
+                break
+            if not chunk:
+                raise ConnectionError("connection closed by device")
+            buffer += chunk
+        return buffer
+
+    async def _send(self, command: str, read_timeout: Optional[float] = None) -> str:
+        """
+        프롬프트가 나올 때까지만 읽습니다. 대기 상한은 이 장비/명령의 학습된 응답 시간.
+        그 안에 프롬프트를 못 찾으면 출력이 멈출 때까지 읽고(고정 지연), 마지막 줄이 프롬프트면
+        새 호스트명으로 다시 학습합니다 (설정 중 hostname 변경 등).
+        """
+        host = self.device_info.host
+        timeout = read_timeout or response_times.timeout(host, command, default=self.device_info.timeout)
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        self.process.stdin.write(command + "\n")
+        try:
+            output = await self._read_until(self._prompt_pattern, timeout, after=command)
+            response_times.observe(host, command, loop.time() - start)
+        except PromptTimeout as e:
+            response_times.record_fallback(host, command)
+            output = await self._read_idle(e.output, FALLBACK_IDLE, self.device_info.timeout)
+            base = base_prompt(output)
+            if command not in output or not base:
+                raise asyncio.TimeoutError(f"{host}: no prompt after '{command}'")
+            self._set_prompt(base)
+        return self._clean(output[output.find(command):], command)
+
+    @staticmethod
+    def _clean(output: str, command: str) -> str:
+        """에코된 명령 줄과 마지막 프롬프트 줄 제거"""
+        lines = LINEFEED_PATTERN.sub("\n", output).replace("\r", "\n").split("\n")
+        if lines and command and command.strip() in lines[0]:
+            lines = lines[1:]
+        if lines:
+            lines = lines[:-1]
+        return "\n".join(lines)
+
+    async def disconnect(self):
+        if self.connection:
+            try:
+                self.connection.close()
+                await self.connection.wait_closed()
+            except Exception:
+                pass
+            finally:
+                self.connection = None
+                self.process = None
+                self.status = ConnectionStatus.DISCONNECTED
+
+    def is_connected(self) -> bool:
+        return self.status == ConnectionStatus.CONNECTED and self.connection is not None
+
+    async def send_command(self, command: str, read_timeout: Optional[float] = None) -> str:
+        if not self.is_connected(): raise ConnectionError("Not connected")
+        try:
+            self.status = ConnectionStatus.BUSY
+            output = await self._send(command, read_timeout)
+            self.status = ConnectionStatus.CONNECTED
+            return output
+        except Exception as e:
+            self.last_error = str(e)
+            self.status = ConnectionStatus.ERROR
+            raise
+
+    async def send_config_commands(self, commands: List[str]) -> str:
+        if not self.is_connected(): raise ConnectionError("Not connected")
+        try:
+            self.status = ConnectionStatus.BUSY
+            outputs = [await self._send("configure terminal")]
+            for command in commands:
+                outputs.append(await self._send(command))
+            outputs.append(await self._send("end"))
+            self.status = ConnectionStatus.CONNECTED
+            return "\n".join(outputs)
+        except Exception as e:
+            self.last_error = str(e)
+            self.status = ConnectionStatus.ERROR
+            raise
+
+    async def get_running_config(self) -> str:
+        return await self.send_command("show running-config")
+
+
+class AsyncSshRunner:
+    """
+    동기 코드(Celery 태스크의 스레드 기반 디스패처 등)에서 AsyncDeviceConnection 작업을 돌리기 위한
+    백그라운드 이벤트 루프 스레드. submit()은 concurrent.futures.Future를 반환합니다.
+    """
+
+    def __init__(self):
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+
+    def __enter__(self):
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name="async-ssh-loop", daemon=True)
+        self._thread.start()
+        return self
+
+    def submit(self, coro) -> Future:
+        return asyncio.run_coroutine_threadsafe(coro, self._loop)
+
+    def __exit__(self, *exc):
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join(timeout=5)
+        if self._thread.is_alive():
+            # 응답 없는 장비 등으로 루프가 아직 돌고 있으면 닫을 수 없음 (daemon 스레드라 프로세스 종료 시 정리됨)
+            print("[Async SSH] event loop did not stop within 5s, leaving it running")
+        else:
+            self._loop.close()
+        self._loop = self._thread = None
@@ -0,0 +1,64 @@
+"""
+설정 블롭 압축/파일 저장 (백엔드 config_store와 GUI BackupInfo가 같이 쓰는 형식).
+
+objects/<해시 앞 2자리>/<sha256>.zst (zstandard 미설치 시 .z, zlib)
+GUI(cisco_config_editor)에서도 import하므로 표준 라이브러리와 zstandard 외의 의존성(sqlalchemy, app.*)을 두지 않습니다.
+"""
+import hashlib
+import os
+import zlib
+
+# 라이브러리 로드 시도 (zstandard는 선택 의존성)
+try:
+    import zstandard
+
+    ZSTD_AVAILABLE = True
+except ImportError as e:
+    ZSTD_AVAILABLE = False
+    print(f"[Config Store] zstandard not available, using zlib: {e}")
+
+CONFIG_STORE_CODEC = "zstd" if ZSTD_AVAILABLE else "zlib"
+ZSTD_LEVEL = 10
+ZLIB_LEVEL = 9
+
+FILE_EXTENSIONS = {"zstd": ".zst", "zlib": ".z"}
+
+
+def content_hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def compress(data: bytes, codec: str = CONFIG_STORE_CODEC) -> bytes:
+    if codec == "zstd":
+        return zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(data)
+    return zlib.compress(data, ZLIB_LEVEL)
+
+
+def decompress(data: bytes, codec: str) -> bytes:
+    if codec == "zstd":
+        if not ZSTD_AVAILABLE:
+            raise RuntimeError("zstd blob but zstandard library not installed")
+        return zstandard.ZstdDecompressor().decompress(data)
+    return zlib.decompress(data)
+
+
+def write_blob_file(objects_dir: str, text: str) -> str:
+    """objects_dir/<해시 앞 2자리>/<해시>.zst 에 압축 저장 (이미 있으면 쓰지 않음), 해시 반환"""
+    sha256 = content_hash(text)
+    path = os.path.join(objects_dir, sha256[:2], sha256 + FILE_EXTENSIONS[CONFIG_STORE_CODEC])
+    if not os.path.exists(path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(compress(text.encode("utf-8")))
+        os.replace(tmp_path, path)  # 동시에 같은 블롭을 써도 완성된 파일만 보이도록
+    return sha256
+
+
+def read_blob_file(objects_dir: str, sha256: str) -> str:
+    for codec, extension in FILE_EXTENSIONS.items():
+        path = os.path.join(objects_dir, sha256[:2], sha256 + extension)
+        if os.path.exists(path):
+            with open(path, "rb") as f:
+                return decompress(f.read(), codec).decode("utf-8")
+    raise FileNotFoundError(f"config blob {sha256} not found in {objects_dir}")
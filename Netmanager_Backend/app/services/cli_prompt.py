@@ -0,0 +1,121 @@
+"""
+CLI 프롬프트 기반 명령 완료 판단 (netmiko / asyncssh 백엔드 공용).
+
+- 플랫폼별 프롬프트 정규식: 장비 호스트명(base prompt)으로 만들어 출력 끝에 프롬프트가 나오면 완료로 봅니다.
+- 응답 시간 학습: (장비, 명령) 별 응답 시간을 EWMA(평균 + 편차, TCP RTO 방식)로 추적해 대기 시간 상한을 정합니다.
+  느린 장비/큰 출력은 충분히 기다리고, 빠른 장비는 멈췄을 때 빨리 실패합니다.
+- 프롬프트를 끝내 찾지 못하면 고정 지연 방식(global_delay_factor 2 / 출력이 멈출 때까지 읽기)으로 대체합니다.
+"""
+import re
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+# 플랫폼별 프롬프트 ({base} = 호스트명, 출력 끝에서만 매치)
+PLATFORM_PROMPTS: Dict[str, str] = {
+    # R1>  R1#  R1(config)#  R1(config-if)#
+    "cisco_ios": r"(?m)^{base}(?:\([^)\n]*\))?[>#]\s*\Z",
+    "cisco_iosxe": r"(?m)^{base}(?:\([^)\n]*\))?[>#]\s*\Z",
+    # N9K#  N9K(config)#  N9K(config-if)#  (NX-OS는 user 모드 > 없음)
+    "cisco_nxos": r"(?m)^{base}(?:\([^)\n]*\))?#\s*\Z",
+    # asa>  asa#  asa(config)#  asa/ctx1#  asa/pri/act(config)#  (멀티 컨텍스트 / failover 상태 표시)
+    "cisco_asa": r"(?m)^{base}(?:/[\w.-]+)*(?:\([^)\n]*\))?[>#]\s*\Z",
+}
+DEFAULT_PROMPT = PLATFORM_PROMPTS["cisco_ios"]
+
+# 로그인 직후 프롬프트에서 호스트명 추출 (ASA는 /컨텍스트 앞까지)
+INITIAL_PROMPT_PATTERN = re.compile(r"(?m)^(?P<base>[^\s>#()/]+)(?:/[\w.-]+)*(?:\([^)\n]*\))?[>#]\s*\Z")
+
+# 페이징 비활성화 명령
+PAGING_COMMANDS = {"cisco_asa": "terminal pager 0"}
+DEFAULT_PAGING_COMMAND = "terminal length 0"
+
+# 응답 시간 학습 (RFC 6298 RTO 계산과 같은 가중치)
+PROMPT_EWMA_ALPHA = 0.125   # 평균 갱신 가중치
+PROMPT_EWMA_BETA = 0.25     # 편차 갱신 가중치
+PROMPT_TIMEOUT_K = 4.0      # 대기 상한 = 평균 + K * 편차
+PROMPT_TIMEOUT_MIN = 10.0   # 학습된 값이 아무리 작아도 이 시간은 기다림 (netmiko 기본 read_timeout)
+PROMPT_TIMEOUT_MAX = 600.0
+PROMPT_TIMEOUT_DEFAULT = 60.0  # 처음 보는 (장비, 명령)
+PROMPT_TRACKER_SIZE = 20000    # 추적할 (장비, 명령) 최대 개수 (LRU)
+
+# 프롬프트 인식 실패 시 대체 동작: netmiko는 이 delay factor로 다시, asyncssh는 출력이 이 시간 멈출 때까지 읽기
+FALLBACK_DELAY_FACTOR = 2
+FALLBACK_IDLE = 2.0
+
+
+def prompt_pattern(device_type: str, base: str) -> re.Pattern:
+    template = PLATFORM_PROMPTS.get(device_type, DEFAULT_PROMPT)
+    return re.compile(template.replace("{base}", re.escape(base)))
+
+
+def prompt_regex(device_type: str, base: str) -> str:
+    """netmiko expect_string용 (netmiko는 최근 읽은 조각들에서 검색하므로 출력 끝(\\Z) 앵커는 뺌)"""
+    template = PLATFORM_PROMPTS.get(device_type, DEFAULT_PROMPT)
+    return template.replace("{base}", re.escape(base)).replace(r"\s*\Z", "")
+
+
+def base_prompt(prompt: str) -> Optional[str]:
+    match = INITIAL_PROMPT_PATTERN.search(prompt)
+    return match.group("base") if match else None
+
+
+def paging_command(device_type: str) -> str:
+    return PAGING_COMMANDS.get(device_type, DEFAULT_PAGING_COMMAND)
+
+
+def command_key(command: str) -> str:
+    """응답 시간 추적 키. show 명령은 명령 자체, 그 외(설정 줄 등)는 첫 단어"""
+    command = " ".join(command.split())
+    if command.startswith("show ") or command.startswith("sh "):
+        return command[:80]
+    return command.split(" ", 1)[0] if command else ""
+
+
+class ResponseTimeTracker:
+    """(host, 명령) 별 응답 시간 EWMA 평균/편차와 이를 이용한 대기 상한"""
+
+    def __init__(self, size: int = PROMPT_TRACKER_SIZE):
+        self.size = size
+        self._stats: "OrderedDict[Tuple[str, str], Tuple[float, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {"observed": 0, "fallbacks": 0}
+
+    def observe(self, host: str, command: str, elapsed: float):
+        key = (host, command_key(command))
+        with self._lock:
+            stats = self._stats.get(key)
+            if stats is None:
+                srtt, rttvar = elapsed, elapsed / 2
+            else:
+                srtt, rttvar = stats
+                rttvar = (1 - PROMPT_EWMA_BETA) * rttvar + PROMPT_EWMA_BETA * abs(srtt - elapsed)
+                srtt = (1 - PROMPT_EWMA_ALPHA) * srtt + PROMPT_EWMA_ALPHA * elapsed
+            self._stats[key] = (srtt, rttvar)
+            self.stats["observed"] += 1
+            self._stats.move_to_end(key)
+            if len(self._stats) > self.size:
+                self._stats.popitem(last=False)
+
+    def record_fallback(self, host: str, command: str):
+        with self._lock:
+            self.stats["fallbacks"] += 1
+        print(f"[CLI Prompt] {host}: prompt not detected for '{command_key(command)}', using fixed delay")
+
+    def timeout(self, host: str, command: str, default: float = PROMPT_TIMEOUT_DEFAULT) -> float:
+        stats = self._stats.get((host, command_key(command)))
+        if stats is None:
+            return default
+        srtt, rttvar = stats
+        return min(PROMPT_TIMEOUT_MAX, max(PROMPT_TIMEOUT_MIN, srtt + PROMPT_TIMEOUT_K * rttvar))
+
+    def snapshot(self, host: Optional[str] = None) -> Dict[str, Dict[str, float]]:
+        with self._lock:
+            return {
+                f"{h} {cmd}": {"mean_s": round(srtt, 3), "dev_s": round(rttvar, 3)}
+                for (h, cmd), (srtt, rttvar) in self._stats.items() if host is None or h == host
+            }
+
+
+# 프로세스 전역 응답 시간 추적기
+response_times = ResponseTimeTracker()
@@ -0,0 +1,179 @@
+"""
+내용 주소(content-addressed) 설정 저장소.
+
+설정 본문(raw running-config, 파싱 결과 JSON)을 sha256으로 식별해 한 번만 저장하고,
+ConfigBackup 행은 해시만 참조합니다.
+- 압축: zstd (zstandard 미설치 시 zlib)
+- 델타: 같은 장비의 직전 버전과 줄 단위 차이만 저장 (전체 압축보다 작을 때만, 체인 깊이 제한)
+- 같은 내용은 장비/시점과 무관하게 블롭 하나 (변경 없는 재수집, 같은 템플릿 장비)
+압축 방식과 파일 저장(objects/<해시 앞 2자리>/<해시>, GUI 백업 포함)은 blob_files 모듈을 같이 씁니다.
+"""
+import difflib
+import json
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, List, Optional
+
+from sqlalchemy import insert
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.models.device import ConfigBackup, ConfigBlob
+from app.services.blob_files import CONFIG_STORE_CODEC, compress, content_hash, decompress
+
+# 직전 버전 대비 델타 저장 (0이면 항상 전체 압축)
+CONFIG_STORE_DELTA = os.getenv("CONFIG_STORE_DELTA", "1") != "0"
+# 델타 체인 최대 깊이 (읽을 때 풀어야 하는 블롭 수 상한, 넘으면 전체 압축본 저장)
+CONFIG_DELTA_MAX_DEPTH = 16
+# 복원한 본문 캐시 (델타 기준 본문을 매번 체인으로 풀지 않도록)
+CONFIG_CACHE_SIZE = 256
+
+
+def encode_delta(base: str, text: str) -> bytes:
+    """
+    base -> text 줄 단위 델타: [시작, 끝] = base 줄 복사, 문자열 목록 = 새 줄.
+    (줄바꿈 포함해 나누므로 복원 결과가 원문과 정확히 같음)
+    """
+    base_lines = base.splitlines(keepends=True)
+    lines = text.splitlines(keepends=True)
+    ops: List[Any] = []
+    for tag, i1, i2, j1, j2 in difflib.SequenceMatcher(None, base_lines, lines).get_opcodes():
+        if tag == "equal":
+            ops.append([i1, i2])
+        elif j2 > j1:
+            ops.append(lines[j1:j2])
+    return json.dumps(ops, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def apply_delta(base: str, delta: bytes) -> str:
+    base_lines = base.splitlines(keepends=True)
+    parts = []
+    for op in json.loads(delta):
+        if len(op) == 2 and isinstance(op[0], int):
+            parts.extend(base_lines[op[0]:op[1]])
+        else:
+            parts.extend(op)
+    return "".join(parts)
+
+
+def dump_parsed(parsed: Any) -> str:
+    """파싱 결과 JSON 직렬화 (같은 내용이면 같은 해시, 줄 단위 델타가 먹히도록 들여쓰기)"""
+    return json.dumps(parsed, ensure_ascii=False, sort_keys=True, indent=1)
+
+
+class ConfigStore:
+    """
+    DB(config_blobs) 기반 블롭 저장/조회. 블롭은 호출한 세션의 트랜잭션에서 바로 INSERT하고 커밋은 호출자가 합니다.
+    (이 블롭을 참조하는 ConfigBackup보다 먼저 들어가므로 외래 키 검사를 통과)
+    """
+
+    def __init__(self, cache_size: int = CONFIG_CACHE_SIZE):
+        self.cache_size = cache_size
+        self._cache: "OrderedDict[str, str]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {"written": 0, "deduplicated": 0, "delta": 0, "bytes_in": 0, "bytes_stored": 0}
+
+    def _remember(self, sha256: str, text: str):
+        with self._lock:
+            self._cache[sha256] = text
+            self._cache.move_to_end(sha256)
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+    @staticmethod
+    def _depth(db: Session, sha256: str) -> Optional[int]:
+        """블롭의 델타 깊이 (없으면 None). 본문(data)은 읽지 않음"""
+        return db.query(ConfigBlob.depth).filter(ConfigBlob.sha256 == sha256).scalar()
+
+    @staticmethod
+    def _insert(db: Session, values: dict):
+        """
+        블롭 INSERT. 다른 작업이 같은 내용을 먼저 저장했으면 무시합니다 (ON CONFLICT DO NOTHING).
+        중복 키 오류로 호출자의 트랜잭션(일괄 수집 배치)이 롤백되지 않도록 합니다.
+        """
+        dialect = db.get_bind().dialect.name
+        if dialect == "sqlite":
+            query = sqlite_insert(ConfigBlob).on_conflict_do_nothing(index_elements=["sha256"])
+        elif dialect == "postgresql":
+            query = postgresql_insert(ConfigBlob).on_conflict_do_nothing(index_elements=["sha256"])
+        else:
+            try:
+                with db.begin_nested():
+                    db.execute(insert(ConfigBlob), [values])
+            except IntegrityError:
+                pass
+            return
+        db.execute(query, [values])
+
+    def put(self, db: Session, text: str, base_sha256: Optional[str] = None) -> str:
+        """text를 저장하고 해시 반환 (이미 있으면 저장하지 않음). base_sha256 = 같은 장비의 직전 버전"""
+        sha256 = content_hash(text)
+        with self._lock:
+            self.stats["bytes_in"] += len(text.encode("utf-8"))
+        if self._depth(db, sha256) is not None:
+            with self._lock:
+                self.stats["deduplicated"] += 1
+            return sha256
+
+        raw = text.encode("utf-8")
+        blob = {"sha256": sha256, "codec": CONFIG_STORE_CODEC, "base_sha256": None, "depth": 0,
+                "size": len(raw), "data": compress(raw)}
+        base_depth = self._depth(db, base_sha256) if (CONFIG_STORE_DELTA and base_sha256) else None
+        if base_depth is not None and base_depth < CONFIG_DELTA_MAX_DEPTH:
+            base_text = self.get(db, base_sha256)
+            if base_text is not None:
+                delta = compress(encode_delta(base_text, text))
+                if len(delta) < len(blob["data"]):
+                    blob.update(data=delta, base_sha256=base_sha256, depth=base_depth + 1)
+        blob["stored_size"] = len(blob["data"])
+        self._insert(db, blob)
+        self._remember(sha256, text)
+        with self._lock:
+            self.stats["written"] += 1
+            self.stats["delta"] += blob["base_sha256"] is not None
+            self.stats["bytes_stored"] += blob["stored_size"]
+        return sha256
+
+    def get(self, db: Session, sha256: str) -> Optional[str]:
+        with self._lock:
+            text = self._cache.get(sha256)
+        if text is not None:
+            return text
+        blob = db.get(ConfigBlob, sha256)
+        if blob is None:
+            return None
+        data = decompress(blob.data, blob.codec)
+        if blob.base_sha256:
+            base_text = self.get(db, blob.base_sha256)
+            if base_text is None:
+                raise LookupError(f"delta base {blob.base_sha256} missing for {sha256}")
+            text = apply_delta(base_text, data)
+        else:
+            text = data.decode("utf-8")
+        self._remember(sha256, text)
+        return text
+
+    def put_parsed(self, db: Session, parsed: Any, base_sha256: Optional[str] = None) -> str:
+        return self.put(db, dump_parsed(parsed), base_sha256)
+
+    def get_parsed(self, db: Session, sha256: str) -> Any:
+        text = self.get(db, sha256)
+        return json.loads(text) if text is not None else None
+
+    def backup_config(self, db: Session, backup: ConfigBackup) -> Optional[str]:
+        """백업의 raw config (블롭 참조 이전에 저장된 행은 raw_config 컬럼)"""
+        if backup.config_sha256:
+            return self.get(db, backup.config_sha256)
+        return backup.raw_config
+
+    def backup_parsed(self, db: Session, backup: ConfigBackup) -> Any:
+        if backup.parsed_sha256:
+            return self.get_parsed(db, backup.parsed_sha256)
+        return backup.parsed_config
+
+
+# 프로세스 전역 저장소 (복원 캐시 공유)
+config_store = ConfigStore()
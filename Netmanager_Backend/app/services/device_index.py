@@ -0,0 +1,67 @@
+import threading
+import time
+from typing import Dict, Optional
+from app.db.session import SessionLocal
+from app.models.device import Device
+
+# 장비 API를 거치지 않은 변경(직접 DB 수정 등)을 따라잡기 위한 전체 재적재 주기 (초)
+DEVICE_INDEX_REFRESH_INTERVAL = 300.0
+
+
+class DeviceIndex:
+    """
+    host(IP) -> device_id 메모리 인덱스.
+    syslog 수신 경로에서 메시지마다 devices 테이블을 조회하지 않도록 O(1) dict 조회로 대체합니다.
+    장비 등록/수정 API에서 upsert()로 즉시 반영하고, 주기적으로 전체를 다시 읽어 누락분을 보정합니다.
+    """
+
+    def __init__(self, refresh_interval: float = DEVICE_INDEX_REFRESH_INTERVAL):
+        self.refresh_interval = refresh_interval
+        self._by_host: Dict[str, int] = {}
+        self._host_by_id: Dict[int, str] = {}
+        self._lock = threading.Lock()
+        self._loaded_at: Optional[float] = None
+
+    def load(self):
+        """devices 테이블 전체를 (id, host) 컬럼만 읽어 인덱스를 다시 만듭니다."""
+        db = SessionLocal()
+        try:
+            rows = db.query(Device.id, Device.host).all()
+        finally:
+            db.close()
+
+        by_host = {host: device_id for device_id, host in rows if host}
+        host_by_id = {device_id: host for device_id, host in rows if host}
+        with self._lock:
+            self._by_host, self._host_by_id = by_host, host_by_id
+            self._loaded_at = time.monotonic()
+
+    def refresh_if_stale(self):
+        if self._loaded_at is None or time.monotonic() - self._loaded_at >= self.refresh_interval:
+            try:
+                self.load()
+            except Exception as e:
+                # 인덱스 갱신 실패로 로그 저장까지 멈추지 않도록 기존 인덱스를 유지
+                print(f"[DeviceIndex] 갱신 실패: {e}")
+                self._loaded_at = time.monotonic()
+
+    def upsert(self, device_id: int, host: str):
+        with self._lock:
+            old_host = self._host_by_id.get(device_id)
+            if old_host and old_host != host and self._by_host.get(old_host) == device_id:
+                del self._by_host[old_host]
+            self._by_host[host] = device_id
+            self._host_by_id[device_id] = host
+
+    def remove(self, device_id: int):
+        with self._lock:
+            host = self._host_by_id.pop(device_id, None)
+            if host and self._by_host.get(host) == device_id:
+                del self._by_host[host]
+
+    def lookup(self, host: str) -> Optional[int]:
+        return self._by_host.get(host)
+
+
+# 프로세스 전역 인덱스 (API 프로세스의 syslog 저장 스레드와 장비 API가 공유)
+device_index = DeviceIndex()
@@ -0,0 +1,86 @@
+import threading
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+from sqlalchemy import update, case
+from app.db.session import engine
+from app.models.device import Device
+from app.services.log_store import log_store
+
+# 상태 전이 이벤트 (EventLog event_id, severity)
+STATUS_EVENTS = {
+    "online": ("DEVICE_UP", "INFO"),
+    "offline": ("DEVICE_DOWN", "CRITICAL"),
+}
+
+
+class DeviceStatusTracker:
+    """
+    장비 상태(online/offline) 메모리 스냅샷.
+    폴링 결과를 스냅샷과 비교해 실제로 바뀐 장비만 UPDATE 한 번(CASE)으로 반영하고,
+    바뀔 때마다 EventLog 이벤트를 남깁니다. 상태가 그대로면 DB 쓰기가 없습니다.
+    다른 경로(트랩 수신, API)에서 바뀐 값은 장비 목록을 다시 읽을 때 load()로 맞춥니다.
+    """
+
+    def __init__(self, bind=engine):
+        self.engine = bind
+        self._status: Dict[int, Optional[str]] = {}
+        self._lock = threading.Lock()
+
+    def load(self, rows: Iterable[Tuple[int, Optional[str]]]):
+        """(device_id, status) 목록으로 스냅샷 교체"""
+        with self._lock:
+            self._status = {device_id: status for device_id, status in rows}
+
+    def get(self, device_id: int) -> Optional[str]:
+        return self._status.get(device_id)
+
+    def reconcile(self, statuses: Dict[int, str]) -> List[Tuple[int, Optional[str], str]]:
+        """
+        새 상태와 스냅샷을 비교해 (device_id, 이전 상태, 새 상태) 전이 목록을 반환합니다.
+        스냅샷은 apply()가 DB에 저장한 뒤에 갱신하므로, 저장이 실패하면 다음 폴링에서 같은 전이를 다시 시도합니다.
+        """
+        with self._lock:
+            return [
+                (device_id, self._status.get(device_id), new_status)
+                for device_id, new_status in statuses.items()
+                if self._status.get(device_id) != new_status
+            ]
+
+    def apply(self, transitions: List[Tuple[int, Optional[str], str]], hosts: Dict[int, str],
+              now: Optional[datetime] = None) -> int:
+        """
+        전이된 장비만 UPDATE devices SET status = CASE id WHEN ... END WHERE id IN (...) 한 번으로 저장하고
+        (저장에 성공한 뒤 스냅샷 갱신) 전이마다 DEVICE_UP / DEVICE_DOWN 이벤트를 기록합니다.
+        """
+        if not transitions:
+            return 0
+        now = now or datetime.utcnow()  # 이벤트 시각 (로그는 UTC 기준으로 일자별 파티션에 저장)
+        new_status = {device_id: status for device_id, _, status in transitions}
+        with self.engine.begin() as conn:
+            conn.execute(
+                update(Device.__table__)
+                .where(Device.__table__.c.id.in_(list(new_status)))
+                .values(status=case(new_status, value=Device.__table__.c.id),
+                        updated_at=datetime.now())  # devices.updated_at은 다른 장비 쓰기 경로와 같이 로컬 시각
+            )
+        with self._lock:
+            self._status.update(new_status)
+
+        events = []
+        for device_id, old_status, status in transitions:
+            if old_status in (None, "unknown") or status not in STATUS_EVENTS:
+                continue  # 첫 폴링(unknown -> online/offline)은 이벤트 없이 상태만 반영
+            event_id, severity = STATUS_EVENTS[status]
+            host = hosts.get(device_id)
+            events.append({
+                "timestamp": now, "severity": severity, "source": host, "event_id": event_id,
+                "message": f"Device {host} changed state from {old_status} to {status}",
+                "repeat_count": 1, "first_seen": now, "last_seen": now, "device_id": device_id,
+            })
+        if events:
+            log_store.insert_rows(events)
+        return len(transitions)
+
+
+# 폴링 프로세스 전역 스냅샷
+device_status = DeviceStatusTracker()
@@ -0,0 +1,78 @@
+import threading
+from typing import Dict, Optional, Tuple
+
+COUNTER64_MAX = 2 ** 64
+# 증가량이 회선 속도의 이 배수를 넘으면 wrap이 아니라 카운터 리셋(장비 재부팅, 카운터 clear)으로 간주
+RATE_SANITY_FACTOR = 1.5
+# 속도(ifHighSpeed)를 모르는 인터페이스의 상한 (400Gbps)
+RATE_UNKNOWN_SPEED_BPS = 400 * 10 ** 9
+
+
+def counter_delta(previous: int, current: int, modulus: int = COUNTER64_MAX) -> int:
+    """카운터 증가량. 현재 값이 더 작으면 한 번 wrap 된 것으로 계산"""
+    if current >= previous:
+        return current - previous
+    return current + modulus - previous
+
+
+class InterfaceRateTracker:
+    """
+    장비별 직전 인터페이스 카운터 스냅샷을 메모리에 두고 폴링마다 bps / 사용률을 계산합니다.
+    - 64비트 카운터 wrap 처리
+    - 재부팅/카운터 리셋처럼 말이 안 되는 증가량은 해당 주기만 건너뜀 (다음 주기부터 정상 계산)
+    """
+
+    def __init__(self):
+        self._snapshots: Dict[int, Tuple[float, Dict[int, Dict]]] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _rate(previous: int, current: int, seconds: float, max_bps: float) -> Optional[float]:
+        bps = counter_delta(previous, current) * 8 / seconds
+        return None if bps > max_bps else bps
+
+    def update(self, device_id: int, counters: Dict[int, Dict], ts: float) -> Dict[int, Dict]:
+        """
+        counters: SnmpManager.get_interface_counters() 결과, ts: 수집 시각(epoch 초)
+        반환: {ifIndex: {"name", "in_bps", "out_bps", "speed_mbps", "utilization"}}
+        첫 수집이거나 계산할 수 없는 인터페이스는 결과에서 빠집니다.
+        """
+        with self._lock:
+            previous = self._snapshots.get(device_id)
+            self._snapshots[device_id] = (ts, counters)
+        if previous is None:
+            return {}
+
+        prev_ts, prev_counters = previous
+        seconds = ts - prev_ts
+        if seconds <= 0:
+            return {}
+
+        rates = {}
+        for if_index, cur in counters.items():
+            prev = prev_counters.get(if_index)
+            if prev is None:
+                continue
+            speed_bps = cur["speed_mbps"] * 10 ** 6
+            max_bps = speed_bps * RATE_SANITY_FACTOR if speed_bps else RATE_UNKNOWN_SPEED_BPS
+            in_bps = self._rate(prev["in_octets"], cur["in_octets"], seconds, max_bps)
+            out_bps = self._rate(prev["out_octets"], cur["out_octets"], seconds, max_bps)
+            if in_bps is None or out_bps is None:
+                continue
+            rates[if_index] = {
+                "name": cur["name"],
+                "in_bps": round(in_bps),
+                "out_bps": round(out_bps),
+                "speed_mbps": cur["speed_mbps"],
+                # NetworkLink.utilization과 같은 의미: 양방향 중 큰 쪽의 회선 대비 사용률(%)
+                "utilization": round(max(in_bps, out_bps) / speed_bps * 100, 2) if speed_bps else None,
+            }
+        return rates
+
+    def forget(self, device_id: int):
+        with self._lock:
+            self._snapshots.pop(device_id, None)
+
+
+# 폴링 프로세스 전역 트래커
+interface_rates = InterfaceRateTracker()
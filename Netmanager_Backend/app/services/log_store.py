@@ -0,0 +1,363 @@
+import threading
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+from sqlalchemy import MetaData, Table, Float, bindparam, inspect, select, insert, update, delete, func, tuple_, text
+from app.db.session import engine
+from app.models.log import EventLog, EventLogRollup, build_event_log_table
+
+# 보존 정책
+LOG_RETENTION_DAYS = 30        # 원본 로그 파티션 보존 일수 (초과 파티션은 DROP TABLE)
+ROLLUP_RETENTION_DAYS = 400    # 시간별 집계 보존 일수
+
+PARTITION_PREFIX = "event_logs_"   # event_logs_YYYYMMDD (UTC 기준 일자)
+LEGACY_PARTITION_KEY = "legacy"    # 파티션 도입 이전 event_logs 테이블의 파티션 키
+SEARCH_DAYS = 7                    # 전문 검색 기본 범위 (최근 N일 파티션)
+
+
+def to_fts_query(q: str) -> str:
+    """
+    사용자 검색어 -> FTS5 MATCH 문법. 단어마다 큰따옴표로 감싸 AND 검색하고
+    (MAC/인터페이스 이름의 '.', '/', ':' 등이 문법 오류를 내지 않도록) 끝의 '*'는 접두어 검색으로 유지합니다.
+    예: 'Gi1/0/3 down*' -> '"Gi1/0/3" "down"*'
+    """
+    terms = []
+    for term in q.split():
+        prefix = term.endswith("*")
+        term = term.rstrip("*").replace('"', '""')
+        if term:
+            terms.append(f'"{term}"*' if prefix else f'"{term}"')
+    return " ".join(terms)
+
+
+def build_log_select(table: Table, severity: str = None, source: str = None, event_id: str = None,
+                     since: datetime = None, until: datetime = None,
+                     cursor: Optional[Tuple[datetime, int]] = None):
+    """
+    한 테이블(파티션)에 대한 최신순(timestamp desc, id desc) 조회 쿼리.
+    cursor가 있으면 OFFSET 대신 (timestamp, id) < cursor 조건으로 인덱스에서 바로 다음 페이지를 찾습니다.
+    """
+    c = table.c
+    query = select(table)
+    if severity:
+        query = query.where(c.severity == severity.upper())
+    if source:
+        query = query.where(c.source == source)
+    if event_id:
+        query = query.where(c.event_id == event_id)
+    if since:
+        query = query.where(c.timestamp >= since)
+    if until:
+        query = query.where(c.timestamp < until)
+    if cursor:
+        query = query.where(tuple_(c.timestamp, c.id) < tuple_(*cursor))
+    return query.order_by(c.timestamp.desc(), c.id.desc())
+
+
+class LogStore:
+    """
+    EventLog 저장소. 로그를 일자별 테이블(event_logs_YYYYMMDD)에 나눠 저장합니다.
+    - 보존 기간이 지난 로그 삭제 = 파티션 DROP TABLE (행 단위 DELETE/인덱스 갱신 없음)
+    - 조회는 최신 파티션부터 필요한 행 수만큼만 내려가며 읽음
+    - 파티션 도입 이전의 event_logs 테이블은 가장 오래된 파티션으로 취급
+    - 파티션마다 message 전문 검색 인덱스를 함께 유지 (SQLite: FTS5 + 트리거, PostgreSQL: GIN tsvector)
+    """
+
+    def __init__(self, bind=engine):
+        self.engine = bind
+        self._metadata = MetaData()
+        self._tables: Dict[date, Table] = {}
+        self._created = set()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def partition_name(day: date) -> str:
+        return f"{PARTITION_PREFIX}{day:%Y%m%d}"
+
+    @staticmethod
+    def partition_key(table: Table) -> str:
+        """조회 결과의 "partition" 값 (YYYYMMDD, 기존 event_logs는 legacy). id는 파티션 안에서만 고유"""
+        if table.name.startswith(PARTITION_PREFIX):
+            return table.name[len(PARTITION_PREFIX):]
+        return LEGACY_PARTITION_KEY
+
+    def _table(self, day: date) -> Table:
+        with self._lock:
+            table = self._tables.get(day)
+            if table is None:
+                table = build_event_log_table(self.partition_name(day), self._metadata)
+                self._tables[day] = table
+            return table
+
+    def ensure_partition(self, day: date) -> Table:
+        table = self._table(day)
+        if day not in self._created:
+            table.create(self.engine, checkfirst=True)
+            self.ensure_search_index(table)
+            self._created.add(day)
+        return table
+
+    # --- 전문 검색 인덱스 ---
+    @staticmethod
+    def _fts_name(table: Table) -> str:
+        return f"{table.name}_fts"
+
+    def ensure_search_index(self, table: Table, rebuild: bool = False):
+        """파티션의 message 검색 인덱스 생성. rebuild면 기존 행까지 다시 색인합니다."""
+        name, fts = table.name, self._fts_name(table)
+        with self.engine.begin() as conn:
+            if self.engine.dialect.name == "sqlite":
+                # external content FTS5: 본문은 파티션 테이블에만 저장, 색인만 별도 유지
+                conn.execute(text(
+                    f"CREATE VIRTUAL TABLE IF NOT EXISTS {fts} "
+                    f"USING fts5(message, content='{name}', content_rowid='id')"
+                ))
+                conn.execute(text(
+                    f"CREATE TRIGGER IF NOT EXISTS {fts}_ai AFTER INSERT ON {name} BEGIN "
+                    f"INSERT INTO {fts}(rowid, message) VALUES (new.id, new.message); END"
+                ))
+                conn.execute(text(
+                    f"CREATE TRIGGER IF NOT EXISTS {fts}_ad AFTER DELETE ON {name} BEGIN "
+                    f"INSERT INTO {fts}({fts}, rowid, message) VALUES ('delete', old.id, old.message); END"
+                ))
+                if rebuild:
+                    conn.execute(text(f"INSERT INTO {fts}({fts}) VALUES ('rebuild')"))
+            elif self.engine.dialect.name == "postgresql":
+                conn.execute(text(
+                    f"CREATE INDEX IF NOT EXISTS ix_{name}_message_fts "
+                    f"ON {name} USING GIN (to_tsvector('simple', message))"
+                ))
+
+    def ensure_search_indexes(self) -> List[str]:
+        """검색 인덱스가 없는 기존 파티션(기능 도입 이전에 생성된 것)을 색인합니다."""
+        existing = set(inspect(self.engine).get_table_names())
+        built = []
+        for day in self.list_partitions():
+            table = self._table(day)
+            if self.engine.dialect.name == "sqlite" and self._fts_name(table) in existing:
+                continue
+            self.ensure_search_index(table, rebuild=True)
+            built.append(table.name)
+        return built
+
+    def list_partitions(self) -> List[date]:
+        """DB에 존재하는 파티션 일자 목록 (최신순)"""
+        days = []
+        for name in inspect(self.engine).get_table_names():
+            suffix = name[len(PARTITION_PREFIX):]
+            if name.startswith(PARTITION_PREFIX) and len(suffix) == 8 and suffix.isdigit():
+                days.append(datetime.strptime(suffix, "%Y%m%d").date())
+        return sorted(days, reverse=True)
+
+    # --- 쓰기 ---
+    def insert_rows(self, rows: List[Dict], return_ids: bool = False):
+        """
+        행들을 timestamp 일자별 파티션에 나눠 bulk insert (한 트랜잭션).
+        return_ids면 생성된 id를 각 행 dict의 "id"에 채웁니다. (이후 update_repeats로 갱신할 행)
+        """
+        by_day = defaultdict(list)
+        for row in rows:
+            by_day[row["timestamp"].date()].append(row)
+
+        # SQLite는 쓰기 트랜잭션 중 다른 커넥션의 DDL이 막히므로 파티션 생성을 먼저 끝냄
+        tables = {day: self.ensure_partition(day) for day in by_day}
+        with self.engine.begin() as conn:
+            for day, day_rows in by_day.items():
+                table = tables[day]
+                if not return_ids:
+                    conn.execute(insert(table), day_rows)
+                elif self.engine.dialect.insert_executemany_returning_sort_by_parameter_order:
+                    # executemany + RETURNING (SQLite 3.35+, PostgreSQL): 입력 순서대로 id 반환
+                    query = insert(table).returning(table.c.id, sort_by_parameter_order=True)
+                    for row, row_id in zip(day_rows, conn.execute(query, day_rows).scalars()):
+                        row["id"] = row_id
+                else:
+                    for row in day_rows:
+                        row["id"] = conn.execute(insert(table), row).inserted_primary_key[0]
+
+    def update_repeats(self, rows: List[Dict]) -> int:
+        """이미 저장된 행(id가 채워진 행)의 repeat_count / last_seen 갱신 (파티션별 executemany)"""
+        by_day = defaultdict(list)
+        for row in rows:
+            if row.get("id") is not None:
+                by_day[row["timestamp"].date()].append(
+                    {"row_id": row["id"], "new_count": row["repeat_count"], "new_last_seen": row["last_seen"]}
+                )
+        if not by_day:
+            return 0
+        tables = {day: self.ensure_partition(day) for day in by_day}
+        with self.engine.begin() as conn:
+            for day, params in by_day.items():
+                table = tables[day]
+                query = (
+                    update(table)
+                    .where(table.c.id == bindparam("row_id"))
+                    .values(repeat_count=bindparam("new_count"), last_seen=bindparam("new_last_seen"))
+                )
+                conn.execute(query, params)
+        return sum(len(params) for params in by_day.values())
+
+    # --- 읽기 ---
+    def _read_tables(self, since: datetime = None, upper: datetime = None) -> List[Table]:
+        tables = []
+        for day in self.list_partitions():
+            if upper and day > upper.date():
+                continue
+            if since and day < since.date():
+                break
+            tables.append(self._table(day))
+        tables.append(EventLog.__table__)
+        return tables
+
+    def query_logs(self, severity: str = None, source: str = None, event_id: str = None,
+                   since: datetime = None, until: datetime = None,
+                   cursor: Optional[Tuple[datetime, int]] = None, limit: int = 100, skip: int = 0) -> List[Dict]:
+        """최신 파티션부터 skip + limit 행이 찰 때까지 읽습니다. 각 행에 읽은 파티션 키("partition")를 붙입니다."""
+        bounds = [t for t in (until, cursor[0] if cursor else None) if t]
+        upper = min(bounds) if bounds else None
+        need = skip + limit
+        results: List[Dict] = []
+
+        with self.engine.connect() as conn:
+            for table in self._read_tables(since, upper):
+                query = build_log_select(table, severity, source, event_id, since, until, cursor)
+                partition = self.partition_key(table)
+                results.extend(
+                    dict(row, partition=partition) for row in conn.execute(query.limit(need - len(results))).mappings()
+                )
+                if len(results) >= need:
+                    break
+        return results[skip:]
+
+    def search(self, q: str, days: int = SEARCH_DAYS, severity: str = None, source: str = None,
+               limit: int = 50, skip: int = 0) -> List[Dict]:
+        """
+        최근 N일 파티션에서 message 전문 검색. 파티션별 상위 (skip + limit)건을 관련도 순으로 가져와
+        합친 뒤 다시 정렬합니다. score는 낮을수록 관련도가 높습니다. (SQLite bm25, PostgreSQL -ts_rank)
+        """
+        need = skip + limit
+        dialect = self.engine.dialect.name
+        fts_query = to_fts_query(q)
+        if not fts_query:
+            return []
+
+        cutoff = datetime.utcnow().date() - timedelta(days=days - 1)
+        hits: List[Dict] = []
+        with self.engine.connect() as conn:
+            for day in self.list_partitions():
+                if day < cutoff:
+                    break
+                table = self._table(day)
+                filters, params = "", {"q": fts_query if dialect == "sqlite" else q, "n": need}
+                if severity:
+                    filters += " AND t.severity = :severity"
+                    params["severity"] = severity.upper()
+                if source:
+                    filters += " AND t.source = :source"
+                    params["source"] = source
+
+                if dialect == "sqlite":
+                    fts = self._fts_name(table)
+                    sql = (f"SELECT t.*, {fts}.rank AS score FROM {fts} JOIN {table.name} t ON t.id = {fts}.rowid "
+                           f"WHERE {fts} MATCH :q{filters} ORDER BY {fts}.rank LIMIT :n")
+                elif dialect == "postgresql":
+                    sql = (f"SELECT t.*, -ts_rank(to_tsvector('simple', t.message), "
+                           f"plainto_tsquery('simple', :q)) AS score FROM {table.name} t "
+                           f"WHERE to_tsvector('simple', t.message) @@ plainto_tsquery('simple', :q){filters} "
+                           f"ORDER BY score LIMIT :n")
+                else:
+                    params["q"] = f"%{q}%"
+                    sql = (f"SELECT t.*, 0 AS score FROM {table.name} t WHERE t.message LIKE :q{filters} "
+                           f"ORDER BY t.timestamp DESC LIMIT :n")
+                # 결과 컬럼 타입을 테이블 정의에 맞춰 지정 (SQLite DateTime 문자열 -> datetime)
+                query = text(sql).columns(*table.c, score=Float)
+                partition = self.partition_key(table)
+                hits.extend(dict(row, partition=partition) for row in conn.execute(query, params).mappings())
+
+        hits.sort(key=lambda h: (h["score"], -h["timestamp"].timestamp() if h["timestamp"] else 0))
+        return hits[skip:need]
+
+    # --- 보존 / 집계 ---
+    def drop_partitions_before(self, cutoff: date) -> List[str]:
+        dropped = []
+        for day in self.list_partitions():
+            if day >= cutoff:
+                continue
+            table = self._table(day)
+            table.drop(self.engine, checkfirst=True)
+            if self.engine.dialect.name == "sqlite":
+                with self.engine.begin() as conn:
+                    conn.execute(text(f"DROP TABLE IF EXISTS {self._fts_name(table)}"))
+            with self._lock:
+                self._created.discard(day)
+                self._tables.pop(day, None)
+                self._metadata.remove(table)
+            dropped.append(table.name)
+        return dropped
+
+    def purge_rollups_before(self, cutoff: datetime) -> int:
+        with self.engine.begin() as conn:
+            return conn.execute(delete(EventLogRollup).where(EventLogRollup.hour < cutoff)).rowcount
+
+    def rollup_hours(self, start_hour: datetime, end_hour: datetime) -> int:
+        """
+        [start_hour, end_hour) 구간을 1시간 단위로 다시 집계해 event_log_rollups를 갱신합니다.
+        (해당 시간의 기존 집계를 지우고 새로 넣으므로 여러 번 실행해도 결과가 같음)
+        """
+        partitions = set(self.list_partitions())
+        written = 0
+        hour = start_hour.replace(minute=0, second=0, microsecond=0)
+
+        with self.engine.begin() as conn:
+            while hour < end_hour:
+                next_hour = hour + timedelta(hours=1)
+                tables = [EventLog.__table__]
+                if hour.date() in partitions:
+                    tables.insert(0, self._table(hour.date()))
+
+                counts = defaultdict(int)
+                for table in tables:
+                    c = table.c
+                    query = (
+                        select(c.severity, c.source, c.event_id, c.device_id,
+                               func.sum(func.coalesce(c.repeat_count, 1)))
+                        .where(c.timestamp >= hour, c.timestamp < next_hour)
+                        .group_by(c.severity, c.source, c.event_id, c.device_id)
+                    )
+                    for severity, source, event_id, device_id, count in conn.execute(query):
+                        counts[(severity, source, event_id, device_id)] += count
+
+                conn.execute(delete(EventLogRollup).where(EventLogRollup.hour == hour))
+                if counts:
+                    conn.execute(insert(EventLogRollup), [
+                        {"hour": hour, "severity": k[0], "source": k[1], "event_id": k[2],
+                         "device_id": k[3], "count": v}
+                        for k, v in counts.items()
+                    ])
+                written += len(counts)
+                hour = next_hour
+        return written
+
+    def summarize(self, hours: int = 24, severity: str = None, group_by: str = "device") -> List[Dict]:
+        """시간별 집계 테이블에서 최근 N시간 합계를 그룹별로 반환 (원본 로그를 읽지 않음)"""
+        r = EventLogRollup
+        group_columns = {
+            "device": (r.device_id, r.source),
+            "source": (r.source,),
+            "event_id": (r.event_id,),
+            "severity": (r.severity,),
+        }[group_by]
+
+        since = datetime.utcnow().replace(minute=0, second=0, microsecond=0) - timedelta(hours=hours - 1)
+        total = func.sum(r.count).label("count")
+        query = select(*group_columns, total).where(r.hour >= since)
+        if severity:
+            query = query.where(r.severity == severity.upper())
+        query = query.group_by(*group_columns).order_by(total.desc())
+
+        with self.engine.connect() as conn:
+            return [dict(row) for row in conn.execute(query).mappings()]
+
+
+# 프로세스 전역 저장소 (syslog 저장 스레드, 로그 API, Celery 보존/집계 작업이 공유)
+log_store = LogStore()
@@ -0,0 +1,94 @@
+import asyncio
+import threading
+from collections import deque
+from typing import Dict, List, Optional, Tuple
+
+STREAM_BUFFER_SIZE = 1000   # 클라이언트별 미전송 버퍼 (초과 시 가장 오래된 메시지부터 버림)
+
+
+class LogSubscription:
+    """
+    실시간 로그 구독자 1명. syslog 저장 스레드가 offer()로 넣고, 이벤트 루프의 SSE 응답이 get_batch()로 꺼냅니다.
+    - 버퍼는 고정 크기 deque: 느린 클라이언트 때문에 메모리가 늘거나 수집 경로가 막히지 않음
+    - 루프 깨우기(call_soon_threadsafe)는 버퍼가 비어 있다가 채워질 때 한 번만 수행
+    """
+
+    def __init__(self, loop: asyncio.AbstractEventLoop, severities: Optional[set] = None,
+                 source: Optional[str] = None, buffer_size: int = STREAM_BUFFER_SIZE):
+        self.severities = severities
+        self.source = source
+        self._loop = loop
+        self._buffer: deque = deque(maxlen=buffer_size)
+        self._event = asyncio.Event()
+        self._lock = threading.Lock()
+        self._notified = False
+        self._dropped = 0
+
+    def matches(self, row: Dict) -> bool:
+        if self.severities and row.get("severity") not in self.severities:
+            return False
+        if self.source and row.get("source") != self.source:
+            return False
+        return True
+
+    def offer(self, row: Dict):
+        with self._lock:
+            if len(self._buffer) == self._buffer.maxlen:
+                self._dropped += 1
+            self._buffer.append(row)
+            if self._notified:
+                return
+            self._notified = True
+        try:
+            self._loop.call_soon_threadsafe(self._event.set)
+        except RuntimeError:
+            pass  # 루프가 이미 닫힌 구독자 (연결 종료 직후)
+
+    async def get_batch(self, timeout: float = 15.0) -> Tuple[List[Dict], int]:
+        """쌓인 메시지 전부와, 그 사이 버려진 건수를 반환 (timeout 동안 없으면 빈 목록)"""
+        try:
+            await asyncio.wait_for(self._event.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+        with self._lock:
+            rows = list(self._buffer)
+            self._buffer.clear()
+            dropped, self._dropped = self._dropped, 0
+            self._notified = False
+            self._event.clear()
+        return rows, dropped
+
+
+class LogBroker:
+    """프로세스 내 pub/sub. syslog 수집 경로에서 publish, 스트리밍 API에서 subscribe"""
+
+    def __init__(self):
+        self._subscribers: List[LogSubscription] = []
+        self._lock = threading.Lock()
+
+    def subscribe(self, severities: Optional[set] = None, source: Optional[str] = None) -> LogSubscription:
+        """이벤트 루프 안(async 엔드포인트)에서 호출해야 합니다."""
+        sub = LogSubscription(asyncio.get_running_loop(), severities, source)
+        with self._lock:
+            self._subscribers = self._subscribers + [sub]
+        return sub
+
+    def unsubscribe(self, sub: LogSubscription):
+        with self._lock:
+            self._subscribers = [s for s in self._subscribers if s is not sub]
+
+    def publish(self, row: Dict):
+        subscribers = self._subscribers  # copy-on-write 목록이라 잠금 없이 읽음
+        if not subscribers:
+            return
+        for sub in subscribers:
+            if sub.matches(row):
+                sub.offer(row)
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._subscribers)
+
+
+# API 프로세스 전역 브로커
+log_broker = LogBroker()
@@ -0,0 +1,214 @@
+import time
+from datetime import datetime
+from typing import Dict, Optional, Tuple
+import numpy as np
+from sqlalchemy import select, insert, delete
+from app.db.session import engine
+from app.models.metrics import DeviceMetric, DeviceMetricRollup, PollRun
+
+# 보존 정책 (일). 원본은 짧게, 거친 tier일수록 길게 보관
+RAW_RETENTION_DAYS = 7
+RAW_STEP = 60    # 원본 샘플 간격 (기본 폴링 주기, app.services.poll_scheduler.POLL_INTERVAL)
+
+# (tier 초, 보존 일수, 입력 tier). 각 tier는 바로 아래 tier에서 만들어 읽는 행 수를 줄임 (0 = 원본)
+ROLLUP_TIERS = (
+    (300, 30, 0),
+    (3600, 180, 300),
+    (86400, 730, 3600),
+)
+TIER_NAMES = {0: "raw", 300: "5m", 3600: "1h", 86400: "1d"}
+
+# 주기 작업에서 다시 계산할 최근 구간 (진행 중이던 구간 + 늦게 들어온 샘플 반영)
+ROLLUP_LOOKBACK = {300: 900, 3600: 7200, 86400: 2 * 86400}
+
+METRICS_MAX_POINTS = 1000   # resolution을 지정하지 않은 조회의 최대 포인트 수
+
+_VALUE_COLUMNS = ("cpu_min", "cpu_max", "cpu_avg", "mem_min", "mem_max", "mem_avg")
+
+
+def reduce_buckets(device_id: np.ndarray, ts: np.ndarray, step: int, samples: np.ndarray,
+                   up_samples: np.ndarray, values: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+    """
+    (device_id, ts) 샘플/하위 구간을 step 초 구간으로 묶어 min/max/avg를 계산합니다.
+    정렬 후 구간 경계에서 ufunc.reduceat 한 번씩으로 처리하므로 행 수에 대해 파이썬 루프가 없습니다.
+    - values: cpu_min/max/avg, mem_min/max/avg 배열 (값 없음 = NaN)
+    - avg는 up_samples 가중 평균 (원본 샘플은 reachable이면 가중치 1)
+    """
+    bucket = ts // step * step
+    order = np.lexsort((bucket, device_id))
+    device_id, bucket = device_id[order], bucket[order]
+    samples, up_samples = samples[order], up_samples[order]
+
+    change = (np.diff(device_id) != 0) | (np.diff(bucket) != 0)
+    starts = np.concatenate(([0], np.flatnonzero(change) + 1))
+
+    out = {
+        "device_id": device_id[starts],
+        "bucket": bucket[starts],
+        "samples": np.add.reduceat(samples, starts),
+        "up_samples": np.add.reduceat(up_samples, starts),
+    }
+    for metric in ("cpu", "mem"):
+        vmin, vmax, vavg = (values[f"{metric}_{agg}"][order] for agg in ("min", "max", "avg"))
+        valid = ~np.isnan(vavg)
+        weight = np.where(valid, up_samples, 0).astype(float)
+        total = np.add.reduceat(np.where(valid, vavg * weight, 0.0), starts)
+        weight_sum = np.add.reduceat(weight, starts)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            out[f"{metric}_avg"] = np.where(weight_sum > 0, total / weight_sum, np.nan)
+        # fmin/fmax는 NaN을 무시 (구간 전체가 NaN이면 NaN)
+        out[f"{metric}_min"] = np.fmin.reduceat(vmin, starts)
+        out[f"{metric}_max"] = np.fmax.reduceat(vmax, starts)
+    return out
+
+
+def _nullable(value: float) -> Optional[float]:
+    return None if np.isnan(value) else round(float(value), 2)
+
+
+class MetricsRollup:
+    """device_metrics -> 5분/1시간/1일 tier 다운샘플링, tier별 보존, 조회 tier 선택"""
+
+    def __init__(self, bind=engine):
+        self.engine = bind
+        self.raw = DeviceMetric.__table__
+        self.rollups = DeviceMetricRollup.__table__
+
+    def _load(self, conn, source_tier: int, start: int, end: int) -> Optional[Tuple]:
+        """입력 tier의 [start, end) 구간을 numpy 배열로 읽음"""
+        if source_tier == 0:
+            c = self.raw.c
+            rows = conn.execute(
+                select(c.device_id, c.ts, c.reachable, c.cpu, c.mem).where(c.ts >= start, c.ts < end)
+            ).all()
+            if not rows:
+                return None
+            device_id, ts, reachable, cpu, mem = zip(*rows)
+            up = np.array(reachable, dtype=np.int64)
+            cpu = np.array(cpu, dtype=float)
+            mem = np.array(mem, dtype=float)
+            values = {"cpu_min": cpu, "cpu_max": cpu, "cpu_avg": cpu,
+                      "mem_min": mem, "mem_max": mem, "mem_avg": mem}
+            return (np.array(device_id, dtype=np.int64), np.array(ts, dtype=np.int64),
+                    np.ones(len(rows), dtype=np.int64), up, values)
+
+        c = self.rollups.c
+        rows = conn.execute(
+            select(c.device_id, c.bucket, c.samples, c.up_samples, *[c[name] for name in _VALUE_COLUMNS])
+            .where(c.tier == source_tier, c.bucket >= start, c.bucket < end)
+        ).all()
+        if not rows:
+            return None
+        columns = list(zip(*rows))
+        values = {name: np.array(col, dtype=float) for name, col in zip(_VALUE_COLUMNS, columns[4:])}
+        return (np.array(columns[0], dtype=np.int64), np.array(columns[1], dtype=np.int64),
+                np.array(columns[2], dtype=np.int64), np.array(columns[3], dtype=np.int64), values)
+
+    def rollup_tier(self, tier: int, start: int, end: int) -> int:
+        """
+        [start, end) 구간(tier 경계로 맞춤)을 다시 계산해 저장합니다.
+        기존 구간 행을 지우고 새로 넣으므로 여러 번 실행해도 결과가 같습니다.
+        """
+        source_tier = next(src for step, _, src in ROLLUP_TIERS if step == tier)
+        start = start // tier * tier
+        end = -(-end // tier) * tier
+
+        with self.engine.begin() as conn:
+            loaded = self._load(conn, source_tier, start, end)
+            conn.execute(delete(self.rollups).where(
+                self.rollups.c.tier == tier, self.rollups.c.bucket >= start, self.rollups.c.bucket < end
+            ))
+            if loaded is None:
+                return 0
+
+            device_id, ts, samples, up_samples, values = loaded
+            out = reduce_buckets(device_id, ts, tier, samples, up_samples, values)
+            rows = [
+                {"tier": tier, "device_id": int(device_id), "bucket": int(bucket),
+                 "samples": int(samples), "up_samples": int(up),
+                 **{name: _nullable(out[name][i]) for name in _VALUE_COLUMNS}}
+                for i, (device_id, bucket, samples, up) in enumerate(
+                    zip(out["device_id"], out["bucket"], out["samples"], out["up_samples"]))
+            ]
+            conn.execute(insert(self.rollups), rows)
+        return len(rows)
+
+    def rollup_recent(self, now: Optional[int] = None) -> Dict[str, int]:
+        """모든 tier를 낮은 tier부터 최근 구간만 다시 계산 (주기 작업용)"""
+        now = now or int(time.time())
+        return {
+            TIER_NAMES[tier]: self.rollup_tier(tier, now - ROLLUP_LOOKBACK[tier], now)
+            for tier, _, _ in ROLLUP_TIERS
+        }
+
+    def enforce_retention(self, now: Optional[int] = None) -> Dict[str, int]:
+        """보존 기간이 지난 원본 샘플과 tier별 집계를 삭제"""
+        now = now or int(time.time())
+        deleted = {}
+        with self.engine.begin() as conn:
+            result = conn.execute(delete(self.raw).where(self.raw.c.ts < now - RAW_RETENTION_DAYS * 86400))
+            deleted["raw"] = result.rowcount
+            for tier, days, _ in ROLLUP_TIERS:
+                result = conn.execute(delete(self.rollups).where(
+                    self.rollups.c.tier == tier, self.rollups.c.bucket < now - days * 86400
+                ))
+                deleted[TIER_NAMES[tier]] = result.rowcount
+            # 스케줄러 tick마다 쌓이는 실행 기록도 원본과 같은 기간만 보관
+            result = conn.execute(delete(PollRun.__table__).where(
+                PollRun.__table__.c.started_at < datetime.utcfromtimestamp(now - RAW_RETENTION_DAYS * 86400)
+            ))
+            deleted["poll_runs"] = result.rowcount
+        return deleted
+
+    @staticmethod
+    def select_tier(start: int, end: int, resolution: Optional[int] = None, now: Optional[int] = None,
+                    max_points: int = METRICS_MAX_POINTS) -> int:
+        """
+        조회에 쓸 tier 선택.
+        1) 요청 시작 시점의 데이터가 아직 남아 있는 tier만 후보 (보존 기간)
+        2) 그중 간격이 resolution(미지정 시 범위 / max_points) 이하인 가장 거친 tier
+        3) 그런 tier가 없으면 후보 중 가장 촘촘한 tier
+        """
+        now = now or int(time.time())
+        resolution = resolution or max(1, (end - start) // max_points)
+        tiers = [(0, RAW_STEP, RAW_RETENTION_DAYS)] + [(tier, tier, days) for tier, days, _ in ROLLUP_TIERS]
+
+        available = [(tier, step) for tier, step, days in tiers if start >= now - days * 86400]
+        if not available:
+            return ROLLUP_TIERS[-1][0]
+        fine_enough = [tier for tier, step in available if step <= resolution]
+        return fine_enough[-1] if fine_enough else available[0][0]
+
+    def query_series(self, device_id: int, start: int, end: int, resolution: Optional[int] = None,
+                     max_points: int = METRICS_MAX_POINTS) -> Dict:
+        """선택한 tier에서 [start, end) 시계열을 읽어 tier와 무관하게 같은 형식으로 반환"""
+        tier = self.select_tier(start, end, resolution, max_points=max_points)
+        with self.engine.connect() as conn:
+            if tier == 0:
+                c = self.raw.c
+                rows = conn.execute(
+                    select(c.ts, c.cpu, c.mem, c.reachable)
+                    .where(c.device_id == device_id, c.ts >= start, c.ts < end).order_by(c.ts)
+                ).all()
+                points = [{
+                    "ts": ts, "availability": 1.0 if reachable else 0.0,
+                    "cpu_min": cpu, "cpu_max": cpu, "cpu_avg": cpu,
+                    "mem_min": mem, "mem_max": mem, "mem_avg": mem,
+                } for ts, cpu, mem, reachable in rows]
+            else:
+                c = self.rollups.c
+                rows = conn.execute(
+                    select(self.rollups)
+                    .where(c.tier == tier, c.device_id == device_id,
+                           c.bucket >= start // tier * tier, c.bucket < end)
+                    .order_by(c.bucket)
+                ).all()
+                points = [{
+                    "ts": row.bucket,
+                    "availability": round(row.up_samples / row.samples, 4) if row.samples else None,
+                    **{name: row._mapping[name] for name in _VALUE_COLUMNS},
+                } for row in rows]
+        return {"tier": TIER_NAMES[tier], "step": tier or RAW_STEP, "points": points}
+
+
+metrics_rollup = MetricsRollup()
@@ -0,0 +1,115 @@
+import calendar
+from datetime import datetime
+from typing import Dict, List, Optional
+from sqlalchemy import insert, select, delete, func
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from app.db.session import engine
+from app.models.metrics import DeviceMetric, InterfaceStat
+
+METRICS_INSERT_BATCH = 1000   # executemany 한 번에 넣을 행 수
+
+
+def to_epoch(dt: datetime) -> int:
+    """datetime -> UTC epoch 초 (timezone 없는 값은 UTC로 간주)"""
+    return calendar.timegm(dt.utctimetuple())
+
+
+def parse_uptime(value) -> Optional[int]:
+    """sysUpTime(TimeTicks, 1/100초) 문자열 -> 초"""
+    try:
+        return int(value) // 100
+    except (TypeError, ValueError):
+        return None
+
+
+class MetricsStore:
+    """
+    device_metrics 시계열 저장소.
+    폴링 1회분 샘플을 한 트랜잭션의 executemany로 넣고, 조회는 (device_id, ts) PK 범위로만 수행합니다.
+    """
+
+    def __init__(self, bind=engine):
+        self.engine = bind
+        self.table = DeviceMetric.__table__
+
+    def _upsert_query(self):
+        """
+        같은 초에 같은 장비가 두 번 기록되면(수동 전체 폴링 + 스케줄러 tick 등) 나중 값으로 덮어쓰는 INSERT
+        (ON CONFLICT (device_id, ts) DO UPDATE. 중복 키 오류로 폴링 1회분 전체가 롤백되지 않도록)
+        """
+        dialect = self.engine.dialect.name
+        if dialect == "sqlite":
+            query = sqlite_insert(self.table)
+        elif dialect == "postgresql":
+            query = postgresql_insert(self.table)
+        else:
+            return insert(self.table)
+        return query.on_conflict_do_update(
+            index_elements=["device_id", "ts"],
+            set_={name: query.excluded[name] for name in ("cpu", "mem", "uptime", "reachable")},
+        )
+
+    def insert_samples(self, samples: List[Dict], batch_size: int = METRICS_INSERT_BATCH) -> int:
+        """samples: [{"device_id", "ts", "cpu", "mem", "uptime", "reachable"}, ...]"""
+        if not samples:
+            return 0
+        query = self._upsert_query()
+        with self.engine.begin() as conn:
+            for i in range(0, len(samples), batch_size):
+                conn.execute(query, samples[i:i + batch_size])
+        return len(samples)
+
+    def query(self, device_id: int, start: Optional[int] = None, end: Optional[int] = None,
+              limit: Optional[int] = None) -> List[Dict]:
+        """[start, end) epoch 초 구간의 샘플 (시간 오름차순)"""
+        c = self.table.c
+        query = select(c.ts, c.cpu, c.mem, c.uptime, c.reachable).where(c.device_id == device_id)
+        if start is not None:
+            query = query.where(c.ts >= start)
+        if end is not None:
+            query = query.where(c.ts < end)
+        query = query.order_by(c.ts)
+        if limit:
+            query = query.limit(limit)
+        with self.engine.connect() as conn:
+            return [dict(row._mapping) for row in conn.execute(query)]
+
+    def latest(self) -> List[Dict]:
+        """장비별 마지막 샘플 (대시보드용)"""
+        c = self.table.c
+        last = (
+            select(c.device_id, func.max(c.ts).label("ts"))
+            .group_by(c.device_id)
+            .subquery()
+        )
+        query = select(self.table).join(
+            last, (c.device_id == last.c.device_id) & (c.ts == last.c.ts)
+        )
+        with self.engine.connect() as conn:
+            return [dict(row._mapping) for row in conn.execute(query)]
+
+    def replace_interface_stats(self, device_rates: Dict[int, Dict[int, Dict]], ts: int) -> int:
+        """장비별 인터페이스 최신 트래픽을 교체 (device_rates: {device_id: {ifIndex: rate}})"""
+        if not device_rates:
+            return 0
+        table = InterfaceStat.__table__
+        rows = [
+            {"device_id": device_id, "if_index": if_index, "ts": ts, **rate}
+            for device_id, rates in device_rates.items()
+            for if_index, rate in rates.items()
+        ]
+        with self.engine.begin() as conn:
+            conn.execute(delete(table).where(table.c.device_id.in_(list(device_rates))))
+            if rows:
+                conn.execute(insert(table), rows)
+        return len(rows)
+
+    def interface_stats(self, device_id: int) -> List[Dict]:
+        table = InterfaceStat.__table__
+        query = select(table).where(table.c.device_id == device_id).order_by(table.c.if_index)
+        with self.engine.connect() as conn:
+            return [dict(row._mapping) for row in conn.execute(query)]
+
+
+metrics_store = MetricsStore()
@@ -0,0 +1,128 @@
+import heapq
+import random
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+# 폴링 주기 설정 (초)
+POLL_INTERVAL = 60            # 기본 주기
+POLL_INTERVAL_CRITICAL = 15   # critical 장비 주기 (장비별 poll_interval이 있으면 그 값 우선)
+POLL_BACKOFF_MAX = 900        # 응답 없는 장비의 최대 주기 (지수 backoff 상한)
+POLL_JITTER = 0.1             # 다음 폴링 시각을 주기의 ±10% 범위에서 흩뜨림
+POLL_DEVICE_RELOAD = 60       # 장비 목록(추가/삭제/설정 변경) 다시 읽는 주기
+
+
+class DeviceSchedule:
+    __slots__ = ("device_id", "target", "interval", "failures", "due")
+
+    def __init__(self, device_id: int, target: Dict, interval: float):
+        self.device_id = device_id
+        self.target = target
+        self.interval = interval
+        self.failures = 0
+        self.due = 0.0
+
+
+class PollScheduler:
+    """
+    장비별 다음 폴링 시각을 우선순위 큐(heap)로 관리합니다.
+    - 매 tick에서 due() 로 시각이 된 장비만 꺼내 폴링
+    - 응답 없는 장비는 연속 실패 횟수만큼 주기를 2배씩 늘림 (POLL_BACKOFF_MAX 까지), 응답하면 원래 주기로 복귀
+    - critical 장비는 짧은 주기, 모든 예약 시각에 jitter를 더해 정각에 요청이 몰리지 않게 함
+    장비 설정이 바뀌면 heap에 옛 항목이 남지만, 꺼낼 때 schedule.due와 비교해 버립니다. (lazy deletion)
+    """
+
+    def __init__(self, interval: float = POLL_INTERVAL, critical_interval: float = POLL_INTERVAL_CRITICAL,
+                 backoff_max: float = POLL_BACKOFF_MAX, jitter: float = POLL_JITTER):
+        self.default_interval = interval
+        self.critical_interval = critical_interval
+        self.backoff_max = backoff_max
+        self.jitter = jitter
+        self._heap: List[Tuple[float, int]] = []
+        self._schedules: Dict[int, DeviceSchedule] = {}
+        self._lock = threading.Lock()
+        self.loaded_at: Optional[float] = None
+
+    def __len__(self):
+        return len(self._schedules)
+
+    def interval_for(self, device: Dict) -> float:
+        if device.get("poll_interval"):
+            return float(device["poll_interval"])
+        return self.critical_interval if device.get("critical") else self.default_interval
+
+    def _jittered(self, seconds: float) -> float:
+        return seconds * (1 + random.uniform(-self.jitter, self.jitter))
+
+    def _push(self, schedule: DeviceSchedule, due: float):
+        schedule.due = due
+        heapq.heappush(self._heap, (due, schedule.device_id))
+
+    def sync(self, devices: List[Dict], now: Optional[float] = None):
+        """
+        장비 목록 반영. devices: [{"id", "host", "community", "critical", "poll_interval", ...}]
+        새 장비는 첫 주기 안의 임의 시각에 배치해 폴링 시작 시각을 분산합니다.
+        """
+        now = now if now is not None else time.time()
+        with self._lock:
+            seen = set()
+            for device in devices:
+                device_id = device["id"]
+                seen.add(device_id)
+                interval = self.interval_for(device)
+                schedule = self._schedules.get(device_id)
+                if schedule is None:
+                    schedule = self._schedules[device_id] = DeviceSchedule(device_id, device, interval)
+                    self._push(schedule, now + random.uniform(0, interval))
+                    continue
+                schedule.target = device
+                if schedule.interval != interval:
+                    schedule.interval = interval
+                    in_flight = schedule.due == float("inf")  # due()로 꺼내져 폴링 중
+                    if schedule.failures == 0 and not in_flight and schedule.due > now + interval:
+                        self._push(schedule, now + random.uniform(0, interval))
+            for device_id in list(self._schedules):
+                if device_id not in seen:
+                    del self._schedules[device_id]
+            self.loaded_at = now
+
+    def due(self, now: Optional[float] = None, limit: Optional[int] = None) -> List[Dict]:
+        """지금 폴링할 장비 target 목록 (꺼낸 장비는 record() 전까지 다시 나오지 않음)"""
+        now = now if now is not None else time.time()
+        targets = []
+        with self._lock:
+            while self._heap and self._heap[0][0] <= now and (limit is None or len(targets) < limit):
+                due, device_id = heapq.heappop(self._heap)
+                schedule = self._schedules.get(device_id)
+                if schedule is None or schedule.due != due:
+                    continue  # 삭제됐거나 다시 예약된 장비의 옛 항목
+                schedule.due = float("inf")
+                targets.append(schedule.target)
+        return targets
+
+    def record(self, device_id: int, online: bool, now: Optional[float] = None) -> Optional[float]:
+        """폴링 결과 반영 후 다음 폴링 시각을 예약하고 반환"""
+        now = now if now is not None else time.time()
+        with self._lock:
+            schedule = self._schedules.get(device_id)
+            if schedule is None:
+                return None
+            schedule.failures = 0 if online else schedule.failures + 1
+            delay = min(schedule.interval * (2 ** schedule.failures), max(self.backoff_max, schedule.interval))
+            self._push(schedule, now + self._jittered(delay))
+            return schedule.due
+
+    def next_due(self) -> Optional[float]:
+        with self._lock:
+            return self._heap[0][0] if self._heap else None
+
+    def snapshot(self) -> List[Dict]:
+        with self._lock:
+            return [
+                {"device_id": s.device_id, "interval": s.interval, "failures": s.failures, "due": s.due}
+                for s in self._schedules.values()
+            ]
+
+
+# 폴링 워커 프로세스 전역 스케줄러 (celery-poller는 concurrency=1 단일 프로세스로 실행)
+poll_scheduler = PollScheduler()
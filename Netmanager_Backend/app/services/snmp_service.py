@@ -1,56 +1,266 @@
-from pysnmp.hlapi import SnmpEngine, CommunityData, UdpTransportTarget, ContextData, ObjectType, ObjectIdentity, getCmd
+from pysnmp.hlapi import (
+    SnmpEngine, CommunityData, UsmUserData, ContextData, ObjectType, ObjectIdentity, usmKeyTypeLocalized,
+)
+from pysnmp.hlapi.asyncio import UdpTransportTarget, getCmd, bulkCmd
+from pysnmp.proto import errind
+from pysnmp.proto.rfc1902 import OctetString
+from pysnmp.proto.rfc1905 import EndOfMibView
+from app.services.snmp_usm import UsmCredentials, usm_keys
+from typing import Dict, List, Optional, Tuple
+import asyncio
+from functools import lru_cache
+import os
+import threading
 import time
 
+# 전체 장비 폴링 시 동시에 진행할 최대 SNMP 요청 수
+SNMP_POLL_CONCURRENCY = int(os.getenv("SNMP_POLL_CONCURRENCY", "100"))
+SNMP_TIMEOUT = 1.0
+SNMP_RETRIES = 1
+# GETBULK 한 번에 요청할 행 수 (응답 1개 = max_repetitions × 컬럼 수 varbind, UDP 크기 고려)
+SNMP_BULK_MAX_REPETITIONS = int(os.getenv("SNMP_BULK_MAX_REPETITIONS", "50"))
+
+STATUS_OIDS = ['1.3.6.1.2.1.1.1.0', '1.3.6.1.2.1.1.3.0']  # sysDescr, sysUpTime
+RESOURCE_OIDS = [
+    '1.3.6.1.4.1.9.9.109.1.1.1.1.5.1',  # CPU 5min
+    '1.3.6.1.4.1.9.9.48.1.1.1.5.1',   # Mem Used
+    '1.3.6.1.4.1.9.9.48.1.1.1.6.1'    # Mem Free
+]
+
+# 인터페이스 카운터 (IF-MIB ifXTable). 64비트 HC 카운터 + 속도(Mbps) + 이름
+IF_NAME_OID = '1.3.6.1.2.1.31.1.1.1.1'
+IF_HC_IN_OCTETS_OID = '1.3.6.1.2.1.31.1.1.1.6'
+IF_HC_OUT_OCTETS_OID = '1.3.6.1.2.1.31.1.1.1.10'
+IF_HIGH_SPEED_OID = '1.3.6.1.2.1.31.1.1.1.15'
+INTERFACE_COLUMNS = [IF_NAME_OID, IF_HC_IN_OCTETS_OID, IF_HC_OUT_OCTETS_OID, IF_HIGH_SPEED_OID]
+
+
+@lru_cache(maxsize=64)
+def _object_types(oids: Tuple[str, ...]) -> Tuple[ObjectType, ...]:
+    """
+    OID 목록별 ObjectType 캐시. 첫 요청에서 MIB로 resolve 된 객체를 재사용해
+    매 요청마다 OID 문자열을 다시 해석하지 않습니다. (폴링 OID 목록은 몇 개로 고정)
+    """
+    return tuple(ObjectType(ObjectIdentity(oid)) for oid in oids)
+
+
+class SnmpRuntime:
+    """
+    프로세스 전역 SNMP 실행 환경.
+    - SnmpEngine 1개 (MIB 로딩 등 생성 비용이 커서 장비/폴링마다 만들지 않음)
+    - 엔진의 asyncio 디스패처가 붙어 있는 백그라운드 이벤트 루프 스레드 1개
+    - (host, port, community, version) 별 CommunityData / UdpTransportTarget 캐시
+    - v3: (host, port, 계정, engineID) 별 UsmUserData(로컬라이즈된 키) 캐시
+    동기 코드(Celery 태스크, API)는 run()으로 코루틴을 이 루프에 넘기고 결과를 기다립니다.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._pid: Optional[int] = None
+        self._engine: Optional[SnmpEngine] = None
+        self._targets: Dict[Tuple, Tuple] = {}
+        self.context = ContextData()
+
+    def _start(self):
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name="snmp-loop", daemon=True)
+        self._thread.start()
+        self._engine = SnmpEngine()
+        self._targets = {}
+        self._pid = os.getpid()
+
+    def _ensure_started(self):
+        # Celery prefork 자식 프로세스에는 부모의 루프 스레드가 없으므로 pid 기준으로 새로 시작
+        if self._pid != os.getpid():
+            with self._lock:
+                if self._pid != os.getpid():
+                    self._start()
+
+    @property
+    def engine(self) -> SnmpEngine:
+        self._ensure_started()
+        return self._engine
+
+    def target(self, host: str, port: int = 161, community: str = 'public', version: int = 2) -> Tuple:
+        """(CommunityData, UdpTransportTarget) 캐시 조회. 폴링 주기마다 같은 객체를 재사용합니다."""
+        key = (host, port, community, version)
+        target = self._targets.get(key)
+        if target is None:
+            auth = CommunityData(community, mpModel=0 if version == 1 else 1)
+            transport = UdpTransportTarget((host, port), timeout=SNMP_TIMEOUT, retries=SNMP_RETRIES)
+            target = self._targets.setdefault(key, (auth, transport))
+        return target
+
+    def usm_target(self, host: str, port: int, creds: UsmCredentials, engine_id: bytes) -> Tuple:
+        """
+        (UsmUserData, UdpTransportTarget) 캐시 조회. 키는 usm_keys에서 이미 로컬라이즈된 것을 넘기므로
+        pysnmp가 패스프레이즈 해시를 다시 하지 않고, securityEngineId를 지정해 discovery 왕복도 생략됩니다.
+        (pysnmp LCD는 (user, engineID) 단위로 계정을 등록하므로 같은 user 이름을 쓰는 장비끼리도 섞이지 않음)
+        """
+        key = ("usm", host, port, creds, engine_id)
+        target = self._targets.get(key)
+        if target is None:
+            auth_key, priv_key = usm_keys.localized_keys(engine_id, creds)
+            auth = UsmUserData(
+                creds.user, authKey=auth_key, privKey=priv_key,
+                authProtocol=creds.auth_oid, privProtocol=creds.priv_oid,
+                securityEngineId=OctetString(engine_id),
+                authKeyType=usmKeyTypeLocalized, privKeyType=usmKeyTypeLocalized,
+            )
+            transport = self.target(host, port)[1]
+            target = self._targets.setdefault(key, (auth, transport))
+        return target
+
+    def run(self, coro, timeout: Optional[float] = None):
+        """코루틴을 SNMP 루프에서 실행하고 결과를 반환 (호출 스레드는 블로킹)"""
+        self._ensure_started()
+        return asyncio.run_coroutine_threadsafe(coro, self._loop).result(timeout)
+
+    def stop(self):
+        with self._lock:
+            if self._loop is None or self._pid != os.getpid():
+                return
+            loop, engine = self._loop, self._engine
+            if engine.transportDispatcher:
+                loop.call_soon_threadsafe(engine.transportDispatcher.closeDispatcher)
+            loop.call_soon_threadsafe(loop.stop)
+            self._thread.join(timeout=5)
+            self._loop = self._thread = self._engine = self._pid = None
+            self._targets = {}
+
+
+# 프로세스 전역 런타임
+snmp_runtime = SnmpRuntime()
+
+
 class SnmpManager:
-    def __init__(self, target_ip, community='public', version=2, port=161):
+    def __init__(self, target_ip, community='public', version=2, port=161, runtime: SnmpRuntime = None,
+                 usm: Optional[UsmCredentials] = None):
         self.target = target_ip
         self.community = community
         self.port = port
+        self.version = version
+        self.usm = usm
+        if version == 3 and usm is None:
+            raise ValueError("SNMPv3 requires USM credentials")
 
-        # SnmpEngine은 공유 가능하지만, 간단히 인스턴스마다 생성
-        self.snmp_engine = SnmpEngine()
-        self.community_data = CommunityData(community, mpModel=1)  # v2c
-        self.transport = UdpTransportTarget((target_ip, port), timeout=1.0, retries=1)
-        self.context = ContextData()
+        # 엔진과 transport/community 객체는 프로세스 전역 런타임에서 공유 (장비마다 새로 만들지 않음)
+        self.runtime = runtime or snmp_runtime
+        if version == 3:
+            self.community_data, self.transport = None, None  # engineID 확인 후 _auth_target()에서 결정
+        else:
+            self.community_data, self.transport = self.runtime.target(target_ip, port, community, version)
+        self.context = self.runtime.context
+
+    async def _auth_target(self) -> Optional[Tuple]:
+        """
+        요청에 쓸 (인증 데이터, transport). v3는 장비 engineID(캐시)에 맞춰 로컬라이즈된 UsmUserData를 씁니다.
+        engineID를 확인할 수 없으면(무응답) None
+        """
+        if self.version != 3:
+            return self.community_data, self.transport
+        engine_id = await usm_keys.discover_engine_id(self.target, self.port, SNMP_TIMEOUT, SNMP_RETRIES)
+        if engine_id is None:
+            return None
+        return self.runtime.usm_target(self.target, self.port, self.usm, engine_id)
+
+    def _check_usm_error(self, errorIndication):
+        # 타임아웃이 아닌 v3 오류(unknownEngineID, wrongDigest 등)는 장비 교체/재설정일 수 있으므로 engineID를 다시 확인
+        if self.version == 3 and errorIndication and not isinstance(errorIndication, errind.RequestTimedOut):
+            print(f"[SNMPv3 Error] {self.target}: {errorIndication}")
+            usm_keys.forget_engine_id(self.target, self.port)
+
+    def _parse_response(self, errorIndication, errorStatus, varBinds):
+        if errorIndication:
+            # 타임아웃 등 네트워크 에러
+            return None
+        elif errorStatus:
+            print(f"[SNMP Error] {self.target}: {errorStatus.prettyPrint()}")
+            return None
+        else:
+            result = {}
+            for varBind in varBinds:
+                oid = str(varBind[0])
+                val = varBind[1]
+                result[oid] = str(val)
+            return result
 
     def _get_request(self, oids):
-        """SNMP GET 요청을 보내고 결과를 반환"""
+        """SNMP GET 요청을 보내고 결과를 반환 (공유 루프에서 실행될 때까지 블로킹)"""
+        return self.runtime.run(self._async_get_request(oids))
+
+    async def _async_get_request(self, oids):
+        """_get_request의 asyncio 버전. 응답을 기다리는 동안 다른 장비의 요청이 진행됩니다."""
         try:
-            iterator = getCmd(
-                self.snmp_engine,
-                self.community_data,
-                self.transport,
+            target = await self._auth_target()
+            if target is None:
+                return None
+            errorIndication, errorStatus, errorIndex, varBinds = await getCmd(
+                self.runtime.engine,
+                *target,
                 self.context,
-                *[ObjectType(ObjectIdentity(oid)) for oid in oids]
+                *_object_types(tuple(oids)),
+                lookupMib=False
             )
-
-            errorIndication, errorStatus, errorIndex, varBinds = next(iterator)
-
-            if errorIndication:
-                # 타임아웃 등 네트워크 에러
-                return None
-            elif errorStatus:
-                print(f"[SNMP Error] {self.target}: {errorStatus.prettyPrint()}")
-                return None
-            else:
-                result = {}
-                for varBind in varBinds:
-                    oid = str(varBind[0])
-                    val = varBind[1]
-                    result[oid] = str(val)
-                return result
+            self._check_usm_error(errorIndication)
+            return self._parse_response(errorIndication, errorStatus, varBinds)
         except Exception as e:
             print(f"[SNMP Exception] {self.target}: {e}")
             return None
 
-    def check_status(self):
+    async def _async_bulk_walk(self, columns: List[str], max_repetitions: int = SNMP_BULK_MAX_REPETITIONS):
         """
-        기본 상태 체크 (System Description, Uptime)
-        성공하면 Online, 실패하면 Offline
+        GETBULK으로 여러 테이블 컬럼을 한꺼번에 walk 합니다.
+        요청 1번에 컬럼마다 max_repetitions 행씩 받아오고, 끝나지 않은 컬럼만 마지막 OID부터 이어서 요청합니다.
+        반환: {컬럼 OID: {인덱스(str): 값}}  (실패 시 None)
         """
-        oids = ['1.3.6.1.2.1.1.1.0', '1.3.6.1.2.1.1.3.0']  # sysDescr, sysUpTime
-        data = self._get_request(oids)
+        table: Dict[str, Dict[str, object]] = {col: {} for col in columns}
+        pending = {col: col for col in columns}  # 컬럼 -> 다음 요청 시작 OID
+
+        while pending:
+            cols = list(pending)
+            try:
+                target = await self._auth_target()
+                if target is None:
+                    return None
+                errorIndication, errorStatus, errorIndex, varBindTable = await bulkCmd(
+                    self.runtime.engine,
+                    *target,
+                    self.context,
+                    0, max_repetitions,
+                    *[ObjectType(ObjectIdentity(pending[col])) for col in cols],
+                    lookupMib=False
+                )
+            except Exception as e:
+                print(f"[SNMP Exception] {self.target}: {e}")
+                return None
+            self._check_usm_error(errorIndication)
+            if errorIndication or errorStatus:
+                if errorStatus:
+                    print(f"[SNMP Error] {self.target}: {errorStatus.prettyPrint()}")
+                return None
 
+            done = set()
+            for row in varBindTable:
+                for col, (oid, val) in zip(cols, row):
+                    if col in done:
+                        continue
+                    oid = str(oid)
+                    if isinstance(val, EndOfMibView) or not oid.startswith(col + '.'):
+                        done.add(col)  # 컬럼 범위를 벗어남 = 이 컬럼 walk 끝
+                        continue
+                    table[col][oid[len(col) + 1:]] = val
+                    pending[col] = oid
+            for col in cols:
+                # 진행이 없는 컬럼(빈 응답 등)도 끝난 것으로 처리해 무한 반복 방지
+                if col in done or not varBindTable:
+                    pending.pop(col, None)
+        return table
+
+    @staticmethod
+    def _status_result(data):
         if data:
             return {
                 "status": "online",
@@ -60,18 +270,8 @@ class SnmpManager:
         else:
             return {"status": "offline"}
 
-    def get_resource_usage(self):
-        """
-        CPU, Memory 사용량 조회 (Cisco 기준 OID)
-        """
-        oids = [
-            '1.3.6.1.4.1.9.9.109.1.1.1.1.5.1',  # CPU 5min
-            '1.3.6.1.4.1.9.9.48.1.1.1.5.1',   # Mem Used
-            '1.3.6.1.4.1.9.9.48.1.1.1.6.1'    # Mem Free
-        ]
-
-        data = self._get_request(oids)
-
+    @staticmethod
+    def _resource_result(data):
         if not data:
             return None
 
@@ -85,4 +285,85 @@ class SnmpManager:
         return {
             "cpu_usage": int(cpu),
             "memory_usage": round(mem_percent, 2)
-        }
\ No newline at end of file
+        }
+
+    def check_status(self):
+        """
+        기본 상태 체크 (System Description, Uptime)
+        성공하면 Online, 실패하면 Offline
+        """
+        return self._status_result(self._get_request(STATUS_OIDS))
+
+    def get_resource_usage(self):
+        """
+        CPU, Memory 사용량 조회 (Cisco 기준 OID)
+        """
+        return self._resource_result(self._get_request(RESOURCE_OIDS))
+
+    async def async_check_status(self):
+        return self._status_result(await self._async_get_request(STATUS_OIDS))
+
+    async def async_get_resource_usage(self):
+        return self._resource_result(await self._async_get_request(RESOURCE_OIDS))
+
+    async def async_get_interface_counters(self, max_repetitions: int = SNMP_BULK_MAX_REPETITIONS):
+        """
+        전체 인터페이스의 64비트 입/출력 옥텟 카운터와 속도.
+        반환: {ifIndex: {"name", "in_octets", "out_octets", "speed_mbps"}}  (실패 시 None)
+        """
+        table = await self._async_bulk_walk(INTERFACE_COLUMNS, max_repetitions)
+        if table is None:
+            return None
+        names, speeds = table[IF_NAME_OID], table[IF_HIGH_SPEED_OID]
+        in_octets, out_octets = table[IF_HC_IN_OCTETS_OID], table[IF_HC_OUT_OCTETS_OID]
+        return {
+            int(index): {
+                "name": str(names.get(index, index)),
+                "in_octets": int(in_octets[index]),
+                "out_octets": int(out_octets[index]),
+                "speed_mbps": int(speeds[index]) if index in speeds else 0,
+            }
+            for index in in_octets if index in out_octets
+        }
+
+    def get_interface_counters(self, max_repetitions: int = SNMP_BULK_MAX_REPETITIONS):
+        return self.runtime.run(self.async_get_interface_counters(max_repetitions))
+
+
+async def _poll_device(semaphore, target: Dict, interfaces: bool) -> Dict:
+    async with semaphore:
+        result = {"id": target["id"], "status": "offline", "resources": None, "interfaces": None}
+        try:
+            snmp = SnmpManager(target_ip=target["host"], community=target.get("community", "public"),
+                               version=target.get("version", 2), port=target.get("port", 161),
+                               usm=target.get("usm"))
+            status_data = await snmp.async_check_status()
+            result["status"] = status_data["status"]
+            result["uptime"] = status_data.get("uptime")
+            if result["status"] == "online":
+                result["resources"] = await snmp.async_get_resource_usage()
+                if interfaces:
+                    result["interfaces"] = await snmp.async_get_interface_counters()
+                    result["interfaces_ts"] = time.time()  # 카운터 수집 시각 (rate 계산용)
+        except Exception as e:
+            print(f"[SNMP Exception] {target['host']}: {e}")
+        return result
+
+
+async def _poll_fleet(targets: List[Dict], concurrency: int, interfaces: bool) -> List[Dict]:
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+    return await asyncio.gather(*[_poll_device(semaphore, t, interfaces) for t in targets])
+
+
+def poll_devices(targets: List[Dict], concurrency: Optional[int] = None, interfaces: bool = False) -> List[Dict]:
+    """
+    여러 장비를 동시에 폴링합니다. targets: [{"id", "host", "community", ("port", "version", "usm")}, ...]
+    (version 3이면 usm에 UsmCredentials)
+    응답 대기(타임아웃 포함)가 겹쳐서 진행되므로 전체 소요 시간은 대략
+    (장비 수 / concurrency) × 장비당 응답 시간 수준으로 줄어듭니다.
+    interfaces=True면 온라인 장비의 인터페이스 카운터도 GETBULK으로 함께 수집합니다.
+    반환: [{"id", "status", "uptime", "resources", "interfaces", ("interfaces_ts")}, ...] (targets 순서 유지)
+    """
+    if not targets:
+        return []
+    return snmp_runtime.run(_poll_fleet(targets, concurrency or SNMP_POLL_CONCURRENCY, interfaces))
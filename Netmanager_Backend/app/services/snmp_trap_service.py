@@ -0,0 +1,168 @@
+import os
+import socket
+import time
+from datetime import datetime
+from typing import Dict, Optional, Tuple
+
+from pyasn1.codec.ber import decoder, encoder
+from pyasn1.error import PyAsn1Error
+from pyasn1.type.univ import OctetString
+from pysnmp.proto import api
+from pysnmp.proto.api import v2c
+
+from app.db.session import SessionLocal
+from app.models.device import Device
+from app.services.device_index import device_index
+from app.services.device_status import DeviceStatusTracker
+from app.services.syslog_service import get_syslog_pipeline
+
+SNMP_TRAP_PORT = int(os.getenv("SNMP_TRAP_PORT", "162"))
+# 허용할 community 목록 (콤마 구분). 비어 있으면 모두 허용
+SNMP_TRAP_COMMUNITIES = {c for c in os.getenv("SNMP_TRAP_COMMUNITIES", "").split(",") if c}
+TRAP_STATUS_REFRESH = 60.0    # 상태 스냅샷을 DB에서 다시 읽는 주기 (폴러가 바꾼 상태 반영)
+
+SNMP_TRAP_OID = '1.3.6.1.6.3.1.1.4.1.0'   # SNMPv2-MIB::snmpTrapOID.0
+IF_INDEX_OID = '1.3.6.1.2.1.2.2.1.1.'
+IF_DESCR_OID = '1.3.6.1.2.1.2.2.1.2.'
+IF_NAME_OID = '1.3.6.1.2.1.31.1.1.1.1.'
+
+# snmpTrapOID -> (event_id, severity). v1 generic-trap 번호도 같은 표로 변환
+TRAP_EVENTS = {
+    '1.3.6.1.6.3.1.1.5.1': ("COLD_START", "WARNING"),
+    '1.3.6.1.6.3.1.1.5.2': ("WARM_START", "WARNING"),
+    '1.3.6.1.6.3.1.1.5.3': ("LINK_DOWN", "CRITICAL"),
+    '1.3.6.1.6.3.1.1.5.4': ("LINK_UP", "INFO"),
+}
+V1_GENERIC_TRAPS = {
+    0: '1.3.6.1.6.3.1.1.5.1',
+    1: '1.3.6.1.6.3.1.1.5.2',
+    2: '1.3.6.1.6.3.1.1.5.3',
+    3: '1.3.6.1.6.3.1.1.5.4',
+}
+
+
+def parse_trap(data: bytes, source_ip: str) -> Optional[Tuple[Dict, object]]:
+    """
+    트랩/inform 패킷 -> (EventLog 행, 디코딩된 메시지). 트랩이 아니거나 허용되지 않은 community면 None
+    v1/v2c만 처리합니다 (v3나 잘못된 패킷은 PyAsn1Error)
+    """
+    version = int(api.decodeMessageVersion(data))
+    if version not in api.protoModules:
+        raise PyAsn1Error(f"unsupported SNMP version {version}")
+    p_mod = api.protoModules[version]
+    message, _ = decoder.decode(data, asn1Spec=p_mod.Message())
+    pdu = p_mod.apiMessage.getPDU(message)
+    if not pdu.isSameTypeWith(p_mod.TrapPDU()) and not pdu.isSameTypeWith(v2c.InformRequestPDU()):
+        return None
+    community = p_mod.apiMessage.getCommunity(message).asOctets()
+    if SNMP_TRAP_COMMUNITIES and community.decode(errors="ignore") not in SNMP_TRAP_COMMUNITIES:
+        return None
+
+    if version == api.protoVersion1:
+        varbinds = [(str(oid), value) for oid, value in p_mod.apiTrapPDU.getVarBinds(pdu)]
+        enterprise = p_mod.apiTrapPDU.getEnterprise(pdu)
+        specific_trap = p_mod.apiTrapPDU.getSpecificTrap(pdu)
+        trap_oid = V1_GENERIC_TRAPS.get(int(p_mod.apiTrapPDU.getGenericTrap(pdu)), f"{enterprise}.0.{specific_trap}")
+    else:
+        varbinds = [(str(oid), value) for oid, value in p_mod.apiPDU.getVarBinds(pdu)]
+        trap_oid = next((str(value) for oid, value in varbinds if oid == SNMP_TRAP_OID), None)
+    event_id, severity = TRAP_EVENTS.get(trap_oid, ("SNMP_TRAP", "INFO"))
+
+    # 인터페이스 정보 (linkUp/linkDown 트랩의 ifIndex, ifDescr / ifName)
+    if_index = if_name = None
+    for oid, value in varbinds:
+        if oid.startswith(IF_INDEX_OID):
+            if_index = int(value)
+        elif oid.startswith((IF_NAME_OID, IF_DESCR_OID)) and isinstance(value, OctetString):
+            if_name = value.asOctets().decode(errors="replace")
+
+    if event_id in ("LINK_DOWN", "LINK_UP"):
+        interface = if_name or (f"ifIndex {if_index}" if if_index is not None else "unknown")
+        text = f"Interface {interface}, changed state to {'down' if event_id == 'LINK_DOWN' else 'up'} (SNMP trap)"
+    elif event_id == "SNMP_TRAP":
+        text = f"SNMP trap {trap_oid}"
+    else:
+        text = f"Device restarted ({event_id.lower().replace('_', ' ')}, SNMP trap)"
+
+    now = datetime.utcnow()
+    row = {"timestamp": now, "severity": severity, "source": source_ip, "event_id": event_id, "message": text}
+    return row, message
+
+
+def inform_response(message) -> Optional[bytes]:
+    """inform 메시지면 같은 request-id/varbinds의 Response 패킷 (트랩이면 None)"""
+    pdu = v2c.apiMessage.getPDU(message)
+    if not pdu.isSameTypeWith(v2c.InformRequestPDU()):
+        return None
+    response = v2c.apiMessage.getResponse(message)
+    v2c.apiPDU.setVarBinds(v2c.apiMessage.getPDU(response), v2c.apiPDU.getVarBinds(pdu))
+    return encoder.encode(response)
+
+
+class TrapStatusUpdater:
+    """
+    트랩을 보낸 장비는 살아 있으므로 스냅샷상 online이 아니면 즉시 online으로 반영합니다.
+    (폴링 주기를 기다리지 않음. DB 쓰기는 상태가 바뀐 경우에만)
+    """
+
+    def __init__(self, refresh_interval: float = TRAP_STATUS_REFRESH):
+        self.tracker = DeviceStatusTracker()
+        self.refresh_interval = refresh_interval
+        self._loaded_at: Optional[float] = None
+
+    def _refresh_if_stale(self):
+        if self._loaded_at is not None and time.monotonic() - self._loaded_at < self.refresh_interval:
+            return
+        db = SessionLocal()
+        try:
+            self.tracker.load(db.query(Device.id, Device.status).all())
+        finally:
+            db.close()
+        self._loaded_at = time.monotonic()
+
+    def mark_online(self, device_id: int, host: str):
+        self._refresh_if_stale()
+        transitions = self.tracker.reconcile({device_id: "online"})
+        self.tracker.apply(transitions, {device_id: host})
+
+
+def start_trap_server(host="0.0.0.0", port=SNMP_TRAP_PORT):
+    """
+    SNMP 트랩/inform 수신 (syslog 서버와 같은 방식의 스레드에서 실행).
+    linkUp/linkDown/coldStart/warmStart를 EventLog 이벤트로 바꿔 syslog 저장 파이프라인으로 넘기고
+    (장비 매핑, 실시간 스트림 공유. 반복 합치기는 하지 않고 트랩마다 한 행), 장비 상태를 즉시 갱신합니다.
+    inform에는 응답을 보냅니다.
+    """
+    pipeline = get_syslog_pipeline()
+    pipeline.start()
+    status = TrapStatusUpdater()
+
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    sock.bind((host, port))
+    print(f"SNMP Trap 서버 시작: {host}:{port}")
+
+    while True:
+        data, addr = sock.recvfrom(65535)
+        try:
+            parsed = parse_trap(data, addr[0])
+        except PyAsn1Error as e:
+            print(f"[SNMP Trap] {addr[0]} 디코딩 실패: {e}")
+            continue
+        if parsed is None:
+            continue
+        row, message = parsed
+
+        response = inform_response(message)
+        if response is not None:
+            sock.sendto(response, addr)
+
+        # 트랩은 건별 이벤트(링크 플랩 횟수 등)이므로 합치지 않고 다음 flush에 바로 저장
+        pipeline.submit(row, coalesce=False)
+
+        device_index.refresh_if_stale()
+        device_id = device_index.lookup(addr[0])
+        if device_id is not None:
+            try:
+                status.mark_online(device_id, addr[0])
+            except Exception as e:
+                print(f"[SNMP Trap] 상태 갱신 실패: {e}")
@@ -0,0 +1,205 @@
+"""
+SNMPv3 USM(authPriv) 키 관리.
+
+패스프레이즈 -> 키 변환(RFC 3414 A.2, 1MB 해시)은 장비당 수 ms~수십 ms가 드는 작업이라
+폴링마다 다시 하면 v3 장비 수에 비례해 CPU가 늘어납니다. 여기서는
+- 마스터 키: (프로토콜, 패스프레이즈) 별로 한 번만 계산 (같은 계정을 쓰는 장비 전체가 공유)
+- 로컬라이즈 키: (engineID, user) 별로 한 번만 계산 (해시 1회, 계정 정보가 바뀌면 다시 계산)
+- 장비 engineID: (host, port) 별로 discovery 1회 후 캐시 (인증 오류가 나면 버리고 다시 확인)
+을 캐시해, pysnmp에는 이미 로컬라이즈된 키(usmKeyTypeLocalized)를 넘깁니다.
+"""
+import asyncio
+import random
+import threading
+from typing import Dict, NamedTuple, Optional, Tuple
+
+from pysnmp.hlapi import (
+    usmNoAuthProtocol, usmHMACMD5AuthProtocol, usmHMACSHAAuthProtocol,
+    usmHMAC128SHA224AuthProtocol, usmHMAC192SHA256AuthProtocol,
+    usmHMAC256SHA384AuthProtocol, usmHMAC384SHA512AuthProtocol,
+    usmNoPrivProtocol, usmDESPrivProtocol, usm3DESEDEPrivProtocol,
+    usmAesCfb128Protocol, usmAesCfb192Protocol, usmAesCfb256Protocol,
+)
+from pyasn1.codec.ber import decoder, encoder
+from pyasn1.error import PyAsn1Error
+from pysnmp.proto.api import v2c
+from pysnmp.proto.mpmod.rfc3412 import SNMPv3Message
+from pysnmp.proto.rfc1902 import OctetString
+from pysnmp.proto.secmod.rfc3414.service import SnmpUSMSecurityModel, UsmSecurityParameters
+
+# Device.snmp_v3_auth_protocol / snmp_v3_priv_protocol 값 -> pysnmp 프로토콜 OID
+AUTH_PROTOCOLS = {
+    "none": usmNoAuthProtocol,
+    "md5": usmHMACMD5AuthProtocol,
+    "sha": usmHMACSHAAuthProtocol,
+    "sha224": usmHMAC128SHA224AuthProtocol,
+    "sha256": usmHMAC192SHA256AuthProtocol,
+    "sha384": usmHMAC256SHA384AuthProtocol,
+    "sha512": usmHMAC384SHA512AuthProtocol,
+}
+PRIV_PROTOCOLS = {
+    "none": usmNoPrivProtocol,
+    "des": usmDESPrivProtocol,
+    "3des": usm3DESEDEPrivProtocol,
+    "aes": usmAesCfb128Protocol,
+    "aes192": usmAesCfb192Protocol,
+    "aes256": usmAesCfb256Protocol,
+}
+
+# engineID discovery 요청 헤더 (msgSecurityModel=USM, reportable 플래그)
+USM_SECURITY_MODEL = 3
+V3_MAX_MESSAGE_SIZE = 65507
+V3_FLAG_REPORTABLE = b"\x04"
+
+
+class UsmCredentials(NamedTuple):
+    user: str
+    auth_protocol: str = "sha"
+    auth_key: Optional[str] = None
+    priv_protocol: str = "aes"
+    priv_key: Optional[str] = None
+
+    @property
+    def auth_oid(self):
+        return AUTH_PROTOCOLS[self.auth_protocol.lower()] if self.auth_key else usmNoAuthProtocol
+
+    @property
+    def priv_oid(self):
+        return PRIV_PROTOCOLS[self.priv_protocol.lower()] if self.auth_key and self.priv_key else usmNoPrivProtocol
+
+
+def encode_discovery(msg_id: int) -> bytes:
+    """
+    engineID discovery 요청 (RFC 3414 4.): noAuthNoPriv, 빈 engineID/user의 GET.
+    에이전트는 Report(usmStatsUnknownEngineIDs)에 자신의 authoritative engineID/boots/time을 담아 응답합니다.
+    """
+    pdu = v2c.GetRequestPDU()
+    v2c.apiPDU.setDefaults(pdu)
+    v2c.apiPDU.setRequestID(pdu, msg_id)
+
+    params = UsmSecurityParameters()
+    params["msgAuthoritativeEngineId"] = b""
+    params["msgAuthoritativeEngineBoots"] = 0
+    params["msgAuthoritativeEngineTime"] = 0
+    params["msgUserName"] = b""
+    params["msgAuthenticationParameters"] = b""
+    params["msgPrivacyParameters"] = b""
+
+    message = SNMPv3Message()
+    message["msgVersion"] = 3
+    header = message["msgGlobalData"]
+    header["msgID"] = msg_id
+    header["msgMaxSize"] = V3_MAX_MESSAGE_SIZE
+    header["msgFlags"] = V3_FLAG_REPORTABLE
+    header["msgSecurityModel"] = USM_SECURITY_MODEL
+    message["msgSecurityParameters"] = encoder.encode(params)
+    scoped_pdu = message["msgData"]["plaintext"]
+    scoped_pdu["contextEngineId"] = b""
+    scoped_pdu["contextName"] = b""
+    scoped_pdu["data"].setComponentByType(pdu.tagSet, pdu)
+    return encoder.encode(message)
+
+
+def decode_engine_id(data: bytes) -> Tuple[int, bytes]:
+    """v3 응답(Report) -> (msgID, authoritative engineID). v3가 아니거나 잘못된 패킷은 PyAsn1Error"""
+    message, _ = decoder.decode(data, asn1Spec=SNMPv3Message())
+    params, _ = decoder.decode(bytes(message["msgSecurityParameters"]), asn1Spec=UsmSecurityParameters())
+    return int(message["msgGlobalData"]["msgID"]), bytes(params["msgAuthoritativeEngineId"])
+
+
+class _DiscoveryProtocol(asyncio.DatagramProtocol):
+    def __init__(self):
+        self.replies: asyncio.Queue = asyncio.Queue()
+
+    def datagram_received(self, data, addr):
+        self.replies.put_nowait(data)
+
+
+class UsmKeyCache:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._master: Dict[Tuple, OctetString] = {}
+        # (engineID, user) -> (계정 정보, (auth 로컬 키, priv 로컬 키))
+        self._localized: Dict[Tuple[bytes, str], Tuple[UsmCredentials, Tuple]] = {}
+        self._engine_ids: Dict[Tuple[str, int], bytes] = {}
+        self.stats = {"master": 0, "localized": 0, "discovered": 0}
+
+    def _master_key(self, kind: str, auth_oid, priv_oid, passphrase: str) -> OctetString:
+        key = (kind, auth_oid, priv_oid, passphrase)
+        master = self._master.get(key)
+        if master is None:
+            if kind == "auth":
+                master = SnmpUSMSecurityModel.authServices[auth_oid].hashPassphrase(passphrase.encode())
+            else:
+                master = SnmpUSMSecurityModel.privServices[priv_oid].hashPassphrase(auth_oid, passphrase.encode())
+            with self._lock:
+                self._master[key] = master
+                self.stats["master"] += 1
+        return master
+
+    def localized_keys(self, engine_id: bytes, creds: UsmCredentials) -> Tuple[Optional[OctetString], Optional[OctetString]]:
+        """(auth 로컬 키, priv 로컬 키). (engineID, user) 캐시가 있고 계정 정보가 같으면 그대로 반환"""
+        cached = self._localized.get((engine_id, creds.user))
+        if cached is not None and cached[0] == creds:
+            return cached[1]
+
+        auth_oid, priv_oid = creds.auth_oid, creds.priv_oid
+        snmp_engine_id = OctetString(engine_id)
+        auth_key = priv_key = None
+        if auth_oid != usmNoAuthProtocol:
+            master = self._master_key("auth", auth_oid, None, creds.auth_key)
+            auth_key = SnmpUSMSecurityModel.authServices[auth_oid].localizeKey(master, snmp_engine_id)
+        if priv_oid != usmNoPrivProtocol:
+            master = self._master_key("priv", auth_oid, priv_oid, creds.priv_key)
+            priv_key = SnmpUSMSecurityModel.privServices[priv_oid].localizeKey(auth_oid, master, snmp_engine_id)
+
+        with self._lock:
+            self._localized[(engine_id, creds.user)] = (creds, (auth_key, priv_key))
+            self.stats["localized"] += 1
+        return auth_key, priv_key
+
+    def engine_id(self, host: str, port: int = 161) -> Optional[bytes]:
+        return self._engine_ids.get((host, port))
+
+    def forget_engine_id(self, host: str, port: int = 161):
+        """장비 교체/재설정으로 engineID가 바뀌었을 수 있을 때 (다음 요청에서 다시 discovery)"""
+        with self._lock:
+            self._engine_ids.pop((host, port), None)
+
+    async def discover_engine_id(self, host: str, port: int = 161, timeout: float = 1.0,
+                                 retries: int = 1) -> Optional[bytes]:
+        """
+        장비의 authoritative engineID (캐시 우선). 인증 없는 빈 GET을 보내고 Report에서 꺼냅니다.
+        응답이 없으면 None (오프라인)
+        """
+        cached = self._engine_ids.get((host, port))
+        if cached is not None:
+            return cached
+
+        loop = asyncio.get_running_loop()
+        transport, protocol = await loop.create_datagram_endpoint(_DiscoveryProtocol, remote_addr=(host, port))
+        try:
+            for _ in range(retries + 1):
+                msg_id = random.randint(1, 2 ** 31 - 1)
+                transport.sendto(encode_discovery(msg_id))
+                deadline = loop.time() + timeout
+                while (remaining := deadline - loop.time()) > 0:
+                    try:
+                        data = await asyncio.wait_for(protocol.replies.get(), remaining)
+                        reply_id, engine_id = decode_engine_id(data)
+                    except asyncio.TimeoutError:
+                        break
+                    except PyAsn1Error:
+                        continue
+                    if reply_id == msg_id and engine_id:
+                        with self._lock:
+                            self._engine_ids[(host, port)] = engine_id
+                            self.stats["discovered"] += 1
+                        return engine_id
+        finally:
+            transport.close()
+        return None
+
+
+# 프로세스 전역 키 캐시
+usm_keys = UsmKeyCache()
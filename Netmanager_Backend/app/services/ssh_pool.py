@@ -0,0 +1,221 @@
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, Optional, Tuple, TypeVar
+
+from app.services.ssh_service import DeviceConnection, DeviceInfo
+
+# 사용이 끝난 세션을 재사용하려고 열어 두는 최대 시간 (장비 vty exec-timeout보다 짧게)
+SSH_POOL_IDLE_TIMEOUT = float(os.getenv("SSH_POOL_IDLE_TIMEOUT", "300"))
+# 장비당 동시에 열어 둘 수 있는 최대 세션 수 (vty 라인 고갈 방지)
+SSH_POOL_MAX_PER_DEVICE = int(os.getenv("SSH_POOL_MAX_PER_DEVICE", "2"))
+# 이 시간 이상 놀던 세션은 꺼낼 때 살아 있는지 확인
+SSH_POOL_HEALTH_CHECK_AFTER = 30.0
+# 장비 세션이 모두 사용 중일 때 기다리는 최대 시간
+SSH_POOL_ACQUIRE_TIMEOUT = 120.0
+
+T = TypeVar("T")
+PoolKey = Tuple
+
+
+class PooledSession:
+    __slots__ = ("key", "connection", "created_at", "last_used", "uses")
+
+    def __init__(self, key: PoolKey, connection: DeviceConnection):
+        self.key = key
+        self.connection = connection
+        self.created_at = self.last_used = time.monotonic()
+        self.uses = 0
+
+
+class SshSessionPool:
+    """
+    워커 프로세스 단위 SSH(netmiko) 세션 풀.
+    connect()(SSH 핸드셰이크 + enable + terminal length 0)가 끝난 세션을 장비별로 보관했다가
+    같은 장비에 대한 다음 작업에서 그대로 재사용합니다.
+    - 장비당 최대 세션 수 제한 (초과 요청은 반납될 때까지 대기)
+    - idle timeout 지난 세션은 정리 (백그라운드 정리 스레드 + 꺼낼 때)
+    - 오래 놀던 세션은 꺼낼 때 is_alive()로 확인, 죽었으면 새로 연결
+    - run(): 재사용한 세션에서 작업이 실패하면 새 세션으로 한 번 다시 시도 (끊긴 세션 투명 재연결)
+    Celery prefork 자식 프로세스는 pid가 바뀌면 부모에게서 복사된 세션을 쓰지 않고 새로 시작합니다.
+    """
+
+    def __init__(self, max_per_device: int = SSH_POOL_MAX_PER_DEVICE, idle_timeout: float = SSH_POOL_IDLE_TIMEOUT,
+                 health_check_after: float = SSH_POOL_HEALTH_CHECK_AFTER,
+                 connection_factory: Callable[[DeviceInfo], DeviceConnection] = DeviceConnection):
+        self.max_per_device = max_per_device
+        self.idle_timeout = idle_timeout
+        self.health_check_after = health_check_after
+        self.connection_factory = connection_factory
+        self._cond = threading.Condition()
+        self._idle: Dict[PoolKey, List[PooledSession]] = {}
+        self._open: Dict[PoolKey, int] = {}  # 장비별 열린 세션 수 (idle + 사용 중 + 연결 중)
+        self._reaper: Optional[threading.Thread] = None
+        self._pid: Optional[int] = None
+        self.stats = {"created": 0, "reused": 0, "reconnected": 0, "expired": 0}
+
+    @staticmethod
+    def key(info: DeviceInfo) -> PoolKey:
+        # 계정/enable 정보가 바뀌면 다른 세션으로 취급 (바뀌기 전 세션은 idle timeout으로 정리)
+        return (info.host, info.port, info.device_type, info.username, info.password, info.enable_password)
+
+    def _ensure_process(self):
+        if self._pid == os.getpid():
+            return
+        with self._cond:
+            if self._pid != os.getpid():
+                self._idle, self._open = {}, {}
+                self._pid = os.getpid()
+                self._reaper = threading.Thread(target=self._reap_loop, name="ssh-pool-reaper", daemon=True)
+                self._reaper.start()
+
+    def _reap_loop(self):
+        while True:
+            time.sleep(max(1.0, min(self.idle_timeout / 2, 30.0)))
+            self._close(self._expired())
+
+    def _expired(self) -> List[PooledSession]:
+        """idle timeout 지난 세션을 풀에서 빼서 반환 (연결 종료는 lock 밖에서)"""
+        now = time.monotonic()
+        expired = []
+        with self._cond:
+            for key, sessions in list(self._idle.items()):
+                keep = [s for s in sessions if now - s.last_used < self.idle_timeout]
+                for session in sessions:
+                    if session not in keep:
+                        expired.append(session)
+                        self._open[key] -= 1
+                self._idle[key] = keep
+            if expired:
+                self.stats["expired"] += len(expired)
+                self._cond.notify_all()
+        return expired
+
+    @staticmethod
+    def _close(sessions: List[PooledSession]):
+        for session in sessions:
+            session.connection.disconnect()
+
+    def _discard(self, session: PooledSession):
+        session.connection.disconnect()
+        with self._cond:
+            self._open[session.key] -= 1
+            self._cond.notify_all()
+
+    def acquire(self, info: DeviceInfo, timeout: float = SSH_POOL_ACQUIRE_TIMEOUT) -> PooledSession:
+        """장비 세션 하나를 꺼냅니다 (idle 세션 재사용, 없으면 새로 연결). 연결 실패 시 ConnectionError"""
+        self._ensure_process()
+        self._close(self._expired())
+        key = self.key(info)
+        deadline = time.monotonic() + timeout
+
+        while True:
+            session = None
+            with self._cond:
+                while True:
+                    idle = self._idle.get(key)
+                    if idle:
+                        session = idle.pop()  # 가장 최근에 쓴 세션부터 (살아 있을 가능성이 높음)
+                        break
+                    if self._open.get(key, 0) < self.max_per_device:
+                        self._open[key] = self._open.get(key, 0) + 1
+                        break
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise TimeoutError(f"{info.host}: all {self.max_per_device} SSH sessions are busy")
+                    self._cond.wait(remaining)
+
+            if session is None:
+                return self._connect(key, info)
+            if time.monotonic() - session.last_used >= self.health_check_after and not session.connection.is_alive():
+                self._discard(session)  # 장비가 끊은 세션 -> 버리고 다시 시도
+                continue
+            with self._cond:
+                self.stats["reused"] += 1
+            return session
+
+    def _connect(self, key: PoolKey, info: DeviceInfo) -> PooledSession:
+        connection = self.connection_factory(info)
+        try:
+            connected = connection.connect()
+        except Exception as e:
+            connected, connection.last_error = False, str(e)
+        if not connected:
+            with self._cond:
+                self._open[key] -= 1
+                self._cond.notify_all()
+            raise ConnectionError(connection.last_error or f"{info.host}: connection failed")
+        with self._cond:
+            self.stats["created"] += 1
+        return PooledSession(key, connection)
+
+    def release(self, session: PooledSession, reusable: bool = True):
+        """세션 반납. 작업 중 오류가 난 세션(상태를 알 수 없음)은 reusable=False로 닫습니다."""
+        if not reusable or not session.connection.is_connected():
+            self._discard(session)
+            return
+        session.last_used = time.monotonic()
+        session.uses += 1
+        with self._cond:
+            self._idle.setdefault(session.key, []).append(session)
+            self._cond.notify_all()
+
+    @contextmanager
+    def session(self, info: DeviceInfo) -> Iterator[DeviceConnection]:
+        """with ssh_pool.session(info) as connection: ... (예외가 나면 세션은 재사용하지 않음)"""
+        pooled = self.acquire(info)
+        reusable = False
+        try:
+            yield pooled.connection
+            reusable = True
+        finally:
+            self.release(pooled, reusable)
+
+    def run(self, info: DeviceInfo, operation: Callable[[DeviceConnection], T], retry: bool = True) -> T:
+        """
+        operation(connection)을 풀 세션에서 실행합니다. 재사용한 세션에서 실패하면
+        (장비 쪽에서 세션을 끊은 경우 등) 그 세션을 버리고 새로 연결해 한 번 더 실행합니다.
+        다시 실행하면 안 되는 작업(설정 배포 등)은 retry=False
+        """
+        pooled = self.acquire(info)
+        try:
+            result = operation(pooled.connection)
+        except Exception:
+            reused = pooled.uses > 0
+            self.release(pooled, reusable=False)
+            if not (retry and reused):
+                raise
+            with self._cond:
+                self.stats["reconnected"] += 1
+            pooled = self.acquire(info)
+            try:
+                result = operation(pooled.connection)
+            except Exception:
+                self.release(pooled, reusable=False)
+                raise
+        self.release(pooled)
+        return result
+
+    def close_all(self):
+        """풀에 있는 idle 세션을 모두 닫습니다 (워커 종료 시)"""
+        with self._cond:
+            sessions = [s for idle in self._idle.values() for s in idle]
+            for session in sessions:
+                self._open[session.key] -= 1
+            self._idle = {}
+            self._cond.notify_all()
+        self._close(sessions)
+
+    def snapshot(self) -> Dict:
+        with self._cond:
+            return {
+                "open": sum(self._open.values()),
+                "idle": sum(len(v) for v in self._idle.values()),
+                "devices": len([k for k, v in self._open.items() if v]),
+                **self.stats,
+            }
+
+
+# 워커 프로세스 전역 풀
+ssh_pool = SshSessionPool()
@@ -1,6 +1,7 @@
 import os
 import json
 import re
+import time
 import logging
 import traceback
 from datetime import datetime
@@ -8,6 +9,11 @@ from typing import Dict, List, Optional, Any
 from dataclasses import dataclass
 from enum import Enum
 
+from app.services.cli_prompt import (
+    FALLBACK_DELAY_FACTOR, paging_command, prompt_regex, response_times,
+)
+from app.services.blob_files import read_blob_file, write_blob_file
+
 # 로깅 설정 (상세 디버깅)
 logging.basicConfig(level=logging.DEBUG, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
@@ -15,12 +21,17 @@ logger = logging.getLogger(__name__)
 # 라이브러리 로드 시도
 try:
     from netmiko import ConnectHandler
+    from netmiko.exceptions import ReadTimeout
 
     NETMIKO_AVAILABLE = True
 except ImportError as e:
     NETMIKO_AVAILABLE = False
+    ReadTimeout = TimeoutError
     logger.error(f"Error importing netmiko: {e}")
 
+# 프롬프트 기반 완료 판단 사용 여부 (0이면 예전처럼 global_delay_factor 2 고정 지연)
+SSH_PROMPT_DETECTION = os.getenv("SSH_PROMPT_DETECTION", "1") != "0"
+
 
 class ConnectionStatus(Enum):
     DISCONNECTED = "disconnected"
@@ -62,12 +73,33 @@ class BackupInfo:
     timestamp: str
     config: str
     file_path: str
+    sha256: Optional[str] = None
 
     def save(self):
+        """
+        설정 본문은 백업 폴더의 objects/ 아래에 내용 해시로 한 번만 압축 저장하고,
+        백업 파일(.ref)에는 해시만 기록합니다 (같은 설정을 반복 백업해도 본문은 하나).
+        """
+        self.sha256 = write_blob_file(self._objects_dir(self.file_path), self.config)
+        self.file_path = os.path.splitext(self.file_path)[0] + ".ref"
         os.makedirs(os.path.dirname(self.file_path), exist_ok=True)
         with open(self.file_path, 'w', encoding='utf-8') as f:
-            f.write(self.config)
-        logger.info(f"Backup saved: {self.file_path}")
+            f.write(self.sha256 + "\n")
+        logger.info(f"Backup saved: {self.file_path} ({self.sha256[:12]})")
+
+    @staticmethod
+    def _objects_dir(file_path: str) -> str:
+        # backups/<장비>/<파일> -> backups/objects
+        return os.path.join(os.path.dirname(os.path.dirname(file_path)), "objects")
+
+    @staticmethod
+    def load(file_path: str) -> str:
+        """save()로 만든 .ref 파일의 설정 본문 (이전 방식 .cfg 파일은 그대로 읽음)"""
+        with open(file_path, 'r', encoding='utf-8') as f:
+            content = f.read()
+        if not file_path.endswith(".ref"):
+            return content
+        return read_blob_file(BackupInfo._objects_dir(file_path), content.strip())
 
 
 class DeviceConnection:
@@ -77,6 +109,7 @@ class DeviceConnection:
         self.status = ConnectionStatus.DISCONNECTED
         self.last_error = None
         self.backup_dir = os.path.expanduser("~/.cisco_config_manager/backups")
+        self.expect_string: Optional[str] = None  # 장비 프롬프트 정규식 (None이면 고정 지연 방식)
 
     def connect(self) -> bool:
         if not NETMIKO_AVAILABLE:
@@ -93,8 +126,9 @@ class DeviceConnection:
                 'password': self.device_info.password,
                 'port': self.device_info.port,
                 'timeout': self.device_info.timeout,
-                'global_delay_factor': 2
             }
+            if not SSH_PROMPT_DETECTION:
+                device_dict['global_delay_factor'] = FALLBACK_DELAY_FACTOR
             if self.device_info.enable_password:
                 device_dict['secret'] = self.device_info.enable_password
 
@@ -103,8 +137,15 @@ class DeviceConnection:
             if self.device_info.enable_password:
                 self.connection.enable()
 
-            # [필수] 페이징 비활성화 (전체 출력 받기 위함)
-            self.connection.send_command("terminal length 0")
+            # 명령 완료 = 장비 프롬프트 (netmiko가 찾은 호스트명, 못 찾으면 고정 지연 방식)
+            base = self.connection.base_prompt if SSH_PROMPT_DETECTION else None
+            if base:
+                self.expect_string = prompt_regex(self.device_info.device_type, base)
+            else:
+                self._use_fixed_delay()
+
+            # [필수] 페이징 비활성화 (전체 출력 받기 위함, ASA는 terminal pager 0)
+            self._send(paging_command(self.device_info.device_type))
 
             self.status = ConnectionStatus.CONNECTED
             return True
@@ -127,11 +168,49 @@ class DeviceConnection:
     def is_connected(self) -> bool:
         return self.status == ConnectionStatus.CONNECTED and self.connection is not None
 
-    def send_command(self, command: str) -> str:
+    def is_alive(self) -> bool:
+        """연결된 세션의 transport가 아직 살아 있는지 (풀에서 오래 놀던 세션 확인용)"""
+        if not self.is_connected():
+            return False
+        try:
+            return self.connection.is_alive()
+        except Exception:
+            return False
+
+    def _use_fixed_delay(self):
+        """프롬프트 인식을 포기하고 예전 방식(netmiko 자체 프롬프트 탐색 + global_delay_factor 2)으로 전환"""
+        self.expect_string = None
+        self.connection.global_delay_factor = FALLBACK_DELAY_FACTOR
+
+    def _send(self, command: str, read_timeout: Optional[float] = None) -> str:
+        """
+        프롬프트가 나올 때까지만 읽고 바로 반환합니다. 대기 상한은 이 장비/명령의 학습된 응답 시간.
+        그 안에 프롬프트를 못 찾으면 이 세션은 고정 지연 방식으로 바꿔 프롬프트를 다시 확인하고 한 번 더 실행합니다.
+        """
+        host = self.device_info.host
+        timeout = read_timeout or response_times.timeout(host, command, default=self.device_info.timeout)
+        if self.expect_string is None:
+            return self.connection.send_command(command, read_timeout=max(timeout, self.device_info.timeout),
+                                                use_textfsm=False)
+        start = time.monotonic()
+        try:
+            output = self.connection.send_command(command, expect_string=self.expect_string,
+                                                  read_timeout=timeout, use_textfsm=False)
+        except ReadTimeout:
+            response_times.record_fallback(host, command)
+            self._use_fixed_delay()
+            self.connection.clear_buffer()
+            self.connection.set_base_prompt()  # 호스트명이 바뀐 경우 (출력에서 프롬프트 제거에 사용)
+            return self.connection.send_command(command, read_timeout=max(timeout, self.device_info.timeout),
+                                                use_textfsm=False)
+        response_times.observe(host, command, time.monotonic() - start)
+        return output
+
+    def send_command(self, command: str, read_timeout: Optional[float] = None) -> str:
         if not self.is_connected(): raise ConnectionError("Not connected")
         try:
             self.status = ConnectionStatus.BUSY
-            output = self.connection.send_command(command, use_textfsm=False)
+            output = self._send(command, read_timeout)
             self.status = ConnectionStatus.CONNECTED
             return output
         except Exception as e:
@@ -142,7 +221,13 @@ class DeviceConnection:
         if not self.is_connected(): raise ConnectionError("Not connected")
         try:
             self.status = ConnectionStatus.BUSY
-            output = self.connection.send_config_set(commands)
+            # send_config_set의 read_timeout은 줄마다 적용되므로 줄당 평균 응답 시간으로 학습
+            host = self.device_info.host
+            start = time.monotonic()
+            output = self.connection.send_config_set(
+                commands, read_timeout=response_times.timeout(host, "configure", default=self.device_info.timeout),
+            )
+            response_times.observe(host, "configure", (time.monotonic() - start) / (len(commands) + 2))
             self.status = ConnectionStatus.CONNECTED
             return output
         except Exception as e:
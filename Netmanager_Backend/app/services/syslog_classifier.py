@@ -0,0 +1,91 @@
+import re
+from datetime import datetime
+from typing import Dict, NamedTuple, Optional
+
+# RFC5424 severity 코드(0~7) 이름
+SEVERITY_NAMES = ("EMERG", "ALERT", "CRIT", "ERR", "WARNING", "NOTICE", "INFO", "DEBUG")
+
+# severity 코드 -> EventLog.severity (CRITICAL / WARNING / INFO)
+SEVERITY_LEVELS = ("CRITICAL", "CRITICAL", "CRITICAL", "CRITICAL", "WARNING", "WARNING", "INFO", "INFO")
+
+# 메시지마다 int() 변환을 하지 않도록 미리 만들어 둔 조회 테이블
+_PRI_TABLE = {str(pri): (pri >> 3, pri & 7) for pri in range(192)}   # "<189>" -> (facility 23, severity 5)
+_SEV_TABLE = {str(code): code for code in range(8)}                   # Cisco SEV 숫자
+
+# Cisco 이벤트 코드: FACILITY-SEVERITY-MNEMONIC (예: LINK-3-UPDOWN, PLATFORM_ENV-2-FAN_FAIL, ASA-6-302013)
+_CISCO_EVENT = r'[A-Z][A-Z0-9_]*(?:-[A-Z][A-Z0-9_]*)*-([0-7])-[A-Z0-9_]+'
+
+# 한 번의 anchored match로 전체 헤더를 해석하는 패턴
+#   1) <PRI> (선택)
+#   2) RFC5424 "1 TIMESTAMP HOST APP PROCID MSGID SD" 또는 RFC3164 "Mmm dd hh:mm:ss HOST" (선택)
+#   3) Cisco 시퀀스/타임스탬프를 건너뛰고 %FAC-SEV-MNEMONIC: (선택)
+# 예: <187>12345: *Dec 20 11:30:09.491: %LINK-3-UPDOWN: Interface GigabitEthernet1/0/3, changed state to down
+_SYSLOG_PATTERN = re.compile(
+    r'(?:<(\d{1,3})>'
+    r'(?:1 (\S+) (\S+) (\S+) \S+ \S+ (?:-|(?:\[[^\]]*\])+) ?'
+    r'|([A-Z][a-z]{2} [ \d]\d \d\d:\d\d:\d\d) ([^\s:]+):? )?)?'
+    r'()'
+    r'(?:[^%]*%(?!' + _CISCO_EVENT.replace('([0-7])', '[0-7]') + r':))*[^%]*'
+    r'(?:%(' + _CISCO_EVENT + r'):\s*)?'
+)
+
+# [키워드 규칙] PRI도 Cisco severity도 없을 때만 사용. 위에서부터 먼저 매칭되는 규칙 적용
+KEYWORD_RULES = (
+    ("CRITICAL", ("EMERG", "ALERT", "CRIT", "ERR", "DOWN", "FAIL")),
+    ("WARNING", ("WARNING", "UPDOWN", "NOTICE")),
+)
+_KEYWORD_TABLE = tuple(
+    (re.compile("|".join(re.escape(k) for k in keywords)), level) for level, keywords in KEYWORD_RULES
+)
+
+
+class SyslogMessage(NamedTuple):
+    severity: str                     # CRITICAL / WARNING / INFO
+    event_id: str                     # LINK-3-UPDOWN, UNKNOWN ...
+    message: str
+    severity_code: Optional[int] = None   # 0~7 (PRI 또는 Cisco SEV)
+    facility: Optional[int] = None        # PRI facility (0~23)
+    hostname: Optional[str] = None
+    app_name: Optional[str] = None
+    device_timestamp: Optional[str] = None  # 장비가 찍은 시간 (형식이 제각각이라 원문 유지)
+
+    def to_row(self, source_ip: str, received_at: Optional[datetime] = None) -> Dict:
+        """EventLog 행(dict)으로 변환"""
+        return {
+            "timestamp": received_at or datetime.utcnow(),
+            "severity": self.severity,
+            "source": source_ip,
+            "event_id": self.event_id,
+            "message": self.message,
+        }
+
+
+def classify(raw_log: str) -> SyslogMessage:
+    """
+    Syslog 한 줄을 컴파일된 패턴 한 번(single pass)으로 분류합니다.
+    severity 우선순위: Cisco SEV > PRI severity > 키워드 규칙
+    """
+    raw_log = raw_log.strip()
+    match = _SYSLOG_PATTERN.match(raw_log)  # 모든 그룹이 선택이므로 항상 매칭됨
+    pri, ts5424, host5424, app_name, ts3164, host3164, _, event_id, sev = match.groups()
+
+    facility, severity_code = _PRI_TABLE.get(pri, (None, None))
+
+    if event_id is not None:
+        severity_code = _SEV_TABLE[sev]
+        message = raw_log[match.end():]
+    else:
+        event_id = "UNKNOWN"
+        message = raw_log[match.end(7):]
+
+    if severity_code is not None:
+        severity = SEVERITY_LEVELS[severity_code]
+    else:
+        severity = "INFO"
+        for pattern, level in _KEYWORD_TABLE:
+            if pattern.search(raw_log):
+                severity = level
+                break
+
+    return SyslogMessage(severity, event_id, message, severity_code, facility,
+                         host5424 or host3164, app_name, ts5424 or ts3164)
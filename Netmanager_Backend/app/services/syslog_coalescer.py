@@ -0,0 +1,92 @@
+import re
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+# 스톰 억제 설정
+SYSLOG_COALESCE_WINDOW = 10.0     # 같은 이벤트가 이 시간(초) 안에 다시 오면 먼저 저장된 행에 합침 (sliding)
+SYSLOG_COALESCE_MAX_HOLD = 60.0   # 계속 반복되더라도 첫 발생 후 이 시간(초)이 지나면 새 행으로 시작
+SYSLOG_COALESCE_MAX_KEYS = 50000  # 메모리에서 추적하는 이벤트 종류 상한 (초과 시 가장 오래된 것부터 추적 종료)
+
+# 메시지 정규화 규칙 (pattern, 치환 문자열). 기본은 공백 정리만 수행
+# 인터페이스 이름 등은 구분되어야 하므로 숫자를 일괄 마스킹하지 않음
+NORMALIZE_RULES = (
+    (re.compile(r'\s+'), ' '),
+)
+
+
+def normalize_message(message: str) -> str:
+    for pattern, repl in NORMALIZE_RULES:
+        message = pattern.sub(repl, message)
+    return message.strip().lower()
+
+
+class SyslogCoalescer:
+    """
+    (source, event_id, 정규화된 message) 기준으로 반복 이벤트를 합칩니다.
+    - 첫 발생은 바로 저장 대상으로 반환 (조회 API에 지연 없이 보임)
+    - 이후 window 안에 다시 오면 새 행 대신 그 행의 repeat_count / last_seen만 늘리고,
+      drain()이 아직 DB에 반영하지 않은 행들을 갱신 대상으로 반환
+    - 끊임없이 반복되는 경우에도 max_hold 마다 새 행을 시작해 한 행의 구간이 무한히 늘어나지 않음
+    entries는 last_seen 순서로 유지되므로 drain()은 앞에서부터 조용해진 것만 추적을 끝내면 됩니다.
+    반환하는 행 dict는 추적 중인 객체 그대로이므로, 저장 후 채워진 id로 갱신 대상 행을 찾습니다.
+    """
+
+    def __init__(self, window: float = SYSLOG_COALESCE_WINDOW, max_hold: float = SYSLOG_COALESCE_MAX_HOLD,
+                 max_keys: int = SYSLOG_COALESCE_MAX_KEYS):
+        self.window = timedelta(seconds=window)
+        self.max_hold = timedelta(seconds=max_hold)
+        self.max_keys = max_keys
+        self._entries: "OrderedDict[Tuple, Dict]" = OrderedDict()
+        self._dirty: Dict[int, Dict] = {}  # 반복이 늘었지만 아직 DB에 반영하지 않은 행 (id(entry) -> entry)
+        self.coalesced = 0  # 다른 행에 합쳐져서 새 행을 만들지 않은 건수
+
+    def __len__(self):
+        return len(self._entries)
+
+    @property
+    def pending(self) -> int:
+        return len(self._dirty)
+
+    def add(self, row: Dict) -> List[Dict]:
+        """행을 추가하고, 새로 저장해야 하는 행 목록(첫 발생이면 1행, 반복이면 빈 목록)을 반환합니다."""
+        ts = row["timestamp"]
+        key = (row["source"], row["event_id"], normalize_message(row["message"]))
+
+        entry = self._entries.get(key)
+        if entry is not None and ts - entry["last_seen"] <= self.window and ts - entry["first_seen"] < self.max_hold:
+            entry["repeat_count"] += 1
+            entry["last_seen"] = ts
+            self._entries.move_to_end(key)
+            self._dirty[id(entry)] = entry
+            self.coalesced += 1
+            return []
+
+        entry = dict(row)
+        entry["repeat_count"] = 1
+        entry["first_seen"] = entry["last_seen"] = ts
+        self._entries.pop(key, None)
+        self._entries[key] = entry
+
+        while len(self._entries) > self.max_keys:
+            self._entries.popitem(last=False)
+        return [entry]
+
+    def drain(self, now: Optional[datetime] = None, force: bool = False) -> List[Dict]:
+        """
+        DB에 반영할 반복 갱신 행(repeat_count / last_seen이 바뀐 행)을 반환하고,
+        window 동안 조용했던 이벤트(또는 force면 전부)는 추적을 끝냅니다.
+        """
+        updates = list(self._dirty.values())
+        self._dirty.clear()
+        if force:
+            self._entries.clear()
+            return updates
+
+        now = now or datetime.utcnow()
+        while self._entries:
+            key, entry = next(iter(self._entries.items()))
+            if now - entry["last_seen"] <= self.window:
+                break
+            del self._entries[key]
+        return updates
@@ -1,49 +1,273 @@
+import os
 import socket
-import re
-from app.models.log import EventLog
-from app.db.session import SessionLocal
+import queue
+import threading
+import time
+import multiprocessing
+from typing import Dict, List, Optional, Tuple
+from app.services.syslog_classifier import classify
+from app.services.syslog_coalescer import SyslogCoalescer
+from app.services.device_index import device_index
+from app.services.log_store import log_store
+from app.services.log_stream import log_broker
 from datetime import datetime
 
-def start_syslog_server(host="0.0.0.0", port=514):
+# 수신/저장 파이프라인 설정 (스톰 상황 기준으로 튜닝)
+SYSLOG_QUEUE_SIZE = 50000        # 수신 스레드와 저장 스레드 사이의 버퍼 (초과 시 드롭)
+SYSLOG_BATCH_SIZE = 500          # 한 번에 bulk insert 할 최대 행 수
+SYSLOG_FLUSH_INTERVAL = 0.2      # 배치가 덜 찼어도 이 시간(초)이 지나면 flush
+SYSLOG_RECV_BUFFER = 4 * 1024 * 1024  # 커널 소켓 수신 버퍼 (순간 버스트 흡수)
+
+# 멀티 프로세스 수신 모드 (SO_REUSEPORT, Linux/BSD 전용). 1이면 기존 단일 스레드 수신
+SYSLOG_WORKERS = int(os.getenv("SYSLOG_WORKERS", "1"))
+SYSLOG_WORKER_CHUNK = 200        # 워커 -> 부모 프로세스로 넘기는 행 묶음 크기 (IPC 횟수 절감)
+SYSLOG_WORKER_FLUSH = 0.05       # 묶음이 덜 찼어도 이 시간(초)이 지나면 전달
+
+
+def parse_log(raw_log: str, source_ip: str, received_at: Optional[datetime] = None) -> Dict:
+    """
+    Raw syslog 한 줄을 EventLog 행(dict)으로 변환합니다. (DB 접근 없음)
+    PRI / RFC3164 / RFC5424 / Cisco %FAC-SEV-MNEMONIC 해석은 syslog_classifier 참고
+    """
+    return classify(raw_log).to_row(source_ip, received_at)
+
+
+class SyslogPipeline:
+    """
+    수신(socket)과 저장(DB)을 분리한 syslog 파이프라인.
+    - 수신 스레드: recvfrom -> 파싱 -> bounded queue (가득 차면 드롭 후 카운트)
+    - 저장 스레드: queue -> 반복 이벤트 합치기(SyslogCoalescer) -> batch_size 또는 flush_interval 기준
+      일자별 파티션에 bulk insert (LogStore). 반복 이벤트는 첫 발생을 바로 저장하고
+      이후 같은 주기의 flush에서 그 행의 repeat_count / last_seen만 갱신
+    """
+
+    def __init__(self, queue_size: int = SYSLOG_QUEUE_SIZE, batch_size: int = SYSLOG_BATCH_SIZE,
+                 flush_interval: float = SYSLOG_FLUSH_INTERVAL, coalescer: Optional[SyslogCoalescer] = None):
+        self.queue: "queue.Queue[Tuple[Dict, bool]]" = queue.Queue(maxsize=queue_size)  # (행, 합치기 여부)
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.coalescer = coalescer if coalescer is not None else SyslogCoalescer()
+
+        self._lock = threading.Lock()
+        self._counters = {"received": 0, "dropped": 0, "flushed": 0, "updated": 0, "failed": 0, "batches": 0}
+        self._stop_event = threading.Event()
+        self._writer_thread: Optional[threading.Thread] = None
+
+    # --- 카운터 ---
+    def _incr(self, name: str, value: int = 1):
+        with self._lock:
+            self._counters[name] += value
+
+    def get_stats(self) -> Dict:
+        with self._lock:
+            stats = dict(self._counters)
+        stats["queued"] = self.queue.qsize()
+        stats["coalesced"] = self.coalescer.coalesced
+        stats["tracked_events"] = len(self.coalescer)
+        stats["pending_updates"] = self.coalescer.pending
+        stats["stream_subscribers"] = log_broker.subscriber_count
+        stats["queue_capacity"] = self.queue.maxsize
+        return stats
+
+    # --- 수신 측 ---
+    def submit_many(self, rows: List[Dict]) -> int:
+        """워커 프로세스가 넘긴 묶음을 대기열에 넣고 드롭된 건수를 반환"""
+        dropped = 0
+        for row in rows:
+            if not self.submit(row):
+                dropped += 1
+        return dropped
+
+    def submit(self, row: Dict, coalesce: bool = True) -> bool:
+        """
+        파싱된 행을 저장 대기열에 넣습니다. 대기열이 가득 차면 드롭하고 False 반환.
+        coalesce=False면 반복 이벤트 합치기 없이 그대로 한 행으로 저장 (SNMP 트랩 등 건별로 남겨야 하는 이벤트)
+        """
+        self._incr("received")
+        try:
+            self.queue.put_nowait((row, coalesce))
+            return True
+        except queue.Full:
+            self._incr("dropped")
+            return False
+
+    # --- 저장 측 ---
+    def start(self):
+        if self._writer_thread and self._writer_thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._writer_thread = threading.Thread(target=self._writer_loop, name="syslog-writer", daemon=True)
+        self._writer_thread.start()
+
+    def stop(self, timeout: float = 5.0):
+        """저장 스레드를 멈추고 남은 행을 모두 flush 합니다."""
+        self._stop_event.set()
+        if self._writer_thread:
+            self._writer_thread.join(timeout)
+
+    def _writer_loop(self):
+        batch: List[Dict] = []
+        coalescer = self.coalescer
+        deadline = time.monotonic() + self.flush_interval
+
+        def accept(item: Tuple[Dict, bool]) -> List[Dict]:
+            row, coalesce = item
+            # 송신지 IP -> device_id (메모리 인덱스 조회, DB 왕복 없음)
+            row["device_id"] = device_index.lookup(row["source"])
+            # 실시간 구독자에게는 합치기 전 원본 이벤트를 바로 전달 (느린 구독자는 자체 버퍼에서 드롭)
+            log_broker.publish(row)
+            if coalesce:
+                return coalescer.add(row)
+            row["repeat_count"] = 1
+            row["first_seen"] = row["last_seen"] = row["timestamp"]
+            return [row]
+
+        device_index.refresh_if_stale()
+        while not (self._stop_event.is_set() and self.queue.empty()):
+            timeout = max(0.0, deadline - time.monotonic())
+            try:
+                batch.extend(accept(self.queue.get(timeout=timeout)))
+                # 이미 쌓여 있는 것은 블로킹 없이 가져감. 합쳐진 반복은 batch를 늘리지 않으므로
+                # 꺼낸 건수로 제한해야 스톰 중에도 아래 flush 검사로 돌아옴
+                for _ in range(self.batch_size - 1):
+                    batch.extend(accept(self.queue.get_nowait()))
+            except queue.Empty:
+                pass
+
+            if len(batch) >= self.batch_size or time.monotonic() >= deadline:
+                device_index.refresh_if_stale()
+                self._flush(batch, coalescer.drain())
+                batch = []
+                deadline = time.monotonic() + self.flush_interval
+
+        self._flush(batch, coalescer.drain(force=True))
+
+    def _flush(self, rows: List[Dict], updates: List[Dict]):
+        # 새 행을 먼저 넣어 id를 받아 둠 (같은 주기에 반복이 붙은 행도 바로 갱신 가능)
+        if rows:
+            try:
+                log_store.insert_rows(rows, return_ids=True)
+                self._incr("flushed", len(rows))
+                self._incr("batches")
+            except Exception as e:
+                self._incr("failed", len(rows))
+                print(f"로그 저장 실패 ({len(rows)}건): {e}")
+        if updates:
+            try:
+                self._incr("updated", log_store.update_repeats(updates))
+            except Exception as e:
+                print(f"반복 이벤트 갱신 실패 ({len(updates)}건): {e}")
+
+
+# API 프로세스에서 통계를 조회할 수 있도록 실행 중인 파이프라인을 보관
+_pipeline: Optional[SyslogPipeline] = None
+
+
+def get_syslog_pipeline() -> SyslogPipeline:
+    global _pipeline
+    if _pipeline is None:
+        _pipeline = SyslogPipeline()
+    return _pipeline
+
+
+# 멀티 프로세스 모드일 때 워커별 수신/드롭 카운터 (워커 i: [2*i]=received, [2*i+1]=dropped)
+_worker_counters = None
+
+
+def get_syslog_stats() -> Dict:
+    stats = get_syslog_pipeline().get_stats()
+    if _worker_counters is not None:
+        counters = list(_worker_counters)
+        stats["workers"] = [
+            {"received": counters[i], "dropped": counters[i + 1]} for i in range(0, len(counters), 2)
+        ]
+    return stats
+
+
+def _open_socket(host: str, port: int, reuse_port: bool = False) -> socket.socket:
     sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    if reuse_port:
+        # 같은 포트에 바인딩한 소켓들 사이에서 커널이 송신지(4-tuple) 해시로 분배
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, SYSLOG_RECV_BUFFER)
     sock.bind((host, port))
+    return sock
+
+
+def _syslog_worker(index: int, host: str, port: int, out_queue, counters):
+    """
+    [워커 프로세스] recvfrom + 디코딩 + 파싱(CPU 작업)을 담당하고,
+    파싱된 행을 묶어서 부모 프로세스의 저장 단계로 넘깁니다.
+    """
+    sock = _open_socket(host, port, reuse_port=True)
+    sock.settimeout(SYSLOG_WORKER_FLUSH)
+    chunk: List[Dict] = []
+    deadline = 0.0
+
+    while True:
+        try:
+            data, addr = sock.recvfrom(4096)
+            if not chunk:
+                deadline = time.monotonic() + SYSLOG_WORKER_FLUSH
+            chunk.append(parse_log(data.decode('utf-8', errors='ignore'), addr[0]))
+            counters[2 * index] += 1
+        except socket.timeout:
+            pass
+
+        if len(chunk) >= SYSLOG_WORKER_CHUNK or (chunk and time.monotonic() >= deadline):
+            try:
+                out_queue.put_nowait(chunk)
+            except queue.Full:
+                counters[2 * index + 1] += len(chunk)
+            chunk = []
+
+
+def start_syslog_workers(host: str, port: int, workers: int, queue_size: int = 1000):
+    """
+    SO_REUSEPORT로 같은 UDP 포트에 바인딩한 수신 프로세스 N개를 띄웁니다.
+    반환: (프로세스 목록, 파싱된 행 묶음이 들어오는 큐, 워커별 카운터)
+    """
+    ctx = multiprocessing.get_context("spawn")  # 부모의 스레드/DB 커넥션을 상속하지 않도록
+    out_queue = ctx.Queue(maxsize=queue_size)
+    counters = ctx.Array('q', workers * 2, lock=False)
+
+    processes = []
+    for i in range(workers):
+        proc = ctx.Process(target=_syslog_worker, args=(i, host, port, out_queue, counters),
+                           name=f"syslog-worker-{i}", daemon=True)
+        proc.start()
+        processes.append(proc)
+    return processes, out_queue, counters
+
+
+def start_syslog_server(host="0.0.0.0", port=514, workers: int = SYSLOG_WORKERS):
+    global _worker_counters
+    pipeline = get_syslog_pipeline()
+    pipeline.start()
+
+    if workers > 1 and not hasattr(socket, "SO_REUSEPORT"):
+        print("SO_REUSEPORT 미지원 OS - 단일 수신 모드로 실행합니다.")
+        workers = 1
+
+    if workers > 1:
+        processes, out_queue, _worker_counters = start_syslog_workers(host, port, workers)
+        print(f"Syslog 서버 시작: {host}:{port} (수신 워커 {len(processes)}개, SO_REUSEPORT)")
+        # 워커들이 넘긴 묶음을 공용 저장 단계(SyslogPipeline)로 전달
+        while True:
+            pipeline.submit_many(out_queue.get())
+
+    sock = _open_socket(host, port)
     print(f"Syslog 서버 시작: {host}:{port}")
 
     while True:
         data, addr = sock.recvfrom(4096)  # 버퍼 크기 늘림
         raw_log = data.decode('utf-8', errors='ignore')
-        print(f"Received syslog from {addr[0]}: {raw_log}")  # 디버깅 print 추가
-        save_log(raw_log, addr[0])
+        pipeline.submit(parse_log(raw_log, addr[0]))
+
 
 def save_log(raw_log: str, source_ip: str):
-    db = SessionLocal()
+    """단건 즉시 저장 (테스트/수동 입력용). 실시간 수신은 SyslogPipeline을 사용합니다."""
     try:
-        # Cisco 로그 더 정확한 파싱 (타임스탬프 포함)
-        # 예: *Dec 20 11:30:09.491: %LINK-3-UPDOWN: Interface GigabitEthernet1/0/3, changed state to down
-        match = re.search(r'%([A-Z0-9-]+-\d+-[A-Z0-9]+):\s*(.*)', raw_log)
-        event_id = match.group(1) if match else "UNKNOWN"
-        message = match.group(2).strip() if match else raw_log.strip()
-
-        # severity 판단 개선
-        severity = "INFO"
-        if any(keyword in raw_log for keyword in ["EMERG", "ALERT", "CRIT", "ERR", "DOWN", "FAIL"]):
-            severity = "CRITICAL"
-        elif any(keyword in raw_log for keyword in ["WARNING", "UPDOWN", "NOTICE"]):
-            severity = "WARNING"
-
-        print(f"Parsed - Severity: {severity}, Event: {event_id}, Message: {message}")  # 디버깅 print
-
-        log = EventLog(
-            severity=severity,
-            source=source_ip,
-            event_id=event_id,
-            message=message
-        )
-        db.add(log)
-        db.commit()
-        print("로그 저장 성공!")  # 성공 print
+        log_store.insert_rows([parse_log(raw_log, source_ip)])
     except Exception as e:
-        db.rollback()
         print(f"로그 저장 실패: {e}")
-    finally:
-        db.close()
\ No newline at end of file
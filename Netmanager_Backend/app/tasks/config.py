@@ -1,44 +1,161 @@
 from celery import shared_task
 from app.services.ssh_service import DeviceConnection, DeviceInfo
+from app.services.ssh_pool import ssh_pool
+from app.services.async_ssh_service import AsyncDeviceConnection, AsyncSshRunner
 from app.services.parser_service import CLIAnalyzer
+from app.services.config_store import config_store
 from app.models.device import ConfigBackup, Device
 from app.models.config_template import ConfigTemplate
+from sqlalchemy import func
 from sqlalchemy.orm import Session
 from app.db.session import SessionLocal
+from collections import Counter, deque
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from contextlib import ExitStack
+import asyncio
+from typing import Any, Dict, List, Optional, Tuple
 import datetime
+import os
+import re
+import time
+
+# 전체 장비 설정 수집: 동시에 진행할 SSH 작업 수 (전체 / 사이트별)
+FLEET_PULL_CONCURRENCY = int(os.getenv("FLEET_PULL_CONCURRENCY", "50"))
+FLEET_PULL_SITE_CONCURRENCY = int(os.getenv("FLEET_PULL_SITE_CONCURRENCY", "10"))
+FLEET_PULL_COMMIT_BATCH = 50        # 수집한 설정 몇 건마다 모아서 저장(한 트랜잭션)할지
+FLEET_PULL_PROGRESS_INTERVAL = 2.0  # 진행 상황(update_state) 갱신 주기 (초)
+FLEET_PULL_MAX_ERRORS = 100         # 결과에 담을 실패 장비 수 상한
+# fleet pull SSH 전송 방식: netmiko(스레드 풀 + 세션 풀) / asyncssh(이벤트 루프 1개로 동시 세션 처리)
+SSH_BACKEND = os.getenv("SSH_BACKEND", "netmiko")
+
+# 변경 감지: 전체 설정 대신 "마지막 설정 변경" 한 줄만 받아 지난 백업과 같으면 수집/파싱/저장 생략 (IOS / IOS-XE)
+CONFIG_CHANGE_COMMAND = "show running-config | include Last configuration change"
+CONFIG_CHANGE_PLATFORMS = {"cisco_ios", "cisco_iosxe"}
+CONFIG_CHANGE_PATTERN = re.compile(r"Last configuration change at [^\r\n]*")
+
+
+def _device_info(device: Device) -> DeviceInfo:
+    return DeviceInfo(
+        name=device.name, host=device.host, username=device.username,
+        password=device.password, enable_password=device.secret,
+        device_type=device.device_type, port=device.port
+    )
+
+
+def _change_marker(output: Optional[str]) -> Optional[str]:
+    """출력에서 "Last configuration change at ..." 줄 추출 (없으면 None)"""
+    match = CONFIG_CHANGE_PATTERN.search(output or "")
+    return match.group(0).strip() if match else None
+
+
+def _latest_backups(db: Session, device_ids: List[int]) -> Dict[int, Any]:
+    """장비별 가장 최근 백업의 변경 표시 / 블롭 해시 (본문은 읽지 않음)"""
+    if not device_ids:
+        return {}
+    latest = db.query(func.max(ConfigBackup.id)) \
+        .filter(ConfigBackup.device_id.in_(device_ids)) \
+        .group_by(ConfigBackup.device_id)
+    rows = db.query(ConfigBackup.device_id, ConfigBackup.config_changed_at,
+                    ConfigBackup.config_sha256, ConfigBackup.parsed_sha256) \
+        .filter(ConfigBackup.id.in_(latest.scalar_subquery()))
+    return {row.device_id: row for row in rows}
+
+
+def _new_backup(db: Session, device_id: int, raw_run: str, parsed: Dict, marker: Optional[str],
+                previous=None) -> ConfigBackup:
+    """본문은 config_store 블롭으로 (같은 내용이면 기존 블롭 재사용, 아니면 직전 백업 대비 델타)"""
+    return ConfigBackup(
+        device_id=device_id,
+        config_sha256=config_store.put(db, raw_run, previous.config_sha256 if previous else None),
+        parsed_sha256=config_store.put_parsed(db, parsed, previous.parsed_sha256 if previous else None),
+        config_size=len(raw_run.encode("utf-8")),
+        config_changed_at=marker
+    )
+
+
+def _store_backups(db: Session, pulled: List[Tuple[int, str, Dict, Optional[str]]], latest: Dict[int, Any]):
+    """
+    수집 결과 (device_id, raw_run, parsed, 변경 표시) 묶음을 짧은 트랜잭션 하나로 저장합니다.
+    블롭 INSERT가 쓰기 트랜잭션을 시작하므로, SSH 대기 중에는 열어 두지 않도록 모아 두었다가 한 번에 처리
+    (SQLite는 쓰기 잠금이 DB 전체라 syslog 저장 / 메트릭 기록 / API가 "database is locked"로 실패함)
+    """
+    try:
+        db.add_all([
+            _new_backup(db, device_id, raw_run, parsed, marker, latest.get(device_id))
+            for device_id, raw_run, parsed, marker in pulled
+        ])
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+
+
+def _pull_outputs(connection: DeviceConnection, device_type: str, last_marker: Optional[str] = None):
+    # 지난 백업 이후 변경이 없으면 None (running-config / vlan 전송 생략)
+    if last_marker and device_type in CONFIG_CHANGE_PLATFORMS:
+        if _change_marker(connection.send_command(CONFIG_CHANGE_COMMAND)) == last_marker:
+            return None
+    return connection.get_running_config(), connection.send_command("show vlan brief")
+
+
+def _pull_device(info: DeviceInfo, last_marker: Optional[str] = None) -> Optional[Tuple[str, Dict, Optional[str]]]:
+    """
+    running-config / vlan 수집 + 파싱 (워커 SSH 풀 세션 사용).
+    (raw_run, parsed, 설정 변경 표시), last_marker와 장비의 현재 변경 표시가 같으면 None
+    """
+    outputs = ssh_pool.run(info, lambda connection: _pull_outputs(connection, info.device_type, last_marker))
+    if outputs is None:
+        return None
+    raw_run, raw_vlan = outputs
+    parsed = CLIAnalyzer.analyze_multiple_commands({
+        'show run': raw_run,
+        'show vlan': raw_vlan
+    })
+    return raw_run, parsed, _change_marker(raw_run)
+
+
+async def _async_pull_device(info: DeviceInfo,
+                             last_marker: Optional[str] = None) -> Optional[Tuple[str, Dict, Optional[str]]]:
+    """_pull_device의 asyncssh 버전 (파싱은 루프를 막지 않도록 기본 executor에서)"""
+    connection = AsyncDeviceConnection(info)
+    if not await connection.connect():
+        raise ConnectionError(connection.last_error)
+    try:
+        if last_marker and info.device_type in CONFIG_CHANGE_PLATFORMS:
+            if _change_marker(await connection.send_command(CONFIG_CHANGE_COMMAND)) == last_marker:
+                return None
+        raw_run = await connection.get_running_config()
+        raw_vlan = await connection.send_command("show vlan brief")
+    finally:
+        await connection.disconnect()
+    parsed = await asyncio.get_running_loop().run_in_executor(None, CLIAnalyzer.analyze_multiple_commands, {
+        'show run': raw_run,
+        'show vlan': raw_vlan
+    })
+    return raw_run, parsed, _change_marker(raw_run)
+
 
 @shared_task
-def pull_and_parse_config(device_id: int):
+def pull_and_parse_config(device_id: int, force: bool = False):
+    """force=True면 변경 감지 없이 항상 전체 수집"""
     db: Session = SessionLocal()
     try:
         device = db.query(Device).filter(Device.id == device_id).first()
         if not device:
             return {"status": "error", "message": "Device not found"}
 
-        target_device = DeviceInfo(
-            name=device.name, host=device.host, username=device.username,
-            password=device.password, enable_password=device.secret,
-            device_type=device.device_type, port=device.port
-        )
-
-        connection = DeviceConnection(target_device)
-        if not connection.connect():
-            return {"status": "error", "message": connection.last_error}
-
-        raw_run = connection.get_running_config()
-        raw_vlan = connection.send_command("show vlan brief")
-        connection.disconnect()
-
-        parsed = CLIAnalyzer.analyze_multiple_commands({
-            'show run': raw_run,
-            'show vlan': raw_vlan
-        })
-
-        new_backup = ConfigBackup(
-            device_id=device.id,
-            raw_config=raw_run,
-            parsed_config=parsed
-        )
+        previous = _latest_backups(db, [device.id]).get(device.id)
+        last_marker = previous.config_changed_at if previous and not force else None
+        # 워커 SSH 풀의 세션 재사용 (같은 장비 연속 작업은 핸드셰이크/enable 생략)
+        try:
+            pulled = _pull_device(_device_info(device), last_marker)
+        except (ConnectionError, TimeoutError) as e:
+            return {"status": "error", "message": str(e)}
+        if pulled is None:
+            return {"status": "unchanged", "config_changed_at": last_marker}
+        raw_run, parsed, marker = pulled
+
+        new_backup = _new_backup(db, device.id, raw_run, parsed, marker, previous)
         db.add(new_backup)
         db.commit()
         db.refresh(new_backup)
@@ -60,29 +177,134 @@ def deploy_config_task(device_id: int, template_id: int):
         if not template:
             return {"status": "error", "message": "Template not found"}
 
-        target_device = DeviceInfo(
-            name=device.name,
-            host=device.host,
-            username=device.username,
-            password=device.password,
-            enable_password=device.secret,
-            device_type=device.device_type,
-            port=device.port
-        )
-
-        connection = DeviceConnection(target_device)
-        if not connection.connect():
-            return {"status": "error", "message": f"Connection failed: {connection.last_error}"}
-
         # 템플릿 명령어 줄 단위로 분리
         commands = [cmd.strip() for cmd in template.template_text.splitlines() if cmd.strip()]
 
-        output = connection.send_commands(commands)
-        connection.disconnect()
+        # 설정 변경은 중간에 실패했을 때 다시 보내지 않음 (retry=False)
+        try:
+            output = ssh_pool.run(_device_info(device), lambda conn: conn.send_config_commands(commands), retry=False)
+        except (ConnectionError, TimeoutError) as e:
+            return {"status": "error", "message": f"Connection failed: {e}"}
 
         # 배포 성공 로그 (옵션: ConfigBackup에 저장하거나 별도 로그 테이블)
         return {"status": "success", "output": output}
     except Exception as e:
         return {"status": "error", "message": str(e)}
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+
+def _fleet_progress(started: float, total: int, succeeded: int, failed: int, unchanged: int = 0) -> Dict:
+    done = succeeded + failed + unchanged
+    elapsed = time.monotonic() - started
+    return {
+        "total": total, "done": done, "succeeded": succeeded, "unchanged": unchanged, "failed": failed,
+        "elapsed_s": round(elapsed, 1),
+        "devices_per_min": round(done / elapsed * 60, 1) if elapsed > 0 else 0.0,
+    }
+
+
+@shared_task(bind=True)
+def pull_fleet_configs(self, device_ids: Optional[List[int]] = None, site: Optional[str] = None,
+                       concurrency: int = FLEET_PULL_CONCURRENCY, site_concurrency: int = FLEET_PULL_SITE_CONCURRENCY,
+                       backend: str = SSH_BACKEND, force: bool = False):
+    """
+    여러 장비의 설정을 한 작업으로 병렬 수집합니다.
+    - 동시 SSH 작업 수: 전체 concurrency, 같은 site 안에서는 site_concurrency 이하
+      (사이트를 돌아가며 배정해 한 사이트가 전체 슬롯을 독점하지 않음, site 없는 장비는 전체 상한만 적용)
+    - 진행 상황(완료/실패 수, devices/min)을 update_state(PROGRESS)로 보고
+    - 수집 결과는 메모리에 FLEET_PULL_COMMIT_BATCH 건씩 모았다가 ConfigBackup(본문은 config_store 블롭)으로
+      짧은 트랜잭션 하나에 저장 (SSH 응답을 기다리는 동안 쓰기 트랜잭션을 열어 두지 않음)
+    - 지난 백업 이후 설정 변경이 없는 장비는 전체 수집 생략 (unchanged, force=True면 항상 수집)
+    backend="asyncssh"면 스레드 대신 이벤트 루프 하나에서 AsyncDeviceConnection으로 수집합니다.
+    """
+    db: Session = SessionLocal()
+    try:
+        query = db.query(Device)
+        if device_ids:
+            query = query.filter(Device.id.in_(device_ids))
+        if site:
+            query = query.filter(Device.site == site)
+        devices = query.all()
+        latest = _latest_backups(db, [device.id for device in devices])
+        queues: Dict[Optional[str], deque] = {}
+        for device in devices:
+            previous = latest.get(device.id)
+            marker = previous.config_changed_at if previous and not force else None
+            queues.setdefault(device.site, deque()).append((device.id, _device_info(device), marker))
+        total = sum(len(q) for q in queues.values())
+        concurrency = max(1, concurrency)
+        site_concurrency = max(1, site_concurrency)  # 0 이하면 사이트 장비가 배정되지 않아 무한 대기
+
+        started = time.monotonic()
+        last_report = started
+        succeeded = failed = unchanged = 0
+        errors: Dict[int, str] = {}
+        batch: List[Tuple[int, str, Dict, Optional[str]]] = []  # 저장 대기 중인 수집 결과 (DB에는 아직 쓰지 않음)
+        in_flight = {}
+        site_running: Counter = Counter()
+
+        with ExitStack() as stack:
+            if backend == "asyncssh":
+                runner = stack.enter_context(AsyncSshRunner())
+                submit = lambda info, marker: runner.submit(_async_pull_device(info, marker))
+            else:
+                executor = stack.enter_context(
+                    ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="fleet-pull"))
+                submit = lambda info, marker: executor.submit(_pull_device, info, marker)
+
+            while queues or in_flight:
+                # 빈 슬롯 채우기 (사이트 순회)
+                progressed = True
+                while progressed and len(in_flight) < concurrency:
+                    progressed = False
+                    for device_site in list(queues):
+                        if len(in_flight) >= concurrency:
+                            break
+                        if device_site is not None and site_running[device_site] >= site_concurrency:
+                            continue
+                        device_id, info, marker = queues[device_site].popleft()
+                        if not queues[device_site]:
+                            del queues[device_site]
+                        in_flight[submit(info, marker)] = (device_id, device_site)
+                        site_running[device_site] += 1
+                        progressed = True
+
+                done, _ = wait(in_flight, timeout=FLEET_PULL_PROGRESS_INTERVAL, return_when=FIRST_COMPLETED)
+                for future in done:
+                    device_id, device_site = in_flight.pop(future)
+                    site_running[device_site] -= 1
+                    try:
+                        pulled = future.result()
+                    except Exception as e:
+                        failed += 1
+                        if len(errors) < FLEET_PULL_MAX_ERRORS:
+                            errors[device_id] = str(e)
+                        continue
+                    if pulled is None:
+                        unchanged += 1
+                        continue
+                    batch.append((device_id, *pulled))
+                    succeeded += 1
+
+                if len(batch) >= FLEET_PULL_COMMIT_BATCH:
+                    _store_backups(db, batch, latest)
+                    batch = []
+
+                now = time.monotonic()
+                if self.request.id and now - last_report >= FLEET_PULL_PROGRESS_INTERVAL:
+                    self.update_state(state="PROGRESS", meta=_fleet_progress(started, total, succeeded, failed, unchanged))
+                    last_report = now
+
+        if batch:
+            _store_backups(db, batch, latest)
+
+        result = _fleet_progress(started, total, succeeded, failed, unchanged)
+        print(f"[Fleet Pull] {result['done']}/{total} devices in {result['elapsed_s']}s "
+              f"({result['devices_per_min']} devices/min, {unchanged} unchanged, {failed} failed)")
+        return {"status": "success", **result, "errors": errors}
+    except Exception as e:
+        db.rollback()
+        return {"status": "error", "message": str(e)}
+    finally:
+        db.close()
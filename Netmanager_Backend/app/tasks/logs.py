@@ -0,0 +1,29 @@
+from celery import shared_task
+from app.services.log_store import log_store, LOG_RETENTION_DAYS, ROLLUP_RETENTION_DAYS
+import datetime
+
+
+@shared_task
+def rollup_event_logs(hours: int = 2):
+    """
+    최근 N시간(+ 진행 중인 현재 시간)의 시간별 이벤트 집계를 다시 계산합니다.
+    늦게 도착해 합쳐진(coalesced) 행까지 반영되도록 직전 시간들도 함께 재집계합니다.
+    """
+    now = datetime.datetime.utcnow().replace(minute=0, second=0, microsecond=0)
+    start = now - datetime.timedelta(hours=hours)
+    written = log_store.rollup_hours(start, now + datetime.timedelta(hours=1))
+    return {"status": "success", "from": start.isoformat(), "rows": written}
+
+
+@shared_task
+def enforce_log_retention(days: int = LOG_RETENTION_DAYS, rollup_days: int = ROLLUP_RETENTION_DAYS):
+    """보존 기간이 지난 일자 파티션을 DROP 하고 오래된 시간별 집계를 정리합니다."""
+    today = datetime.datetime.utcnow().date()
+    dropped = log_store.drop_partitions_before(today - datetime.timedelta(days=days))
+    purged = log_store.purge_rollups_before(
+        datetime.datetime.utcnow() - datetime.timedelta(days=rollup_days)
+    )
+    # 검색 인덱스가 없는 파티션(기능 도입 전에 만들어진 것) 보정
+    indexed = log_store.ensure_search_indexes()
+    print(f"[Log Retention] dropped partitions: {dropped}, purged rollups: {purged}, indexed: {indexed}")
+    return {"status": "success", "dropped": dropped, "purged_rollups": purged, "indexed": indexed}
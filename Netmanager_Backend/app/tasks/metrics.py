@@ -0,0 +1,17 @@
+from celery import shared_task
+from app.services.metrics_rollup import metrics_rollup
+
+
+@shared_task
+def rollup_device_metrics():
+    """최근 구간의 5분 / 1시간 / 1일 집계를 다시 계산합니다. (낮은 tier부터 순서대로)"""
+    written = metrics_rollup.rollup_recent()
+    return {"status": "success", "rows": written}
+
+
+@shared_task
+def enforce_metrics_retention():
+    """tier별 보존 기간이 지난 원본 샘플 / 집계 행 삭제"""
+    deleted = metrics_rollup.enforce_retention()
+    print(f"[Metrics Retention] deleted: {deleted}")
+    return {"status": "success", "deleted": deleted}
@@ -2,41 +2,159 @@ from celery import shared_task
 from sqlalchemy.orm import Session
 from app.db.session import SessionLocal
 from app.models.device import Device
-from app.services.snmp_service import SnmpManager
+from app.models.metrics import PollRun
+from app.services.snmp_service import poll_devices, SNMP_POLL_CONCURRENCY
+from app.services.snmp_usm import UsmCredentials
+from app.services.metrics_store import metrics_store, parse_uptime
+from app.services.interface_rates import interface_rates
+from app.services.poll_scheduler import poll_scheduler, POLL_DEVICE_RELOAD
+from app.services.device_status import device_status
+from typing import Dict, List
 import datetime
+import time
+
+
+# 폴링에 필요한 컬럼만 조회 (ORM 객체 전체를 읽고 dirty 추적하지 않음)
+_DEVICE_COLUMNS = (Device.id, Device.name, Device.host, Device.snmp_community, Device.snmp_version,
+                   Device.snmp_v3_username, Device.snmp_v3_auth_protocol, Device.snmp_v3_auth_key,
+                   Device.snmp_v3_priv_protocol, Device.snmp_v3_priv_key,
+                   Device.critical, Device.poll_interval, Device.status)
+
+
+def _load_devices(db: Session) -> List[Dict]:
+    rows = db.query(*_DEVICE_COLUMNS).all()
+    device_status.load((row.id, row.status) for row in rows)  # DB 기준으로 상태 스냅샷 재동기화
+    return [_device_target(row) for row in rows]
+
+
+def _device_target(device) -> Dict:
+    target = {
+        "id": device.id, "name": device.name, "host": device.host, "community": device.snmp_community,
+        "version": device.snmp_version or 2, "critical": device.critical, "poll_interval": device.poll_interval,
+    }
+    if target["version"] == 3:
+        # 같은 계정이면 같은 튜플 -> 런타임 / 키 캐시가 폴링 주기마다 그대로 재사용됨
+        target["usm"] = UsmCredentials(
+            device.snmp_v3_username or "", device.snmp_v3_auth_protocol or "sha", device.snmp_v3_auth_key,
+            device.snmp_v3_priv_protocol or "aes", device.snmp_v3_priv_key,
+        )
+    return target
+
+
+def _poll_and_store(db: Session, targets: List[Dict], concurrency: int, interfaces: bool) -> List[Dict]:
+    """
+    장비 목록을 동시에 폴링하고 상태 / 메트릭 샘플 / 인터페이스 사용률 / 실행 기록을 저장합니다.
+    (monitor_all_devices 와 스케줄러 tick 공통)
+    상태는 메모리 스냅샷과 비교해 바뀐 장비만 UPDATE 한 번으로 반영합니다.
+    """
+    # 장비별 SNMP 요청을 asyncio로 동시에 진행 (concurrency 만큼 제한)
+    started_at = datetime.datetime.utcnow()
+    sample_ts = int(time.time())  # 같은 실행의 샘플은 모두 폴링 시작 시각으로 기록
+    t0 = time.perf_counter()
+    results = poll_devices(targets, concurrency, interfaces)
+    duration_ms = int((time.perf_counter() - t0) * 1000)
+    by_id = {r["id"]: r for r in results}
+
+    samples = []
+    device_rates = {}
+    online = 0
+    for target in targets:
+        device_id = target["id"]
+        result = by_id[device_id]
+        new_status = result['status']
+
+        print(f"  - {target['name']} ({target['host']}): {new_status}")
+
+        resources = result.get('resources')
+        if new_status == 'online':
+            online += 1
+            if resources:
+                print(f"    CPU: {resources['cpu_usage']}%, Mem: {resources['memory_usage']}%")
+
+        if result.get('interfaces'):
+            # 직전 카운터와 비교해 인터페이스별 bps 계산 (첫 수집은 기준값만 저장)
+            rates = interface_rates.update(device_id, result['interfaces'], result['interfaces_ts'])
+            if rates:
+                device_rates[device_id] = rates
+
+        samples.append({
+            "device_id": device_id,
+            "ts": sample_ts,
+            "cpu": resources['cpu_usage'] if resources else None,
+            "mem": resources['memory_usage'] if resources else None,
+            "uptime": parse_uptime(result.get('uptime')),
+            "reachable": new_status == 'online',
+        })
+
+    # 바뀐 상태만 저장 + DEVICE_UP/DOWN 이벤트 (정상 상태에서는 쓰기 없음)
+    transitions = device_status.reconcile({r["id"]: r["status"] for r in results})
+    device_status.apply(transitions, {t["id"]: t["host"] for t in targets})
+
+    db.add(PollRun(
+        started_at=started_at,
+        duration_ms=duration_ms,
+        device_count=len(targets),
+        online=online,
+        offline=len(targets) - online,
+        concurrency=concurrency,
+    ))
+    db.commit()
+    metrics_store.insert_samples(samples)  # 장비 수만큼의 샘플을 배치 INSERT
+    metrics_store.replace_interface_stats(device_rates, sample_ts)
+    print(f"  Polled {len(targets)} devices in {duration_ms} ms "
+          f"(concurrency={concurrency}, status changes={len(transitions)})")
+    return results
+
 
 @shared_task
-def monitor_all_devices():
+def monitor_all_devices(concurrency: int = SNMP_POLL_CONCURRENCY, interfaces: bool = True):
+    """전체 장비 즉시 폴링 (수동 실행용. 주기 폴링은 poll_due_devices 스케줄러가 담당)"""
     print(f"[{datetime.datetime.now()}] Celery: Starting monitoring job...")
 
     db: Session = SessionLocal()
     try:
-        devices = db.query(Device).all()
+        _poll_and_store(db, _load_devices(db), concurrency, interfaces)
+    except Exception as e:
+        db.rollback()
+        print(f"Celery monitoring error: {e}")
+    finally:
+        db.close()
 
-        for device in devices:
-            snmp = SnmpManager(target_ip=device.host, community=device.snmp_community)
-            status_data = snmp.check_status()
-            new_status = status_data['status']
+    print("Celery monitoring job finished.\n")
 
-            device.status = new_status
-            device.updated_at = datetime.datetime.now()
 
-            print(f"  - {device.name} ({device.host}): {new_status}")
+@shared_task
+def poll_due_devices(concurrency: int = SNMP_POLL_CONCURRENCY, interfaces: bool = True):
+    """
+    스케줄러 tick (beat가 몇 초마다 실행). 다음 폴링 시각이 된 장비만 폴링하고 결과에 따라 다시 예약합니다.
+    스케줄 상태가 프로세스 메모리에 있으므로 polling 큐를 concurrency=1 워커 하나가 처리해야 합니다.
+    """
+    now = time.time()
+    db: Session = SessionLocal()
+    try:
+        if poll_scheduler.loaded_at is None or now - poll_scheduler.loaded_at >= POLL_DEVICE_RELOAD:
+            poll_scheduler.sync(_load_devices(db), now)
 
-            if new_status == 'online':
-                try:
-                    resources = snmp.get_resource_usage()
-                    if resources:
-                        print(f"    CPU: {resources['cpu_usage']}%, Mem: {resources['memory_usage']}%")
-                        # TODO: 나중에 metrics_history 테이블에 저장
-                except Exception as e:
-                    print(f"    Resource check failed: {e}")
+        due = poll_scheduler.due(now)
+        if not due:
+            return {"polled": 0, "scheduled": len(poll_scheduler)}
 
-        db.commit()
+        polled = set()
+        try:
+            results = _poll_and_store(db, due, concurrency, interfaces)
+            finished = time.time()
+            for result in results:
+                poll_scheduler.record(result["id"], result["status"] == "online", finished)
+                polled.add(result["id"])
+        finally:
+            # 예외로 결과가 없는 장비도 다시 예약 (큐에서 사라지지 않도록)
+            for target in due:
+                if target["id"] not in polled:
+                    poll_scheduler.record(target["id"], False)
+        return {"polled": len(polled), "scheduled": len(poll_scheduler)}
     except Exception as e:
         db.rollback()
-        print(f"Celery monitoring error: {e}")
+        print(f"Celery polling tick error: {e}")
+        return {"polled": 0, "error": str(e)}
     finally:
         db.close()
-
-    print("Celery monitoring job finished.\n")
\ No newline at end of file
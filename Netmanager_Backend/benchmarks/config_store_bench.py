@@ -0,0 +1,155 @@
+"""
+설정 백업 저장 공간 비교: 행마다 본문 저장(raw_config / parsed_config) vs 내용 주소 블롭(config_store)
+
+장비 N대(템플릿 몇 개에서 파생, 장비마다 호스트명/IP/설명이 다름)의 설정을 R번 수집한다고 보고,
+매 수집마다 일부 장비만 설정 몇 줄이 바뀌는 이력을 두 방식으로 임시 SQLite DB에 저장합니다.
+- DB 파일 크기 (VACUUM 후), 저장된 본문 바이트
+- /history 조회(본문 제외) 시간
+- 블롭 복원 결과가 원문과 같은지 확인
+
+실행 (Netmanager_Backend 디렉토리에서):
+    python -m benchmarks.config_store_bench --devices 200 --rounds 30 --change-rate 0.1
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+
+from app.db.session import Base
+from app.models.device import ConfigBackup, ConfigBlob, Device
+from app.services import config_store as store_module
+from app.services.config_store import ConfigStore
+from app.services.parser_service import CLIAnalyzer
+from benchmarks.ssh_simulator import VLAN_BRIEF
+
+
+def build_config(device: int, template: int, interfaces: int, revision: int) -> str:
+    lines = ["Building configuration...", "", f"Current configuration : {9000 + revision} bytes", "!",
+             f"! Last configuration change at rev {revision}", "!", f"hostname SW{device:04d}", "!",
+             "service timestamps debug datetime msec", "service password-encryption",
+             f"ip domain name site{template}.example.net", f"ip name-server 10.{template}.0.53",
+             f"ntp server 10.{template}.0.123", "spanning-tree mode rapid-pvst", "!"]
+    for vlan in range(10, 10 + 8):
+        lines += [f"vlan {vlan}", f" name VLAN{vlan}_T{template}", "!"]
+    for i in range(1, interfaces + 1):
+        lines += [f"interface GigabitEthernet1/0/{i}",
+                  f" description {'uplink' if i > interfaces - 2 else 'user'} port {i} rev {revision % 3 if i == 1 else 0}",
+                  f" switchport access vlan {10 + (i + template) % 8}", " switchport mode access",
+                  " spanning-tree portfast", "!"]
+    lines += ["interface Vlan10", f" ip address 10.{template}.{device % 250}.{device // 250 + 2} 255.255.255.0", "!",
+              f"ip default-gateway 10.{template}.{device % 250}.1", "!",
+              "ip access-list extended MGMT", " 10 permit ip 10.0.0.0 0.255.255.255 any", " 20 deny ip any any log", "!",
+              "line vty 0 4", " exec-timeout 30 0", " transport input ssh", "!", "end"]
+    return "\n".join(lines) + "\n"
+
+
+def _session(path: str):
+    if os.path.exists(path):
+        os.remove(path)
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(bind=engine)
+    return engine, sessionmaker(bind=engine, autoflush=False)()
+
+
+def _file_size(engine, path: str) -> int:
+    with engine.connect() as conn:
+        conn.execute(text("VACUUM"))
+    return os.path.getsize(path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--devices", type=int, default=200)
+    parser.add_argument("--rounds", type=int, default=30, help="장비당 수집 횟수")
+    parser.add_argument("--templates", type=int, default=4)
+    parser.add_argument("--interfaces", type=int, default=48)
+    parser.add_argument("--change-rate", type=float, default=0.1, help="수집마다 설정이 바뀌는 장비 비율")
+    parser.add_argument("--no-delta", action="store_true", help="델타 없이 중복 제거 + 압축만")
+    args = parser.parse_args()
+    store_module.CONFIG_STORE_DELTA = not args.no_delta
+    rng = random.Random(7)
+
+    workdir = tempfile.mkdtemp(prefix="config_store_bench_")
+    legacy_path, blob_path = os.path.join(workdir, "legacy.db"), os.path.join(workdir, "blob.db")
+    legacy_engine, legacy_db = _session(legacy_path)
+    blob_engine, blob_db = _session(blob_path)
+    store = ConfigStore()
+    for db in (legacy_db, blob_db):
+        db.add_all([Device(id=i + 1, name=f"SW{i:04d}", host=f"10.0.{i // 250}.{i % 250}", username="admin",
+                           password="x") for i in range(args.devices)])
+        db.commit()
+
+    revisions = [0] * args.devices
+    previous = {}
+    raw_bytes = 0
+    parse_cache = {}
+    samples = []
+    start = time.perf_counter()
+    for round_no in range(args.rounds):
+        for device in range(args.devices):
+            if round_no and rng.random() < args.change_rate:
+                revisions[device] += 1
+            raw = build_config(device, device % args.templates, args.interfaces, revisions[device])
+            key = (device, revisions[device])
+            if key not in parse_cache:
+                parse_cache[key] = CLIAnalyzer.analyze_multiple_commands({"show run": raw, "show vlan": VLAN_BRIEF})
+            parsed = parse_cache[key]
+            raw_bytes += len(raw)
+
+            legacy_db.add(ConfigBackup(device_id=device + 1, raw_config=raw, parsed_config=parsed))
+            prev = previous.get(device)
+            row = ConfigBackup(
+                device_id=device + 1,
+                config_sha256=store.put(blob_db, raw, prev.config_sha256 if prev else None),
+                parsed_sha256=store.put_parsed(blob_db, parsed, prev.parsed_sha256 if prev else None),
+                config_size=len(raw),
+            )
+            blob_db.add(row)
+            previous[device] = row
+            if round_no == args.rounds - 1 and device % 50 == 0:
+                samples.append((row.config_sha256, raw))
+        legacy_db.commit()
+        blob_db.commit()
+    elapsed = time.perf_counter() - start
+
+    legacy_size, blob_size = _file_size(legacy_engine, legacy_path), _file_size(blob_engine, blob_path)
+    blobs = blob_db.query(ConfigBlob).count()
+    deltas = blob_db.query(ConfigBlob).filter(ConfigBlob.base_sha256.isnot(None)).count()
+    stored = sum(size for (size,) in blob_db.query(ConfigBlob.stored_size))
+
+    fresh = ConfigStore()  # 캐시 없이 DB에서 복원 (델타 체인 포함)
+    restore_start = time.perf_counter()
+    ok = all(fresh.get(blob_db, sha256) == raw for sha256, raw in samples)
+    restore_ms = (time.perf_counter() - restore_start) / max(len(samples), 1) * 1000
+
+    history_start = time.perf_counter()
+    for device in range(1, args.devices + 1):
+        blob_db.query(ConfigBackup.id, ConfigBackup.config_sha256, ConfigBackup.config_size,
+                      ConfigBackup.created_at).filter(ConfigBackup.device_id == device).all()
+    history_ms = (time.perf_counter() - history_start) / args.devices * 1000
+
+    backups = args.devices * args.rounds
+    print(f"devices: {args.devices}, rounds: {args.rounds}, backups: {backups}, change rate: {args.change_rate}, "
+          f"codec: {store_module.CONFIG_STORE_CODEC}, delta: {store_module.CONFIG_STORE_DELTA}")
+    print(f"  raw config text     {raw_bytes / 1e6:9.1f} MB")
+    print(f"  legacy DB file      {legacy_size / 1e6:9.1f} MB")
+    print(f"  blob DB file        {blob_size / 1e6:9.1f} MB  ({legacy_size / blob_size:.1f}x smaller)")
+    print(f"  blobs               {blobs:9d}  (delta {deltas}, {stored / 1e6:.2f} MB stored, "
+          f"{store.stats['deduplicated']} deduplicated puts)")
+    print(f"  store time          {elapsed / backups * 1000:9.2f} ms/backup (both schemas)")
+    print(f"  restore (cold)      {restore_ms:9.2f} ms/config  round-trip {'OK' if ok else 'MISMATCH'}")
+    print(f"  /history query      {history_ms:9.2f} ms/device")
+
+    for db in (legacy_db, blob_db):
+        db.close()
+    for path in (legacy_path, blob_path):
+        os.remove(path)
+    os.rmdir(workdir)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""
+이벤트 로그 페이지네이션 벤치마크 (OFFSET vs (timestamp, id) 키셋)
+
+합성 event_logs 테이블(기본 1,000만 행, SQLite, 파티션 하나에 몰아넣은 최악의 경우)을 만들고
+깊이별로 100행 페이지를 가져오는 시간을 비교합니다. 필터 없음 / severity 필터 두 경우를 측정합니다.
+
+실행 (Netmanager_Backend 디렉토리에서):
+    python -m benchmarks.logs_pagination_bench --rows 10000000 --db /tmp/logs_bench.db
+    (이미 만들어진 DB 파일이 있으면 적재를 건너뜁니다)
+"""
+import argparse
+import os
+import random
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import create_engine
+from sqlalchemy.schema import CreateTable
+
+from app.models.log import EventLog
+from app.services.log_store import build_log_select
+
+SEVERITIES = ("CRITICAL", "WARNING", "INFO")
+EVENT_IDS = ("LINK-3-UPDOWN", "LINEPROTO-5-UPDOWN", "SYS-5-CONFIG_I", "SEC_LOGIN-6-LOGIN_SUCCESS",
+             "OSPF-5-ADJCHG", "BGP-5-ADJCHANGE", "PM-4-ERR_DISABLE", "SW_MATM-4-MACFLAP_NOTIF")
+PAGE_SIZE = 100
+
+
+def load_synthetic(engine, rows: int, chunk: int = 200_000):
+    table = EventLog.__table__
+    with engine.begin() as conn:
+        conn.execute(CreateTable(table))
+
+    raw = engine.raw_connection()
+    cur = raw.cursor()
+    cur.execute("PRAGMA journal_mode=OFF")
+    cur.execute("PRAGMA synchronous=OFF")
+
+    rnd = random.Random(42)
+    start = datetime(2024, 1, 1)
+    step = timedelta(days=30) / rows
+    sql = ("INSERT INTO event_logs (id, timestamp, severity, source, event_id, message, repeat_count, "
+           "first_seen, last_seen, device_id) VALUES (?, ?, ?, ?, ?, ?, 1, ?, ?, ?)")
+
+    t0 = time.perf_counter()
+    for base in range(0, rows, chunk):
+        batch = []
+        for i in range(base, min(base + chunk, rows)):
+            ts = (start + step * i).strftime("%Y-%m-%d %H:%M:%S.%f")
+            dev = rnd.randrange(500)
+            batch.append((i + 1, ts, rnd.choice(SEVERITIES), f"10.0.{dev // 250}.{dev % 250 + 1}",
+                          rnd.choice(EVENT_IDS), f"Interface GigabitEthernet1/0/{rnd.randrange(48) + 1}, changed state",
+                          ts, ts, dev + 1))
+        cur.executemany(sql, batch)
+        raw.commit()
+        print(f"  loaded {min(base + chunk, rows):>12,} rows ({time.perf_counter() - t0:.0f}s)")
+
+    # 적재 후 인덱스 생성 (행 단위 인덱스 갱신보다 훨씬 빠름)
+    t0 = time.perf_counter()
+    for index in table.indexes:
+        index.create(engine)
+    print(f"  indexes built in {time.perf_counter() - t0:.0f}s")
+    raw.close()
+
+
+def timed(func, repeat: int = 3) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - t0)
+    return best * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=10_000_000)
+    parser.add_argument("--db", default="/tmp/netmanager_logs_bench.db")
+    args = parser.parse_args()
+
+    engine = create_engine(f"sqlite:///{args.db}")
+    if not os.path.exists(args.db) or os.path.getsize(args.db) == 0:
+        print(f"synthetic event_logs 적재: {args.rows:,} rows -> {args.db}")
+        load_synthetic(engine, args.rows)
+
+    table = EventLog.__table__
+    conn = engine.connect()
+    depths = [d for d in (0, 1_000, 100_000, 1_000_000, 5_000_000, 9_000_000) if d < args.rows]
+
+    def page(filters, offset=0, cursor=None, size=PAGE_SIZE):
+        query = build_log_select(table, cursor=cursor, **filters).offset(offset).limit(size)
+        return conn.execute(query).all()
+
+    for label, filters in (("no filter", {}), ("severity=CRITICAL", {"severity": "CRITICAL"})):
+        print(f"\n[{label}] page size {PAGE_SIZE}")
+        print(f"{'depth':>12} {'offset ms':>12} {'keyset ms':>12}")
+        for depth in depths:
+            cursor = None
+            if depth:
+                # 해당 깊이 직전 행의 커서 (측정 대상 아님)
+                anchor = page(filters, offset=depth - 1, size=1)
+                if not anchor:
+                    continue
+                cursor = (anchor[0].timestamp, anchor[0].id)
+
+            offset_ms = timed(lambda: page(filters, offset=depth))
+            keyset_ms = timed(lambda: page(filters, cursor=cursor))
+            print(f"{depth:>12,} {offset_ms:>12.1f} {keyset_ms:>12.1f}")
+
+    conn.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""
+netmiko 명령 완료 판단 비교: 고정 지연(global_delay_factor 2) vs 프롬프트 기반(cli_prompt, 학습된 대기 상한)
+
+별도 프로세스에 ssh_simulator 장비 N개를 띄우고, 장비마다 접속 -> enable -> 페이징 비활성화 ->
+show running-config -> show vlan brief -> 설정 3줄(send_config_set) -> 종료를 수행해
+- 장비당 평균 소요 시간 (접속 / 명령)
+- 전체 소요 시간 / devices per minute
+를 비교합니다. 같은 장비를 두 번 돌아 두 번째 라운드는 학습된 대기 상한을 사용합니다.
+
+실행 (Netmanager_Backend 디렉토리에서):
+    python -m benchmarks.prompt_completion_bench --devices 40 --concurrency 20 --latency 0.05
+"""
+import argparse
+import logging
+import multiprocessing
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from app.services import ssh_service
+from app.services.cli_prompt import response_times
+from app.services.ssh_service import DeviceConnection, DeviceInfo
+from benchmarks.ssh_simulator import run_simulator
+
+CONFIG_LINES = ["interface GigabitEthernet1/0/1", " description bench", "exit"]
+
+
+def _session(info: DeviceInfo):
+    start = time.perf_counter()
+    connection = DeviceConnection(info)
+    if not connection.connect():
+        raise ConnectionError(connection.last_error)
+    connected = time.perf_counter()
+    try:
+        connection.get_running_config()
+        connection.send_command("show vlan brief")
+        connection.send_config_commands(CONFIG_LINES)
+    finally:
+        connection.disconnect()
+    return connected - start, time.perf_counter() - connected
+
+
+def _measure(name: str, infos, concurrency: int):
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        futures = [executor.submit(_session, info) for info in infos]
+        results = []
+        for future in futures:
+            try:
+                results.append(future.result())
+            except Exception:
+                pass
+    wall = time.perf_counter() - start
+    ok = len(results)
+    connect = sum(r[0] for r in results) / max(ok, 1)
+    commands = sum(r[1] for r in results) / max(ok, 1)
+    print(f"  {name:22s} {wall:7.2f} s  {ok / wall * 60:8.1f} devices/min  ok {ok}/{len(infos)}  "
+          f"connect {connect:5.2f} s  commands {commands:5.2f} s per device")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--devices", type=int, default=40)
+    parser.add_argument("--base-port", type=int, default=23500)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--latency", type=float, default=0.05, help="장비 명령당 평균 응답 지연 (초)")
+    parser.add_argument("--interfaces", type=int, default=48)
+    args = parser.parse_args()
+    logging.disable(logging.CRITICAL)  # ssh_service의 DEBUG 로깅이 측정을 왜곡하지 않도록
+
+    ctx = multiprocessing.get_context("spawn")
+    ready, stop = ctx.Event(), ctx.Event()
+    simulator = ctx.Process(target=run_simulator, args=(args.devices, args.base_port, ready, stop), kwargs={
+        "latency": args.latency, "interfaces": args.interfaces,
+    }, daemon=True)
+    simulator.start()
+    if not ready.wait(120):
+        raise SystemExit("simulator did not start")
+
+    infos = [
+        DeviceInfo(name=f"SW{i:04d}", host="127.0.0.1", port=args.base_port + i,
+                   username="admin", password="admin", enable_password="enable", timeout=60)
+        for i in range(args.devices)
+    ]
+    try:
+        print(f"devices: {args.devices}, concurrency: {args.concurrency}, "
+              f"device latency: {args.latency * 1000:.0f} ms/command")
+        ssh_service.SSH_PROMPT_DETECTION = False
+        _measure("fixed delay (factor 2)", infos, args.concurrency)
+        ssh_service.SSH_PROMPT_DETECTION = True
+        _measure("prompt (cold)", infos, args.concurrency)
+        _measure("prompt (learned)", infos, args.concurrency)
+        print(f"  learned timeouts: {response_times.snapshot()}  {response_times.stats}")
+    finally:
+        stop.set()
+        simulator.join(10)
+
+
+if __name__ == "__main__":
+    main()
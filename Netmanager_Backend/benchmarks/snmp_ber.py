@@ -0,0 +1,250 @@
+"""
+최소 SNMP v1/v2c BER 인코더/디코더 (snmp_simulator 전용).
+에이전트 수천 개를 한 프로세스에서 흉내 낼 때 pysnmp 디코딩(요청당 수백 us)이 병목이 되지 않도록 메시지를 직접 다룹니다.
+앱 코드(트랩 수신, v3 discovery)는 pysnmp.proto.api를 사용합니다.
+값은 (tag, python 값) 튜플로 표현합니다. 예: (TAG_COUNTER64, 12345), (TAG_OCTET_STRING, b"Gi1/0/1")
+"""
+from typing import List, NamedTuple, Optional, Tuple
+
+# --- universal / application 타입 ---
+TAG_INTEGER = 0x02
+TAG_OCTET_STRING = 0x04
+TAG_NULL = 0x05
+TAG_OID = 0x06
+TAG_SEQUENCE = 0x30
+TAG_IP_ADDRESS = 0x40
+TAG_COUNTER32 = 0x41
+TAG_GAUGE32 = 0x42
+TAG_TIMETICKS = 0x43
+TAG_OPAQUE = 0x44
+TAG_COUNTER64 = 0x46
+TAG_NO_SUCH_OBJECT = 0x80
+TAG_NO_SUCH_INSTANCE = 0x81
+TAG_END_OF_MIB_VIEW = 0x82
+
+# --- PDU 타입 ---
+PDU_GET = 0xA0
+PDU_GETNEXT = 0xA1
+PDU_RESPONSE = 0xA2
+PDU_SET = 0xA3
+PDU_TRAP_V1 = 0xA4
+PDU_GETBULK = 0xA5
+PDU_INFORM = 0xA6
+PDU_TRAP_V2 = 0xA7
+PDU_REPORT = 0xA8
+
+VERSION_1 = 0
+VERSION_2C = 1
+
+_UNSIGNED_TAGS = {TAG_COUNTER32, TAG_GAUGE32, TAG_TIMETICKS, TAG_COUNTER64}
+_INTEGER_TAGS = {TAG_INTEGER} | _UNSIGNED_TAGS
+
+NULL = (TAG_NULL, None)
+NO_SUCH_INSTANCE = (TAG_NO_SUCH_INSTANCE, None)
+END_OF_MIB_VIEW = (TAG_END_OF_MIB_VIEW, None)
+
+Value = Tuple[int, object]
+VarBind = Tuple[str, Value]
+
+
+class BerError(ValueError):
+    pass
+
+
+class SnmpMessage(NamedTuple):
+    version: int
+    community: bytes
+    pdu_type: int
+    request_id: int
+    # GETBULK에서는 각각 non_repeaters, max_repetitions
+    error_status: int
+    error_index: int
+    varbinds: List[VarBind]
+    # SNMPv1 Trap-PDU 전용 필드 (그 외 PDU는 None)
+    enterprise: Optional[str] = None
+    agent_addr: Optional[str] = None
+    generic_trap: Optional[int] = None
+    specific_trap: Optional[int] = None
+    time_stamp: Optional[int] = None
+
+
+# --- 인코딩 ---
+def _encode_length(length: int) -> bytes:
+    if length < 0x80:
+        return bytes([length])
+    body = length.to_bytes((length.bit_length() + 7) // 8, "big")
+    return bytes([0x80 | len(body)]) + body
+
+
+def encode_tlv(tag: int, body: bytes) -> bytes:
+    return bytes([tag]) + _encode_length(len(body)) + body
+
+
+def _encode_int_body(value: int) -> bytes:
+    length = max(1, (value.bit_length() + 8) // 8)  # 부호 비트 자리 포함
+    return value.to_bytes(length, "big", signed=True)
+
+
+def encode_oid(oid: str) -> bytes:
+    arcs = [int(arc) for arc in oid.strip(".").split(".")]
+    if len(arcs) < 2:
+        raise BerError(f"invalid OID: {oid}")
+    body = bytearray([arcs[0] * 40 + arcs[1]])
+    for arc in arcs[2:]:
+        chunk = [arc & 0x7F]
+        arc >>= 7
+        while arc:
+            chunk.append(0x80 | (arc & 0x7F))
+            arc >>= 7
+        body.extend(reversed(chunk))
+    return encode_tlv(TAG_OID, bytes(body))
+
+
+def encode_value(value: Value) -> bytes:
+    tag, raw = value
+    if tag in _INTEGER_TAGS:
+        return encode_tlv(tag, _encode_int_body(int(raw)))
+    if tag in (TAG_OCTET_STRING, TAG_OPAQUE):
+        return encode_tlv(tag, raw.encode() if isinstance(raw, str) else bytes(raw))
+    if tag == TAG_OID:
+        return encode_oid(raw)
+    if tag == TAG_IP_ADDRESS:
+        return encode_tlv(tag, bytes(int(part) for part in raw.split(".")))
+    return encode_tlv(tag, b"")  # NULL, noSuchObject, noSuchInstance, endOfMibView
+
+
+def encode_varbinds(varbinds: List[VarBind]) -> bytes:
+    return encode_tlv(TAG_SEQUENCE, b"".join(
+        encode_tlv(TAG_SEQUENCE, encode_oid(oid) + encode_value(value)) for oid, value in varbinds
+    ))
+
+
+def encode_message(version: int, community: bytes, pdu_type: int, request_id: int,
+                   varbinds: List[VarBind], error_status: int = 0, error_index: int = 0) -> bytes:
+    """v1/v2c 메시지 (GET/RESPONSE/GETBULK/v2 TRAP/INFORM 등 request-id 형식 PDU)"""
+    pdu = encode_tlv(pdu_type, (
+        encode_tlv(TAG_INTEGER, _encode_int_body(request_id))
+        + encode_tlv(TAG_INTEGER, _encode_int_body(error_status))
+        + encode_tlv(TAG_INTEGER, _encode_int_body(error_index))
+        + encode_varbinds(varbinds)
+    ))
+    return encode_tlv(TAG_SEQUENCE, (
+        encode_tlv(TAG_INTEGER, _encode_int_body(version))
+        + encode_tlv(TAG_OCTET_STRING, community)
+        + pdu
+    ))
+
+
+def encode_response(request: SnmpMessage, varbinds: List[VarBind], error_status: int = 0,
+                    error_index: int = 0) -> bytes:
+    return encode_message(request.version, request.community, PDU_RESPONSE, request.request_id,
+                          varbinds, error_status, error_index)
+
+
+# --- 디코딩 ---
+def decode_tlv(data: bytes, offset: int = 0) -> Tuple[int, int, int]:
+    """(tag, 값 시작 위치, 값 끝 위치)"""
+    try:
+        tag = data[offset]
+        length = data[offset + 1]
+        offset += 2
+        if length & 0x80:
+            size = length & 0x7F
+            length = int.from_bytes(data[offset:offset + size], "big")
+            offset += size
+    except IndexError:
+        raise BerError("truncated TLV")
+    end = offset + length
+    if end > len(data):
+        raise BerError("truncated TLV")
+    return tag, offset, end
+
+
+def decode_oid(body: bytes) -> str:
+    if not body:
+        raise BerError("empty OID")
+    first = body[0]
+    arcs = [min(first // 40, 2), first - 40 * min(first // 40, 2)]
+    value = 0
+    for byte in body[1:]:
+        value = (value << 7) | (byte & 0x7F)
+        if not byte & 0x80:
+            arcs.append(value)
+            value = 0
+    return ".".join(str(arc) for arc in arcs)
+
+
+def decode_value(tag: int, body: bytes) -> Value:
+    if tag in _UNSIGNED_TAGS:
+        return tag, int.from_bytes(body, "big", signed=False)
+    if tag == TAG_INTEGER:
+        return tag, int.from_bytes(body, "big", signed=True)
+    if tag == TAG_OID:
+        return tag, decode_oid(body)
+    if tag == TAG_IP_ADDRESS:
+        return tag, ".".join(str(b) for b in body)
+    if tag in (TAG_OCTET_STRING, TAG_OPAQUE):
+        return tag, bytes(body)
+    return tag, None
+
+
+def _decode_int(data: bytes, offset: int) -> Tuple[int, int]:
+    tag, start, end = decode_tlv(data, offset)
+    if tag not in _INTEGER_TAGS:
+        raise BerError(f"expected INTEGER, got 0x{tag:02x}")
+    return decode_value(tag, data[start:end])[1], end
+
+
+def _decode_varbinds(data: bytes, offset: int) -> Tuple[List[VarBind], int]:
+    tag, start, end = decode_tlv(data, offset)
+    if tag != TAG_SEQUENCE:
+        raise BerError("expected varbind list")
+    varbinds = []
+    pos = start
+    while pos < end:
+        _, vb_start, vb_end = decode_tlv(data, pos)
+        oid_tag, oid_start, oid_end = decode_tlv(data, vb_start)
+        if oid_tag != TAG_OID:
+            raise BerError("expected OID in varbind")
+        value_tag, value_start, value_end = decode_tlv(data, oid_end)
+        varbinds.append((decode_oid(data[oid_start:oid_end]), decode_value(value_tag, data[value_start:value_end])))
+        pos = vb_end
+    return varbinds, end
+
+
+def decode_message(data: bytes) -> SnmpMessage:
+    """v1/v2c 메시지 디코딩 (v3 메시지나 잘못된 패킷은 BerError)"""
+    tag, start, _ = decode_tlv(data, 0)
+    if tag != TAG_SEQUENCE:
+        raise BerError("not an SNMP message")
+    version, pos = _decode_int(data, start)
+    if version not in (VERSION_1, VERSION_2C):
+        raise BerError(f"unsupported SNMP version {version}")
+    tag, c_start, c_end = decode_tlv(data, pos)
+    if tag != TAG_OCTET_STRING:
+        raise BerError("expected community")
+    community = bytes(data[c_start:c_end])
+
+    pdu_type, pdu_start, _ = decode_tlv(data, c_end)
+    if pdu_type == PDU_TRAP_V1:
+        tag, e_start, e_end = decode_tlv(data, pdu_start)
+        enterprise = decode_oid(data[e_start:e_end])
+        tag, a_start, a_end = decode_tlv(data, e_end)
+        agent_addr = decode_value(TAG_IP_ADDRESS, data[a_start:a_end])[1]
+        generic_trap, pos = _decode_int(data, a_end)
+        specific_trap, pos = _decode_int(data, pos)
+        time_stamp, pos = _decode_int(data, pos)
+        varbinds, _ = _decode_varbinds(data, pos)
+        return SnmpMessage(version, community, pdu_type, 0, 0, 0, varbinds,
+                           enterprise, agent_addr, generic_trap, specific_trap, time_stamp)
+
+    request_id, pos = _decode_int(data, pdu_start)
+    error_status, pos = _decode_int(data, pos)
+    error_index, pos = _decode_int(data, pos)
+    varbinds, _ = _decode_varbinds(data, pos)
+    return SnmpMessage(version, community, pdu_type, request_id, error_status, error_index, varbinds)
+
+
+def oid_key(oid: str) -> Tuple[int, ...]:
+    """OID 사전식 정렬/비교용 키"""
+    return tuple(int(arc) for arc in oid.strip(".").split("."))
@@ -0,0 +1,100 @@
+"""
+SNMP 폴링 1회당 비용 벤치마크 (엔진 공유 전/후)
+
+기존 SnmpManager 방식(폴링마다 SnmpEngine + CommunityData + UdpTransportTarget 새로 생성, 동기 getCmd)과
+프로세스 전역 snmp_runtime(엔진/transport 캐시 공유)의 장비 1대 폴링 시간을 비교합니다.
+로컬호스트에 간단한 v2c 응답기(agent)를 띄워 네트워크 지연 없이 순수 클라이언트 비용만 측정합니다.
+
+실행 (Netmanager_Backend 디렉토리에서):
+    python -m benchmarks.snmp_engine_bench --devices 20 --rounds 5
+"""
+import argparse
+import socket
+import threading
+import time
+
+from pyasn1.codec.ber import decoder, encoder
+from pysnmp.hlapi import SnmpEngine, CommunityData, UdpTransportTarget, ContextData, ObjectType, ObjectIdentity, getCmd
+from pysnmp.proto import api
+from pysnmp.proto.rfc1902 import OctetString, TimeTicks
+
+from app.services.snmp_service import SnmpManager, STATUS_OIDS, snmp_runtime
+
+AGENT_VALUES = {
+    '1.3.6.1.2.1.1.1.0': OctetString('Cisco IOS Software, C2960X Software'),
+    '1.3.6.1.2.1.1.3.0': TimeTicks(123456),
+}
+
+
+def start_agent() -> int:
+    """sysDescr / sysUpTime 만 응답하는 v2c 에이전트를 띄우고 포트를 반환"""
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    sock.bind(("127.0.0.1", 0))
+    proto = api.protoModules[api.protoVersion2c]
+
+    def serve():
+        while True:
+            data, addr = sock.recvfrom(65535)
+            msg, _ = decoder.decode(data, asn1Spec=proto.Message())
+            rsp = proto.apiMessage.getResponse(msg)
+            var_binds = proto.apiPDU.getVarBinds(proto.apiMessage.getPDU(msg))
+            proto.apiPDU.setVarBinds(proto.apiMessage.getPDU(rsp), [
+                (oid, AGENT_VALUES.get(str(oid), proto.NoSuchInstance())) for oid, _ in var_binds
+            ])
+            sock.sendto(encoder.encode(rsp), addr)
+
+    threading.Thread(target=serve, daemon=True).start()
+    return sock.getsockname()[1]
+
+
+def legacy_check_status(host: str, port: int):
+    """공유 이전 SnmpManager.check_status 와 같은 방식"""
+    engine = SnmpEngine()
+    iterator = getCmd(
+        engine,
+        CommunityData('public', mpModel=1),
+        UdpTransportTarget((host, port), timeout=1.0, retries=1),
+        ContextData(),
+        *[ObjectType(ObjectIdentity(oid)) for oid in STATUS_OIDS]
+    )
+    errorIndication, errorStatus, errorIndex, varBinds = next(iterator)
+    engine.transportDispatcher.closeDispatcher()
+    return not errorIndication and not errorStatus
+
+
+def shared_check_status(host: str, port: int):
+    return SnmpManager(host, port=port).check_status()["status"] == "online"
+
+
+def _per_poll_ms(func, ports, rounds: int) -> float:
+    func("127.0.0.1", ports[0])  # 워밍업 (MIB 로딩, 루프 스레드 시작)
+    start = time.perf_counter()
+    ok = 0
+    for _ in range(rounds):
+        for port in ports:
+            ok += func("127.0.0.1", port)
+    elapsed = time.perf_counter() - start
+    polls = rounds * len(ports)
+    if ok != polls:
+        print(f"  경고: {polls - ok}건 응답 실패")
+    return elapsed / polls * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--devices", type=int, default=20)
+    parser.add_argument("--rounds", type=int, default=5, help="폴링 주기 반복 횟수")
+    args = parser.parse_args()
+
+    ports = [start_agent() for _ in range(args.devices)]
+    legacy_ms = _per_poll_ms(legacy_check_status, ports, args.rounds)
+    shared_ms = _per_poll_ms(shared_check_status, ports, args.rounds)
+
+    print(f"devices: {args.devices} x {args.rounds} rounds (localhost agent)")
+    print(f"{'engine per poll':<20} {legacy_ms:>8.2f} ms/poll")
+    print(f"{'shared runtime':<20} {shared_ms:>8.2f} ms/poll  (x{legacy_ms / shared_ms:.1f})")
+    snmp_runtime.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+SNMP 전체 장비 폴링 벤치마크 (로컬 시뮬레이터 대상)
+
+별도 프로세스에 snmp_simulator 에이전트 N개를 띄우고 snmp_service.poll_devices()로 전체 폴링을 수행해
+- 전체 소요 시간 (beat 주기 안에 끝나는지)
+- 폴링 프로세스 CPU 시간 (장비당 ms)
+- 메모리 (tracemalloc 최대 할당량, 장비당 KB)
+를 측정합니다. 인터페이스 카운터 수집(GETBULK)을 포함할지 선택할 수 있습니다.
+
+실행 (Netmanager_Backend 디렉토리에서):
+    python -m benchmarks.snmp_polling_bench --agents 1000 --concurrency 100 --latency 0.01 --offline 0.02
+"""
+import argparse
+import multiprocessing
+import resource
+import time
+import tracemalloc
+
+from app.services.snmp_service import poll_devices, snmp_runtime
+from benchmarks.snmp_simulator import run_simulator
+
+
+def _cpu_seconds() -> float:
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    return usage.ru_utime + usage.ru_stime
+
+
+def _poll(targets, concurrency: int, interfaces: bool):
+    start_wall, start_cpu = time.perf_counter(), _cpu_seconds()
+    results = poll_devices(targets, concurrency, interfaces)
+    return results, time.perf_counter() - start_wall, _cpu_seconds() - start_cpu
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--agents", type=int, default=1000)
+    parser.add_argument("--base-port", type=int, default=20000)
+    parser.add_argument("--concurrency", type=int, default=100)
+    parser.add_argument("--rounds", type=int, default=3)
+    parser.add_argument("--interfaces", type=int, default=48, help="에이전트당 인터페이스 수")
+    parser.add_argument("--no-ifstats", action="store_true", help="인터페이스 카운터(GETBULK) 수집 제외")
+    parser.add_argument("--latency", type=float, default=0.005)
+    parser.add_argument("--loss", type=float, default=0.0)
+    parser.add_argument("--offline", type=float, default=0.0)
+    args = parser.parse_args()
+
+    ctx = multiprocessing.get_context("spawn")
+    ready, stop = ctx.Event(), ctx.Event()
+    simulator = ctx.Process(target=run_simulator, args=(args.agents, args.base_port, ready, stop), kwargs={
+        "interfaces": args.interfaces, "latency": args.latency, "loss": args.loss,
+        "offline": args.offline, "seed": 42,
+    }, daemon=True)
+    simulator.start()
+    if not ready.wait(120):
+        raise SystemExit("simulator did not start")
+
+    targets = [
+        {"id": i, "host": "127.0.0.1", "port": args.base_port + i, "community": "public"}
+        for i in range(args.agents)
+    ]
+    interfaces = not args.no_ifstats
+    try:
+        _poll(targets[:10], args.concurrency, interfaces)  # 워밍업 (엔진/루프 시작, MIB 로딩)
+
+        print(f"agents: {args.agents}, concurrency: {args.concurrency}, ifstats: {interfaces}, "
+              f"latency: {args.latency * 1000:.0f}ms, loss: {args.loss:.0%}, offline: {args.offline:.0%}")
+        for round_no in range(1, args.rounds + 1):
+            results, wall, cpu = _poll(targets, args.concurrency, interfaces)
+            online = sum(r["status"] == "online" for r in results)
+            print(f"  round {round_no}: {wall:7.2f} s  online {online}/{len(results)}  "
+                  f"cpu {cpu:6.2f} s ({cpu / len(results) * 1000:.2f} ms/device)")
+
+        tracemalloc.start()
+        _poll(targets, args.concurrency, interfaces)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        print(f"  memory peak: {peak / 1024 / 1024:.1f} MiB ({peak / len(targets) / 1024:.1f} KiB/device)")
+    finally:
+        stop.set()
+        simulator.join(10)
+        snmp_runtime.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,211 @@
+"""
+로컬 SNMP 에이전트 시뮬레이터
+
+localhost의 연속된 UDP 포트에 가짜 v1/v2c 에이전트를 수천 개 띄웁니다. 각 에이전트는
+sysDescr / sysUpTime / Cisco CPU·메모리 OID / ifXTable(ifName, ifHCIn/OutOctets, ifHighSpeed)을
+GET / GETNEXT / GETBULK로 응답하며, 응답 지연·패킷 손실·무응답(offline) 장비 비율을 설정할 수 있습니다.
+
+실행 (Netmanager_Backend 디렉토리에서):
+    python -m benchmarks.snmp_simulator --agents 2000 --base-port 20000 --latency 0.005 --loss 0.01 --offline 0.02
+"""
+import argparse
+import asyncio
+import bisect
+import random
+import resource
+import time
+from typing import List, Optional, Tuple
+
+from benchmarks.snmp_ber import (
+    BerError, decode_message, encode_response, oid_key,
+    PDU_GET, PDU_GETNEXT, PDU_GETBULK,
+    TAG_OCTET_STRING, TAG_TIMETICKS, TAG_GAUGE32, TAG_COUNTER64,
+    NO_SUCH_INSTANCE, END_OF_MIB_VIEW,
+)
+from app.services.snmp_service import (
+    IF_NAME_OID, IF_HC_IN_OCTETS_OID, IF_HC_OUT_OCTETS_OID, IF_HIGH_SPEED_OID,
+)
+
+SYS_DESCR = '1.3.6.1.2.1.1.1.0'
+SYS_UPTIME = '1.3.6.1.2.1.1.3.0'
+CPU_5MIN = '1.3.6.1.4.1.9.9.109.1.1.1.1.5.1'
+MEM_USED = '1.3.6.1.4.1.9.9.48.1.1.1.5.1'
+MEM_FREE = '1.3.6.1.4.1.9.9.48.1.1.1.6.1'
+
+MEM_TOTAL = 512 * 1024 * 1024
+
+
+class AgentProfile:
+    """모든 에이전트가 공유하는 OID 목록 (정렬된 키 → GETNEXT를 bisect 한 번으로 처리)"""
+
+    def __init__(self, interfaces: int):
+        self.interfaces = interfaces
+        oids = [SYS_DESCR, SYS_UPTIME, CPU_5MIN, MEM_USED, MEM_FREE]
+        for column in (IF_NAME_OID, IF_HC_IN_OCTETS_OID, IF_HC_OUT_OCTETS_OID, IF_HIGH_SPEED_OID):
+            oids.extend(f"{column}.{i}" for i in range(1, interfaces + 1))
+        self.oids = sorted(oids, key=oid_key)
+        self.keys = [oid_key(oid) for oid in self.oids]
+        self.oid_set = set(self.oids)
+
+    def next_oid(self, oid: str) -> Optional[str]:
+        index = bisect.bisect_right(self.keys, oid_key(oid))
+        return self.oids[index] if index < len(self.oids) else None
+
+
+class SimulatedAgent(asyncio.DatagramProtocol):
+    def __init__(self, index: int, profile: AgentProfile, community: bytes, latency: float,
+                 loss: float, offline: bool):
+        self.index = index
+        self.profile = profile
+        self.community = community
+        self.latency = latency
+        self.loss = loss
+        self.offline = offline
+        self.started = time.time() - random.uniform(3600, 90 * 86400)
+        self.cpu = random.randint(3, 40)
+        # 인터페이스별 초당 옥텟 (0 ~ 1Gbps의 30%)
+        self.rates = [random.uniform(0, 0.3) * 125_000_000 for _ in range(profile.interfaces)]
+        self.transport = None
+        self.requests = 0
+
+    def connection_made(self, transport):
+        self.transport = transport
+
+    def _value(self, oid: str, now: float):
+        if oid not in self.profile.oid_set:
+            return NO_SUCH_INSTANCE
+        if oid == SYS_DESCR:
+            return TAG_OCTET_STRING, f"Cisco IOS Software, C9300 Software (SIM-{self.index})"
+        if oid == SYS_UPTIME:
+            return TAG_TIMETICKS, int((now - self.started) * 100) % 2 ** 32
+        if oid == CPU_5MIN:
+            self.cpu = min(100, max(0, self.cpu + random.randint(-3, 3)))
+            return TAG_GAUGE32, self.cpu
+        if oid == MEM_USED:
+            return TAG_GAUGE32, int(MEM_TOTAL * (0.3 + self.cpu / 400))
+        if oid == MEM_FREE:
+            return TAG_GAUGE32, MEM_TOTAL - int(MEM_TOTAL * (0.3 + self.cpu / 400))
+
+        column, if_index = oid.rsplit(".", 1)
+        if_index = int(if_index)
+        if column == IF_NAME_OID:
+            return TAG_OCTET_STRING, f"Gi1/0/{if_index}"
+        if column == IF_HIGH_SPEED_OID:
+            return TAG_GAUGE32, 1000
+        rate = self.rates[if_index - 1] * (1 if column == IF_HC_IN_OCTETS_OID else 0.6)
+        return TAG_COUNTER64, int((now - self.started) * rate) % 2 ** 64
+
+    def _handle(self, data: bytes) -> Optional[bytes]:
+        try:
+            request = decode_message(data)
+        except BerError:
+            return None
+        if request.community != self.community:
+            return None  # 잘못된 community는 실제 장비처럼 무응답
+
+        now = time.time()
+        if request.pdu_type == PDU_GET:
+            varbinds = [(oid, self._value(oid, now)) for oid, _ in request.varbinds]
+        elif request.pdu_type == PDU_GETNEXT:
+            varbinds = []
+            for oid, _ in request.varbinds:
+                next_oid = self.profile.next_oid(oid)
+                varbinds.append((next_oid, self._value(next_oid, now)) if next_oid else (oid, END_OF_MIB_VIEW))
+        elif request.pdu_type == PDU_GETBULK:
+            non_repeaters, max_repetitions = request.error_status, request.error_index
+            varbinds = []
+            for oid, _ in request.varbinds[:non_repeaters]:
+                next_oid = self.profile.next_oid(oid)
+                varbinds.append((next_oid, self._value(next_oid, now)) if next_oid else (oid, END_OF_MIB_VIEW))
+            cursors = [oid for oid, _ in request.varbinds[non_repeaters:]]
+            for _ in range(max_repetitions):
+                row = []
+                for i, oid in enumerate(cursors):
+                    next_oid = self.profile.next_oid(oid)
+                    if next_oid is None:
+                        row.append((oid, END_OF_MIB_VIEW))
+                    else:
+                        row.append((next_oid, self._value(next_oid, now)))
+                        cursors[i] = next_oid
+                varbinds.extend(row)
+                if all(value is END_OF_MIB_VIEW for _, value in row):
+                    break
+        else:
+            return None
+        return encode_response(request, varbinds)
+
+    def datagram_received(self, data, addr):
+        self.requests += 1
+        if self.offline or random.random() < self.loss:
+            return
+        response = self._handle(data)
+        if response is None:
+            return
+        if self.latency:
+            delay = random.uniform(self.latency * 0.5, self.latency * 1.5)
+            asyncio.get_running_loop().call_later(delay, self.transport.sendto, response, addr)
+        else:
+            self.transport.sendto(response, addr)
+
+
+def _raise_fd_limit(needed: int):
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    if soft < needed:
+        resource.setrlimit(resource.RLIMIT_NOFILE, (min(max(needed, soft), hard), hard))
+
+
+async def start_agents(count: int, base_port: int, host: str = "127.0.0.1", community: str = "public",
+                       interfaces: int = 48, latency: float = 0.0, loss: float = 0.0,
+                       offline: float = 0.0, seed: Optional[int] = None) -> List[Tuple[SimulatedAgent, object]]:
+    """count개 에이전트를 base_port부터 연속 포트에 바인딩 (현재 이벤트 루프에서 동작)"""
+    rng = random.Random(seed)
+    _raise_fd_limit(count + 256)
+    profile = AgentProfile(interfaces)
+    loop = asyncio.get_running_loop()
+    agents = []
+    for i in range(count):
+        agent = SimulatedAgent(i, profile, community.encode(), latency, loss, rng.random() < offline)
+        transport, _ = await loop.create_datagram_endpoint(lambda a=agent: a, local_addr=(host, base_port + i))
+        agents.append((agent, transport))
+    return agents
+
+
+def run_simulator(count: int, base_port: int, ready=None, stop=None, **options):
+    """
+    별도 프로세스에서 실행하기 위한 진입점. ready(multiprocessing.Event)는 바인딩 완료 시 set,
+    stop 이벤트가 set 되면 종료합니다.
+    """
+    async def main():
+        agents = await start_agents(count, base_port, **options)
+        offline = sum(agent.offline for agent, _ in agents)
+        print(f"[Simulator] {count} agents on udp/{base_port}-{base_port + count - 1} ({offline} offline)")
+        if ready is not None:
+            ready.set()
+        while stop is None or not stop.is_set():
+            await asyncio.sleep(0.2)
+        for _, transport in agents:
+            transport.close()
+
+    asyncio.run(main())
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--agents", type=int, default=1000)
+    parser.add_argument("--base-port", type=int, default=20000)
+    parser.add_argument("--community", default="public")
+    parser.add_argument("--interfaces", type=int, default=48, help="에이전트당 인터페이스 수")
+    parser.add_argument("--latency", type=float, default=0.005, help="평균 응답 지연 (초)")
+    parser.add_argument("--loss", type=float, default=0.0, help="요청 패킷 손실 비율")
+    parser.add_argument("--offline", type=float, default=0.0, help="무응답 에이전트 비율")
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+    try:
+        run_simulator(args.agents, args.base_port, community=args.community, interfaces=args.interfaces,
+                      latency=args.latency, loss=args.loss, offline=args.offline, seed=args.seed)
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
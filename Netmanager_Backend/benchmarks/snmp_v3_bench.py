@@ -0,0 +1,150 @@
+"""
+SNMPv3 authPriv 폴링 벤치마크
+
+1) 키 준비 비용: 폴링마다 패스프레이즈 -> 로컬라이즈 키를 새로 계산하는 방식(캐시 없음)과
+   usm_keys 캐시(engineID, user 별 1회)의 장비당 비용 비교
+2) 실제 폴링: 별도 프로세스에 pysnmp 에이전트 N개(장비마다 다른 engineID, SHA/AES128 계정 + v2c community)를
+   띄우고 같은 장비들을 v2c와 v3 authPriv로 폴링해 라운드별 소요 시간 / CPU(장비당 ms)를 비교합니다.
+   첫 v3 라운드는 engineID discovery + 키 로컬라이즈가 포함되고, 이후 라운드는 캐시된 키만 사용합니다.
+
+실행 (Netmanager_Backend 디렉토리에서):
+    python -m benchmarks.snmp_v3_bench --agents 50 --rounds 3
+"""
+import argparse
+import asyncio
+import multiprocessing
+import resource
+import time
+
+from app.services.snmp_service import SnmpManager, snmp_runtime
+from app.services.snmp_usm import UsmCredentials, UsmKeyCache, usm_keys
+
+USER = "netmanager"
+AUTH_KEY = "authpass-1234"
+PRIV_KEY = "privpass-5678"
+
+
+def _engine_id(index: int) -> bytes:
+    # RFC 3411 형식 (enterprise 9 = Cisco, format 4 = text)
+    return bytes.fromhex("8000000904") + f"sim-{index:06d}".encode()
+
+
+def run_agents(count: int, base_port: int, ready=None, stop=None):
+    """pysnmp 에이전트 count개 (장비마다 SnmpEngine 1개 = engineID 1개)"""
+    from pysnmp.carrier.asyncio.dgram import udp
+    from pysnmp.entity import engine, config
+    from pysnmp.entity.rfc3413 import cmdrsp, context
+    from pysnmp.hlapi import usmHMACSHAAuthProtocol, usmAesCfb128Protocol
+    from pysnmp.proto.rfc1902 import OctetString
+
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    for i in range(count):
+        snmp_engine = engine.SnmpEngine(snmpEngineID=OctetString(_engine_id(i)))
+        config.addTransport(snmp_engine, udp.domainName,
+                            udp.UdpTransport().openServerMode(("127.0.0.1", base_port + i)))
+        config.addV1System(snmp_engine, "area", "public")
+        config.addV3User(snmp_engine, USER, usmHMACSHAAuthProtocol, AUTH_KEY, usmAesCfb128Protocol, PRIV_KEY)
+        config.addVacmUser(snmp_engine, 2, "area", "noAuthNoPriv", (1, 3, 6, 1, 2, 1))
+        config.addVacmUser(snmp_engine, 3, USER, "authPriv", (1, 3, 6, 1, 2, 1))
+        snmp_context = context.SnmpContext(snmp_engine)
+        cmdrsp.GetCommandResponder(snmp_engine, snmp_context)
+        cmdrsp.BulkCommandResponder(snmp_engine, snmp_context)
+
+    async def wait_stop():
+        if ready is not None:
+            ready.set()
+        while stop is None or not stop.is_set():
+            await asyncio.sleep(0.2)
+
+    loop.run_until_complete(wait_stop())
+
+
+def _cpu_seconds() -> float:
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    return usage.ru_utime + usage.ru_stime
+
+
+def bench_key_derivation(devices: int):
+    creds = UsmCredentials(USER, "sha", AUTH_KEY, "aes", PRIV_KEY)
+    engine_ids = [_engine_id(i) for i in range(devices)]
+
+    start = time.perf_counter()
+    for engine_id in engine_ids:
+        UsmKeyCache().localized_keys(engine_id, creds)  # 캐시 없이 매번 패스프레이즈부터 계산
+    naive = (time.perf_counter() - start) / devices
+
+    cache = UsmKeyCache()
+    start = time.perf_counter()
+    for engine_id in engine_ids:
+        cache.localized_keys(engine_id, creds)  # 마스터 키 1회 + 장비별 로컬라이즈
+    cold = (time.perf_counter() - start) / devices
+
+    start = time.perf_counter()
+    for _ in range(10):
+        for engine_id in engine_ids:
+            cache.localized_keys(engine_id, creds)
+    warm = (time.perf_counter() - start) / devices / 10
+
+    print(f"key preparation per device ({devices} engineIDs, SHA + AES128):")
+    print(f"  no cache (every poll) : {naive * 1000:8.3f} ms")
+    print(f"  cache, first poll     : {cold * 1000:8.3f} ms")
+    print(f"  cache, later polls    : {warm * 1000:8.3f} ms")
+
+
+async def _poll_all(targets, concurrency: int):
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(target):
+        async with semaphore:
+            snmp = SnmpManager(target["host"], port=target["port"], version=target["version"],
+                               usm=target.get("usm"))
+            return (await snmp.async_check_status())["status"] == "online"
+
+    return await asyncio.gather(*[one(t) for t in targets])
+
+
+def _poll(targets, concurrency: int):
+    start_wall, start_cpu = time.perf_counter(), _cpu_seconds()
+    online = sum(snmp_runtime.run(_poll_all(targets, concurrency)))
+    return online, time.perf_counter() - start_wall, _cpu_seconds() - start_cpu
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--agents", type=int, default=50)
+    parser.add_argument("--base-port", type=int, default=21000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--rounds", type=int, default=3)
+    args = parser.parse_args()
+
+    bench_key_derivation(args.agents)
+
+    ctx = multiprocessing.get_context("spawn")
+    ready, stop = ctx.Event(), ctx.Event()
+    agents = ctx.Process(target=run_agents, args=(args.agents, args.base_port, ready, stop), daemon=True)
+    agents.start()
+    if not ready.wait(300):
+        raise SystemExit("agents did not start")
+
+    creds = UsmCredentials(USER, "sha", AUTH_KEY, "aes", PRIV_KEY)
+    ports = [args.base_port + i for i in range(args.agents)]
+    v2c = [{"host": "127.0.0.1", "port": port, "version": 2} for port in ports]
+    v3 = [{"host": "127.0.0.1", "port": port, "version": 3, "usm": creds} for port in ports]
+    try:
+        _poll(v2c[:1], 1)  # 워밍업 (엔진/루프 시작)
+        print(f"\npolling {args.agents} agents, concurrency {args.concurrency}:")
+        for name, targets in (("v2c", v2c), ("v3 authPriv", v3)):
+            for round_no in range(1, args.rounds + 1):
+                online, wall, cpu = _poll(targets, args.concurrency)
+                print(f"  {name:12s} round {round_no}: {wall:6.2f} s  online {online}/{len(targets)}  "
+                      f"cpu {cpu / len(targets) * 1000:6.2f} ms/device")
+        print(f"  usm cache: {usm_keys.stats}")
+    finally:
+        stop.set()
+        agents.join(10)
+        snmp_runtime.stop()
+
+
+if __name__ == "__main__":
+    main()
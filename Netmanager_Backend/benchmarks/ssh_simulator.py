@@ -0,0 +1,155 @@
+"""
+로컬 Cisco CLI SSH 시뮬레이터 (asyncssh)
+
+localhost의 연속된 TCP 포트에 가짜 IOS 장비를 띄웁니다. 로그인 후 `R1>` 프롬프트, enable(비밀번호),
+terminal length/width, show running-config(| include), show vlan brief, configure terminal / hostname / end 를 흉내 내며
+명령마다 응답 지연(장비 처리 시간)을 설정할 수 있습니다. 어떤 계정/비밀번호든 허용합니다.
+설정 모드에서 명령을 넣으면 running-config의 "Last configuration change at ..." 시각이 바뀝니다.
+
+실행 (Netmanager_Backend 디렉토리에서):
+    python -m benchmarks.ssh_simulator --devices 200 --base-port 23000 --latency 0.05 --interfaces 48
+"""
+import argparse
+import asyncio
+import random
+import resource
+import time
+
+import asyncssh
+
+
+def build_running_config(hostname: str, interfaces: int) -> str:
+    lines = ["Building configuration...", "", "Current configuration : 0 bytes", "!",
+             "! Last configuration change at {changed} by admin", "!", f"hostname {hostname}", "!",
+             "ip domain name sim.local", "spanning-tree mode rapid-pvst", "!"]
+    for i in range(1, interfaces + 1):
+        lines += [f"interface GigabitEthernet1/0/{i}", f" description port {i}",
+                  f" switchport access vlan {10 + i % 4}", " switchport mode access", "!"]
+    lines += ["interface Vlan10", " ip address 10.0.10.1 255.255.255.0", "!",
+              "line vty 0 4", " exec-timeout 30 0", " transport input ssh", "!", "end"]
+    return "\n".join(lines) + "\n"
+
+
+VLAN_BRIEF = (
+    "VLAN Name                             Status    Ports\n"
+    "---- -------------------------------- --------- -------------------------------\n"
+    "1    default                          active    \n"
+    "10   users                            active    \n"
+    "11   voice                            active    \n"
+    "12   printers                         active    \n"
+    "13   cameras                          active    \n"
+)
+
+
+class _AnyLogin(asyncssh.SSHServer):
+    def begin_auth(self, username):
+        return True
+
+    def password_auth_supported(self):
+        return True
+
+    def validate_password(self, username, password):
+        return True
+
+
+def _changed_now() -> str:
+    return time.strftime("%H:%M:%S UTC %a %b %d %Y", time.gmtime())
+
+
+def _handler(hostname: str, config: str, latency: float):
+    changed = _changed_now()
+
+    async def handle(process):
+        nonlocal hostname, changed  # hostname / 설정 변경 시각은 장비 전체에 적용
+        mode = ">"
+        process.stdout.write(f"\r\n{hostname}{mode}")
+        try:
+            while True:
+                line = await process.stdin.readline()
+                if not line:
+                    break
+                command = line.strip()
+                if latency and command:  # 빈 줄(프롬프트 요청)은 실제 장비처럼 바로 응답
+                    await asyncio.sleep(random.uniform(latency * 0.5, latency * 1.5))
+                output = ""
+                if mode.startswith("(config") and command not in ("", "end", "exit"):
+                    changed = _changed_now()
+                if command == "enable":
+                    process.stdout.write("Password: ")
+                    await process.stdin.readline()
+                    mode = "#"
+                elif command.startswith("show run"):
+                    output = config.replace("{changed}", changed)
+                    if "| include " in command:
+                        keyword = command.split("| include ", 1)[1]
+                        output = "".join(row + "\n" for row in output.splitlines() if keyword in row)
+                elif command.startswith("show vlan"):
+                    output = VLAN_BRIEF
+                elif command in ("configure terminal", "conf t"):
+                    mode = "(config)#"
+                    output = "Enter configuration commands, one per line.  End with CNTL/Z.\n"
+                elif command.startswith("hostname ") and mode.startswith("(config"):
+                    hostname = command.split()[1]
+                elif command.startswith("interface "):
+                    mode = "(config-if)#" if mode.startswith("(config") else mode
+                elif command == "end":
+                    mode = "#"
+                elif command == "exit":
+                    if mode.startswith("(config"):
+                        mode = "#" if mode == "(config)#" else "(config)#"
+                    else:
+                        break
+                process.stdout.write(output.replace("\n", "\r\n") + f"{hostname}{mode}")
+        except (asyncssh.Error, ConnectionError, asyncio.CancelledError):
+            pass
+        process.exit(0)
+
+    return handle
+
+
+async def start_devices(count: int, base_port: int, host: str = "127.0.0.1", latency: float = 0.0,
+                        interfaces: int = 48):
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    if soft < count * 4 + 256:
+        resource.setrlimit(resource.RLIMIT_NOFILE, (min(count * 4 + 256, hard), hard))
+    key = asyncssh.generate_private_key("ssh-ed25519")
+    servers = []
+    for i in range(count):
+        hostname = f"SW{i:04d}"
+        servers.append(await asyncssh.create_server(
+            _AnyLogin, host, base_port + i, server_host_keys=[key],
+            process_factory=_handler(hostname, build_running_config(hostname, interfaces), latency),
+        ))
+    return servers
+
+
+def run_simulator(count: int, base_port: int, ready=None, stop=None, **options):
+    """별도 프로세스 진입점 (ready: 바인딩 완료 시 set, stop이 set 되면 종료)"""
+    async def main():
+        servers = await start_devices(count, base_port, **options)
+        print(f"[SSH Simulator] {count} devices on tcp/{base_port}-{base_port + count - 1}")
+        if ready is not None:
+            ready.set()
+        while stop is None or not stop.is_set():
+            await asyncio.sleep(0.2)
+        for server in servers:
+            server.close()
+
+    asyncio.run(main())
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--devices", type=int, default=100)
+    parser.add_argument("--base-port", type=int, default=23000)
+    parser.add_argument("--latency", type=float, default=0.05, help="명령당 평균 응답 지연 (초)")
+    parser.add_argument("--interfaces", type=int, default=48, help="running-config 인터페이스 수")
+    args = parser.parse_args()
+    try:
+        run_simulator(args.devices, args.base_port, latency=args.latency, interfaces=args.interfaces)
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
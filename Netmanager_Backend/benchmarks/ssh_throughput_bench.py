@@ -0,0 +1,128 @@
+"""
+SSH 설정 수집 처리량 비교: netmiko(DeviceConnection, 스레드) vs asyncssh(AsyncDeviceConnection, 이벤트 루프 1개)
+
+별도 프로세스에 ssh_simulator 장비 N개를 띄우고, 장비마다 접속 -> enable -> terminal length 0 ->
+show running-config -> show vlan brief -> 종료를 수행해
+- 전체 소요 시간 / devices per minute
+- 수집 프로세스 CPU 시간, 사용한 스레드 수
+를 비교합니다. netmiko는 concurrency 크기의 스레드 풀, asyncssh는 같은 동시성의 세마포어로 실행합니다.
+
+실행 (Netmanager_Backend 디렉토리에서):
+    python -m benchmarks.ssh_throughput_bench --devices 100 --concurrency 50 --latency 0.05
+"""
+import argparse
+import asyncio
+import logging
+import multiprocessing
+import resource
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from app.services.async_ssh_service import AsyncDeviceConnection
+from app.services.ssh_service import DeviceConnection, DeviceInfo
+from benchmarks.ssh_simulator import run_simulator
+
+
+def _cpu_seconds() -> float:
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    return usage.ru_utime + usage.ru_stime
+
+
+def _pull_netmiko(info: DeviceInfo) -> int:
+    connection = DeviceConnection(info)
+    if not connection.connect():
+        raise ConnectionError(connection.last_error)
+    try:
+        return len(connection.get_running_config()) + len(connection.send_command("show vlan brief"))
+    finally:
+        connection.disconnect()
+
+
+async def _pull_async(info: DeviceInfo) -> int:
+    connection = AsyncDeviceConnection(info)
+    if not await connection.connect():
+        raise ConnectionError(connection.last_error)
+    try:
+        return len(await connection.get_running_config()) + len(await connection.send_command("show vlan brief"))
+    finally:
+        await connection.disconnect()
+
+
+def run_netmiko(infos, concurrency: int):
+    peak_threads = threading.active_count()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        futures = [executor.submit(_pull_netmiko, info) for info in infos]
+        results = []
+        for future in futures:
+            try:
+                results.append(future.result())
+            except Exception:
+                results.append(None)
+            peak_threads = max(peak_threads, threading.active_count())
+    return results, peak_threads
+
+
+def run_asyncssh(infos, concurrency: int):
+    async def main():
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def one(info):
+            async with semaphore:
+                try:
+                    return await _pull_async(info)
+                except Exception:
+                    return None
+
+        return await asyncio.gather(*[one(info) for info in infos])
+
+    return asyncio.run(main()), threading.active_count()
+
+
+def _measure(name: str, runner, infos, concurrency: int):
+    start_wall, start_cpu = time.perf_counter(), _cpu_seconds()
+    results, threads = runner(infos, concurrency)
+    wall, cpu = time.perf_counter() - start_wall, _cpu_seconds() - start_cpu
+    ok = sum(r is not None for r in results)
+    print(f"  {name:10s} {wall:7.2f} s  {ok / wall * 60:8.1f} devices/min  ok {ok}/{len(infos)}  "
+          f"cpu {cpu / len(infos) * 1000:6.1f} ms/device  threads {threads}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--devices", type=int, default=100)
+    parser.add_argument("--base-port", type=int, default=23000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--latency", type=float, default=0.05, help="장비 명령당 평균 응답 지연 (초)")
+    parser.add_argument("--interfaces", type=int, default=48)
+    parser.add_argument("--skip-netmiko", action="store_true")
+    args = parser.parse_args()
+    logging.disable(logging.CRITICAL)  # ssh_service의 DEBUG 로깅이 측정을 왜곡하지 않도록
+
+    ctx = multiprocessing.get_context("spawn")
+    ready, stop = ctx.Event(), ctx.Event()
+    simulator = ctx.Process(target=run_simulator, args=(args.devices, args.base_port, ready, stop), kwargs={
+        "latency": args.latency, "interfaces": args.interfaces,
+    }, daemon=True)
+    simulator.start()
+    if not ready.wait(120):
+        raise SystemExit("simulator did not start")
+
+    infos = [
+        DeviceInfo(name=f"SW{i:04d}", host="127.0.0.1", port=args.base_port + i,
+                   username="admin", password="admin", enable_password="enable", timeout=60)
+        for i in range(args.devices)
+    ]
+    try:
+        print(f"devices: {args.devices}, concurrency: {args.concurrency}, "
+              f"device latency: {args.latency * 1000:.0f} ms/command")
+        _measure("asyncssh", run_asyncssh, infos, args.concurrency)
+        if not args.skip_netmiko:
+            _measure("netmiko", run_netmiko, infos, args.concurrency)
+    finally:
+        stop.set()
+        simulator.join(10)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+Syslog 분류기 마이크로 벤치마크
+
+기존 save_log 방식(비컴파일 re.search + 키워드 any() 스캔 2회)과
+syslog_classifier.classify()의 메시지당 처리 시간을 실제 Cisco 로그 샘플로 비교합니다.
+
+실행 (Netmanager_Backend 디렉토리에서):
+    python -m benchmarks.syslog_classifier_bench --repeat 20000
+"""
+import argparse
+import re
+import timeit
+
+from app.services.syslog_classifier import classify
+
+# 실제 장비(IOS / IOS-XE / NX-OS / ASA)에서 수집한 형태의 로그
+CORPUS = [
+    "<187>48213: *Dec 20 11:30:09.491: %LINK-3-UPDOWN: Interface GigabitEthernet1/0/3, changed state to down",
+    "<189>48214: *Dec 20 11:30:10.491: %LINEPROTO-5-UPDOWN: Line protocol on Interface GigabitEthernet1/0/3, changed state to down",
+    "<187>48215: *Dec 20 11:30:12.102: %LINK-3-UPDOWN: Interface GigabitEthernet1/0/3, changed state to up",
+    "<189>48216: Dec 20 11:31:44.870 KST: %SYS-5-CONFIG_I: Configured from console by admin on vty0 (10.10.1.5)",
+    "<190>48217: Dec 20 11:32:01.003 KST: %SEC_LOGIN-6-LOGIN_SUCCESS: Login Success [user: admin] [Source: 10.10.1.5] [localport: 22] at 11:32:01 KST Fri Dec 20 2024",
+    "<188>48218: Dec 20 11:33:15.552 KST: %SW_MATM-4-MACFLAP_NOTIF: Host 0050.56a1.2b3c in vlan 10 is flapping between port Gi1/0/5 and port Gi1/0/6",
+    "<189>48219: Dec 20 11:34:02.119 KST: %OSPF-5-ADJCHG: Process 1, Nbr 10.0.0.2 on Vlan100 from FULL to DOWN, Neighbor Down: Dead timer expired",
+    "<187>48220: Dec 20 11:34:40.010 KST: %BGP-3-NOTIFICATION: sent to neighbor 192.0.2.1 4/0 (hold time expired) 0 bytes",
+    "<189>48221: Dec 20 11:34:41.010 KST: %BGP-5-ADJCHANGE: neighbor 192.0.2.1 Down BGP Notification sent",
+    "<186>48222: Dec 20 11:35:00.000 KST: %PLATFORM_ENV-2-FAN_FAIL: Fan 2 had a failure",
+    "<188>48223: Dec 20 11:35:20.331 KST: %PM-4-ERR_DISABLE: bpduguard error detected on Gi1/0/12, putting Gi1/0/12 in err-disable state",
+    "<189>48224: Dec 20 11:36:11.781 KST: %SPANTREE-5-TOPOTRAP: Topology Change Trap for vlan 20",
+    "<190>48225: Dec 20 11:36:30.240 KST: %DOT1X-5-SUCCESS: Authentication successful for client (0050.56a1.2b3c) on Interface Gi1/0/7",
+    "<188>48226: Dec 20 11:37:02.507 KST: %ILPOWER-4-LOG_OVERDRAWN: Interface Gi1/0/9 is overdrawing power",
+    "<187>2024 Dec 20 11:38:00 N9K-1 %ETHPORT-5-IF_DOWN_LINK_FAILURE: Interface Ethernet1/49 is down (Link failure)",
+    "<189>2024 Dec 20 11:38:05 N9K-1 %VPC-5-PEER_KEEP_ALIVE_RECV_SUCCESS: In domain 10, vPC peer keep-alive receive is successful",
+    "<166>Dec 20 2024 11:39:01: %ASA-6-302013: Built inbound TCP connection 1234567 for outside:203.0.113.5/51234 (203.0.113.5/51234) to inside:10.1.1.10/443 (10.1.1.10/443)",
+    "<164>Dec 20 2024 11:39:02: %ASA-4-106023: Deny tcp src outside:198.51.100.7/4444 dst inside:10.1.1.20/3389 by access-group \"OUTSIDE_IN\" [0x0, 0x0]",
+    "<189>Dec 20 11:40:00 10.1.1.1 48227: %CDP-4-NATIVE_VLAN_MISMATCH: Native VLAN mismatch discovered on GigabitEthernet1/0/1 (1), with SW2 GigabitEthernet0/1 (10).",
+    "<13>1 2024-12-20T11:41:00.000+09:00 wlc01 capwap 812 - - AP ap-3f-lobby disassociated, reason: heartbeat timeout",
+]
+
+
+def legacy_parse(raw_log: str):
+    """기존 save_log의 파싱/분류 로직 (비교 기준)"""
+    match = re.search(r'%([A-Z0-9-]+-\d+-[A-Z0-9]+):\s*(.*)', raw_log)
+    event_id = match.group(1) if match else "UNKNOWN"
+    message = match.group(2).strip() if match else raw_log.strip()
+    severity = "INFO"
+    if any(keyword in raw_log for keyword in ["EMERG", "ALERT", "CRIT", "ERR", "DOWN", "FAIL"]):
+        severity = "CRITICAL"
+    elif any(keyword in raw_log for keyword in ["WARNING", "UPDOWN", "NOTICE"]):
+        severity = "WARNING"
+    return severity, event_id, message
+
+
+def _per_message_ns(func, repeat: int) -> float:
+    def run():
+        for line in CORPUS:
+            func(line)
+    best = min(timeit.repeat(run, number=repeat, repeat=5))
+    return best / (repeat * len(CORPUS)) * 1e9
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=20000)
+    args = parser.parse_args()
+
+    legacy_ns = _per_message_ns(legacy_parse, args.repeat)
+    classify_ns = _per_message_ns(classify, args.repeat)
+    print(f"corpus: {len(CORPUS)} lines x {args.repeat} repeats")
+    print(f"{'legacy save_log parse':<24} {legacy_ns:>8.0f} ns/msg  ({1e9 / legacy_ns:>10,.0f} msg/s)")
+    print(f"{'classify()':<24} {classify_ns:>8.0f} ns/msg  ({1e9 / classify_ns:>10,.0f} msg/s)")
+
+    # severity 판정 차이 (PRI / Cisco SEV를 반영하면서 달라진 건)
+    print("\nseverity 판정 비교 (legacy -> classify):")
+    for line in CORPUS:
+        old = legacy_parse(line)[0]
+        new = classify(line)
+        if old != new.severity:
+            print(f"  {old:>8} -> {new.severity:<8} {new.event_id}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""
+SO_REUSEPORT 멀티 프로세스 syslog 수신 벤치마크
+
+수신 워커 수(1, 2, 4, ... CPU 수)를 바꿔가며 초당 파싱 처리량(messages/sec)을 측정합니다.
+DB 저장 단계는 제외하고 "수신 + 디코딩 + 파싱 + 부모 프로세스 전달"까지만 측정합니다.
+
+실행 (Netmanager_Backend 디렉토리에서):
+    python -m benchmarks.syslog_reuseport_bench --duration 5 --senders 8
+"""
+import argparse
+import multiprocessing
+import os
+import queue
+import socket
+import time
+
+from app.services.syslog_service import start_syslog_workers
+
+SAMPLE_LOG = (b"<187>12345: *Dec 20 11:30:09.491: %LINK-3-UPDOWN: "
+              b"Interface GigabitEthernet1/0/3, changed state to down")
+
+
+def _free_udp_port() -> int:
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    sock.bind(("127.0.0.1", 0))
+    port = sock.getsockname()[1]
+    sock.close()
+    return port
+
+
+def _sender(port: int, duration: float, sockets_per_sender: int = 16):
+    # 송신 포트가 다양해야 커널 해시가 워커들로 고르게 분산됨
+    socks = [socket.socket(socket.AF_INET, socket.SOCK_DGRAM) for _ in range(sockets_per_sender)]
+    target = ("127.0.0.1", port)
+    end = time.monotonic() + duration
+    i = 0
+    while time.monotonic() < end:
+        try:
+            socks[i % sockets_per_sender].sendto(SAMPLE_LOG, target)
+        except OSError:
+            pass
+        i += 1
+
+
+def run_once(workers: int, senders: int, duration: float) -> float:
+    port = _free_udp_port()
+    processes, out_queue, counters = start_syslog_workers("127.0.0.1", port, workers)
+    time.sleep(1.0)  # 워커 바인딩 대기 (spawn)
+
+    ctx = multiprocessing.get_context("spawn")
+    sender_procs = [ctx.Process(target=_sender, args=(port, duration), daemon=True) for _ in range(senders)]
+    for p in sender_procs:
+        p.start()
+
+    received = 0
+    start = time.monotonic()
+    end = start + duration
+    while time.monotonic() < end:
+        try:
+            received += len(out_queue.get(timeout=0.1))
+        except queue.Empty:
+            pass
+    elapsed = time.monotonic() - start
+
+    for p in sender_procs + processes:
+        p.terminate()
+    for p in sender_procs + processes:
+        p.join()
+    return received / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--duration", type=float, default=5.0)
+    parser.add_argument("--senders", type=int, default=max(2, os.cpu_count() // 2))
+    parser.add_argument("--max-workers", type=int, default=os.cpu_count())
+    args = parser.parse_args()
+
+    counts = []
+    n = 1
+    while n <= args.max_workers:
+        counts.append(n)
+        n *= 2
+
+    print(f"{'workers':>8} {'msgs/sec':>12} {'scaling':>8}")
+    baseline = None
+    for workers in counts:
+        rate = run_once(workers, args.senders, args.duration)
+        baseline = baseline or rate
+        print(f"{workers:>8} {rate:>12,.0f} {rate / baseline:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,14 @@
 from celery import Celery
+from celery.schedules import crontab
+from celery.signals import worker_process_shutdown
+
+POLL_TICK = 5.0  # 폴링 스케줄러 tick 주기 (초)
 
 celery_app = Celery(
     "netmanager",
     broker="redis://localhost:6379/0",
     backend="redis://localhost:6379/1",
-    include=["app.tasks.monitoring", "app.tasks.config"]  # 태스크 모듈들
+    include=["app.tasks.monitoring", "app.tasks.config", "app.tasks.logs", "app.tasks.metrics"]  # 태스크 모듈들
 )
 
 # Celery 설정 (하드코딩으로 간단히)
@@ -14,10 +18,40 @@ celery_app.conf.update(
     accept_content=["json"],
     timezone="Asia/Seoul",
     enable_utc=False,
+    # 폴링 스케줄 상태(메모리)를 한 프로세스에서만 다루도록 polling 전용 큐로 분리
+    task_routes={
+        "app.tasks.monitoring.poll_due_devices": {"queue": "polling"},
+        "app.tasks.monitoring.monitor_all_devices": {"queue": "polling"},
+    },
     beat_schedule={
-        "monitor-all-devices-every-minute": {
-            "task": "app.tasks.monitoring.monitor_all_devices",
-            "schedule": 60.0,  # 60초마다
+        # 장비별 주기/backoff는 poll_scheduler가 관리하고, beat는 짧은 tick만 발생시킴
+        "poll-due-devices-tick": {
+            "task": "app.tasks.monitoring.poll_due_devices",
+            "schedule": POLL_TICK,
+            "options": {"expires": POLL_TICK},  # 밀린 tick은 버림 (다음 tick이 같은 일을 함)
+        },
+        "rollup-event-logs-every-5-minutes": {
+            "task": "app.tasks.logs.rollup_event_logs",
+            "schedule": 300.0,
+        },
+        "enforce-log-retention-daily": {
+            "task": "app.tasks.logs.enforce_log_retention",
+            "schedule": crontab(hour=3, minute=0),  # 매일 새벽 3시 오래된 파티션 DROP
+        },
+        "rollup-device-metrics-every-5-minutes": {
+            "task": "app.tasks.metrics.rollup_device_metrics",
+            "schedule": 300.0,
+        },
+        "enforce-metrics-retention-daily": {
+            "task": "app.tasks.metrics.enforce_metrics_retention",
+            "schedule": crontab(hour=3, minute=30),
         },
     },
-)
\ No newline at end of file
+)
+
+
+@worker_process_shutdown.connect
+def close_ssh_sessions(**kwargs):
+    # 워커 프로세스 종료 시 풀에 남은 SSH 세션 정리 (장비 vty 라인 반납)
+    from app.services.ssh_pool import ssh_pool
+    ssh_pool.close_all()
@@ -6,6 +6,9 @@ from typing import Dict, List, Optional, Any
 from dataclasses import dataclass
 from enum import Enum
 
+# 백업 본문 파일 형식(objects/<해시 앞 2자리>/<해시>.zst|.z)은 백엔드와 같은 모듈을 사용
+from Netmanager_Backend.app.services.blob_files import read_blob_file, write_blob_file
+
 # 로깅 설정 (DEBUG)
 logging.basicConfig(level=logging.DEBUG, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
@@ -59,12 +62,33 @@ class BackupInfo:
     timestamp: str
     config: str
     file_path: str
+    sha256: Optional[str] = None
 
     def save(self):
+        """
+        설정 본문은 백업 폴더의 objects/ 아래에 내용 해시로 한 번만 압축 저장하고,
+        백업 파일(.ref)에는 해시만 기록합니다 (같은 설정을 반복 백업해도 본문은 하나).
+        """
+        self.sha256 = write_blob_file(self._objects_dir(self.file_path), self.config)
+        self.file_path = os.path.splitext(self.file_path)[0] + ".ref"
         os.makedirs(os.path.dirname(self.file_path), exist_ok=True)
         with open(self.file_path, 'w', encoding='utf-8') as f:
-            f.write(self.config)
-        logger.info(f"Backup saved: {self.file_path}")
+            f.write(self.sha256 + "\n")
+        logger.info(f"Backup saved: {self.file_path} ({self.sha256[:12]})")
+
+    @staticmethod
+    def _objects_dir(file_path: str) -> str:
+        # backups/<장비>/<파일> -> backups/objects
+        return os.path.join(os.path.dirname(os.path.dirname(file_path)), "objects")
+
+    @staticmethod
+    def load(file_path: str) -> str:
+        """save()로 만든 .ref 파일의 설정 본문 (이전 방식 .cfg 파일은 그대로 읽음)"""
+        with open(file_path, 'r', encoding='utf-8') as f:
+            content = f.read()
+        if not file_path.endswith(".ref"):
+            return content
+        return read_blob_file(BackupInfo._objects_dir(file_path), content.strip())
 
 
 class DeviceConnection: